@@ -0,0 +1,35 @@
+import chess
+import numpy as np
+
+# Helpers to evaluate boards from their bitboards, instead of square by square
+
+MASK_ORDER = [(color, piece_type) for color in (chess.WHITE, chess.BLACK) for piece_type in chess.PIECE_TYPES]
+"""(color, piece type) of the bitboards returned by `board_masks`: white pawn to king, then black pawn to king"""
+
+
+def board_masks(board: chess.Board) -> tuple[int, ...]:
+    """
+    The 12 bitboards of the pieces on the board, in the order of `MASK_ORDER`.
+    """
+    white, black = board.occupied_co[chess.WHITE], board.occupied_co[chess.BLACK]
+    return (board.pawns & white, board.knights & white, board.bishops & white, board.rooks & white,
+            board.queens & white, board.kings & white,
+            board.pawns & black, board.knights & black, board.bishops & black, board.rooks & black,
+            board.queens & black, board.kings & black)
+
+
+def piece_masks(boards: list[chess.Board]) -> np.ndarray:
+    """
+    The bitboards of all boards, as an array of shape (len(boards), 12).
+    """
+    masks = np.empty((len(boards), 12), dtype="<u8")
+    for i, board in enumerate(boards):
+        masks[i] = board_masks(board)
+    return masks
+
+
+def unpack_masks(masks: np.ndarray) -> np.ndarray:
+    """
+    Unpack bitboards of shape (n, k) into bits of shape (n, k, 64), where bit `i` is square `i`.
+    """
+    return np.unpackbits(masks.view(np.uint8), axis=-1, bitorder="little").reshape(masks.shape[0], masks.shape[1], 64)
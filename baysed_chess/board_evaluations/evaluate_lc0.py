@@ -1,8 +1,12 @@
+import asyncio
+
 import chess
 import chess.engine
 
+from baysed_chess.engine_pool import PooledEngine
+
 
-def score_lc0(board: chess.Board, lc0: chess.engine.SimpleEngine) -> int:
+def score_lc0(board: chess.Board, lc0: chess.engine.SimpleEngine | PooledEngine) -> int:
     """
     Calculate the score of the given board using lc0
     """
@@ -16,3 +20,50 @@ def score_lc0(board: chess.Board, lc0: chess.engine.SimpleEngine) -> int:
 
     info = lc0.analyse(board, limit)
     return info['score'].white().score(mate_score=100_000)
+
+
+async def score_lc0_async(board: chess.Board, lc0: chess.engine.UciProtocol) -> int:
+    """
+    Calculate the score of the given board using the asyncio protocol of lc0
+    """
+
+    limit: chess.engine.Limit = chess.engine.Limit(depth=0)
+
+    # lc0 cannot calculate a score if there is already a checkmate => return score manually for this case
+    outcome = board.outcome()
+    if outcome is not None and outcome.termination == chess.Termination.CHECKMATE:
+        return 100_000 if outcome.winner == chess.WHITE else -100_000
+
+    info = await lc0.analyse(board, limit)
+    return info['score'].white().score(mate_score=100_000)
+
+
+async def _score_lc0_share(boards: list[chess.Board], lc0: chess.engine.UciProtocol) -> list[int]:
+    return [await score_lc0_async(board, lc0) for board in boards]
+
+
+def score_lc0_batch(boards: list[chess.Board], lc0s: list[chess.engine.SimpleEngine | PooledEngine]) -> list[int]:
+    """
+    Calculate the scores of the given boards using several lc0 instances, the boards are spread round-robin.
+    Every instance analyses its share back to back on the event loop of its engine, so the calling thread waits
+    once per instance, instead of once per board.
+    """
+    futures = []
+    for i, lc0 in enumerate(lc0s):
+        share = list(range(i, len(boards), len(lc0s)))
+        if not share:
+            continue
+        engine = lc0.engine if isinstance(lc0, PooledEngine) else lc0
+        coro = _score_lc0_share([boards[j] for j in share], engine.protocol)
+        futures.append((lc0, share, asyncio.run_coroutine_threadsafe(coro, engine.protocol.loop)))
+
+    scores = [0] * len(boards)
+    for lc0, share, future in futures:
+        try:
+            share_scores = future.result()
+        except chess.engine.EngineTerminatedError:
+            # score the share one by one, which restarts a crashed engine of the pool
+            share_scores = [score_lc0(boards[j], lc0) for j in share]
+        for j, score in zip(share, share_scores):
+            scores[j] = score
+    return scores
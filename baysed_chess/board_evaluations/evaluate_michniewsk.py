@@ -1,5 +1,8 @@
 import chess
 import chess.engine
+import numpy as np
+
+from baysed_chess.board_evaluations.bitboards import MASK_ORDER, board_masks, piece_masks, unpack_masks
 
 # Eval constants for scoring chess boards
 # Evaluation metric inspired by Tomasz Michniewski: https://www.chessprogramming.org/Simplified_Evaluation_Function
@@ -106,37 +109,41 @@ PIECE_TABLES = {
 }
 
 
+# PIECE_VALUES * PIECE_TABLES, with the sign of the color: rows are (color, piece type) in `MASK_ORDER`
+_WEIGHTS = np.array([[PIECE_VALUES[pt] * v * (1 if color == chess.WHITE else -1) for v in PIECE_TABLES[color][pt]]
+                     for color, pt in MASK_ORDER], dtype=np.int64)
+# change of the weight of a king, if the board is in the endgame
+_ENDGAME_KING = {color: [PIECE_VALUES[chess.KING] * (e - v) * (1 if color == chess.WHITE else -1)
+                         for e, v in zip(PIECE_TABLES[color]['end_game_king'], PIECE_TABLES[color][chess.KING])]
+                 for color in (chess.WHITE, chess.BLACK)}
+_WEIGHT_LISTS = [row.tolist() for row in _WEIGHTS]
+_ENDGAME_WEIGHTS = np.array([_ENDGAME_KING[chess.WHITE], _ENDGAME_KING[chess.BLACK]], dtype=np.int64)
+
+
 def check_endgame(board: chess.Board) -> bool:
     """
     Endgame according to Tomasz Michniewski:
         1. Both sides have no queens or
         2. Every side which has a queen has additionally no other pieces or one minorpiece maximum.
     """
-    queens_white = 0
-    minors_white = 0
-    queens_black = 0
-    minors_black = 0
-    for s in chess.SQUARES:
-        piece = board.piece_at(s)
-        if piece is None:
-            continue
-
-        if piece.piece_type == chess.QUEEN:
-            if piece.color == chess.WHITE:
-                queens_white += 1
-            else:
-                queens_black += 1
-
-        if piece.piece_type == chess.BISHOP or piece.piece_type == chess.KNIGHT:
-            if piece.color == chess.WHITE:
-                minors_white += 1
-            else:
-                minors_black += 1
+    white, black = board.occupied_co[chess.WHITE], board.occupied_co[chess.BLACK]
+    minors = board.knights | board.bishops
+    queens_white = chess.popcount(board.queens & white)
+    queens_black = chess.popcount(board.queens & black)
+    minors_white = chess.popcount(minors & white)
+    minors_black = chess.popcount(minors & black)
 
     return (queens_black == 0 and queens_white == 0) or ((queens_black >= 1 >= minors_black) or (
             queens_white >= 1 >= minors_white))
 
 
+def _score_outcome(outcome: chess.Outcome) -> int:
+    if outcome.termination == chess.Termination.CHECKMATE:
+        return 1_100_000 if outcome.winner == chess.WHITE else -1_100_000
+    else:  # draw
+        return 0
+
+
 def score_michniewsk(board: chess.Board) -> int:
     """
     Calculate the score of a given board.
@@ -146,26 +153,36 @@ def score_michniewsk(board: chess.Board) -> int:
 
     outcome = board.outcome()
     if outcome is not None:
-        if outcome.termination == chess.Termination.CHECKMATE:
-            return 1_100_000 if outcome.winner == chess.WHITE else -1_100_000
-        else:  # draw
-            return 0
+        return _score_outcome(outcome)
 
+    # sum the weights of the occupied squares, piece by piece
     score = 0
-    for s in chess.SQUARES:
-        piece = board.piece_at(s)
-        if piece is None:
-            continue
-
-        if piece.color == chess.WHITE:
-            if piece.piece_type == chess.KING and check_endgame(board):
-                score += PIECE_VALUES[piece.piece_type] * PIECE_TABLES[chess.WHITE]['end_game_king'][s]
-            else:
-                score += PIECE_VALUES[piece.piece_type] * PIECE_TABLES[chess.WHITE][piece.piece_type][s]
-        else:
-            if piece.piece_type == chess.KING and check_endgame(board):
-                score -= PIECE_VALUES[piece.piece_type] * PIECE_TABLES[chess.BLACK]['end_game_king'][s]
-            else:
-                score -= PIECE_VALUES[piece.piece_type] * PIECE_TABLES[chess.BLACK][piece.piece_type][s]
-
-    return score
\ No newline at end of file
+    masks = board_masks(board)
+    for mask, weights in zip(masks, _WEIGHT_LISTS):
+        for s in chess.scan_forward(mask):
+            score += weights[s]
+
+    if board.kings and check_endgame(board):
+        for color, mask in ((chess.WHITE, masks[5]), (chess.BLACK, masks[11])):
+            for s in chess.scan_forward(mask):
+                score += _ENDGAME_KING[color][s]
+    return score
+
+
+def score_michniewsk_batch(boards: list[chess.Board]) -> np.ndarray:
+    """
+    Same as `score_michniewsk` for a list of boards, returns the scores as array.
+    """
+    bits = unpack_masks(piece_masks(boards))
+    scores = np.einsum("nks,ks->n", bits, _WEIGHTS)
+
+    endgame = np.array([check_endgame(b) for b in boards], dtype=bool)
+    if endgame.any():
+        king_bits = bits[endgame][:, [5, 11], :]
+        scores[endgame] += np.einsum("nks,ks->n", king_bits, _ENDGAME_WEIGHTS)
+
+    for i, board in enumerate(boards):
+        outcome = board.outcome()
+        if outcome is not None:
+            scores[i] = _score_outcome(outcome)
+    return scores
@@ -1,4 +1,7 @@
 import chess
+import numpy as np
+
+from baysed_chess.board_evaluations.bitboards import MASK_ORDER, board_masks, piece_masks, unpack_masks
 
 # Scoring based on PeSTO (Piece-Square Tables Only) Evaluation Functions
 # https://www.chessprogramming.org/PeSTO%27s_Evaluation_Function
@@ -314,6 +317,17 @@ def _init_tables():
             eg_table[piece][field] += eg_value[piece]
 
 
+def _score_tapered(mg: list[int], eg: list[int], game_phase: int, side2move: int) -> int:
+    mg_score = mg[side2move] - mg[OTHER(side2move)]
+    eg_score = eg[side2move] - eg[OTHER(side2move)]
+    mg_phase = game_phase
+    if mg_phase > 24:
+        # in case of early promotion
+        mg_phase = 24
+    eg_phase = 24 - mg_phase
+    return (mg_score * mg_phase + eg_score * eg_phase) // 24
+
+
 def score_pestos(board: chess.Board) -> int:
     """
     Calculate the score using PeSTO (Piece-Square Tables Only) board evaluations.
@@ -323,33 +337,50 @@ def score_pestos(board: chess.Board) -> int:
     eg = [0, 0]
     game_phase = 0
 
-    if board.outcome() is not None:
-        winner = board.outcome().winner
-        if winner is not None:
-            if winner == chess.WHITE:
-                return 100_000
-            else:
-                return -100_000
-    # evaluate each piece
-    for sq in range(64):
-        pc = board.piece_at(sq)
-        if pc is not None:
-            color = 0 if pc.color == chess.WHITE else 1
-            piece_index = (pc.piece_type - 1) * 2 + color
-            mg[color] += mg_table[piece_index][sq]
-            eg[color] += eg_table[piece_index][sq]
-            game_phase += gamephaseInc[piece_index]
+    # the only outcome with a winner is checkmate, the side to move lost
+    if board.is_checkmate():
+        return -100_000 if board.turn == chess.WHITE else 100_000
+
+    # evaluate each piece, bitboard by bitboard
+    for mask, piece_index in zip(board_masks(board), _MASK_PIECE_INDEX):
+        if mask:
+            color = piece_index & 1
+            mg_weights = mg_table[piece_index]
+            eg_weights = eg_table[piece_index]
+            for sq in chess.scan_forward(mask):
+                mg[color] += mg_weights[sq]
+                eg[color] += eg_weights[sq]
+                game_phase += gamephaseInc[piece_index]
 
     # tapered eval
     side2move = 0 if board.turn == chess.WHITE else 1
-    mg_score = mg[side2move] - mg[OTHER(side2move)]
-    eg_score = eg[side2move] - eg[OTHER(side2move)]
-    mg_phase = game_phase
-    if mg_phase > 24:
-        # in case of early promotion
-        mg_phase = 24
-    eg_phase = 24 - mg_phase
-    return (mg_score * mg_phase + eg_score * eg_phase) // 24
+    return _score_tapered(mg, eg, game_phase, side2move)
+
+
+def score_pestos_batch(boards: list[chess.Board]) -> np.ndarray:
+    """
+    Same as `score_pestos` for a list of boards, returns the scores as array.
+    """
+    bits = unpack_masks(piece_masks(boards))
+    # mg/eg of white minus black, and the game phase
+    mg = np.einsum("nks,ks->n", bits, _MG_WEIGHTS)
+    eg = np.einsum("nks,ks->n", bits, _EG_WEIGHTS)
+    game_phase = bits.sum(axis=2, dtype=np.int64) @ _PHASE_WEIGHTS
+
+    side2move = np.array([1 if board.turn == chess.WHITE else -1 for board in boards], dtype=np.int64)
+    mg_phase = np.minimum(game_phase, 24)
+    scores = (side2move * mg * mg_phase + side2move * eg * (24 - mg_phase)) // 24
+
+    for i, board in enumerate(boards):
+        if board.is_checkmate():
+            scores[i] = -100_000 if board.turn == chess.WHITE else 100_000
+    return scores
 
 
 _init_tables()
+
+# the tables of the pieces in the order of the bitboards of `board_masks`, signed by color for the batch evaluation
+_MASK_PIECE_INDEX = [(piece_type - 1) * 2 + (WHITE if color == chess.WHITE else BLACK) for color, piece_type in MASK_ORDER]
+_MG_WEIGHTS = np.array([[v if i & 1 == WHITE else -v for v in mg_table[i]] for i in _MASK_PIECE_INDEX], dtype=np.int64)
+_EG_WEIGHTS = np.array([[v if i & 1 == WHITE else -v for v in eg_table[i]] for i in _MASK_PIECE_INDEX], dtype=np.int64)
+_PHASE_WEIGHTS = np.array([gamephaseInc[i] for i in _MASK_PIECE_INDEX], dtype=np.int64)
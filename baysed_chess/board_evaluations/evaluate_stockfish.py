@@ -1,7 +1,9 @@
 import chess.engine
 
+from baysed_chess.engine_pool import PooledEngine
 
-def score_stockfish(board: chess.Board, stockfish: chess.engine.SimpleEngine) -> int:
+
+def score_stockfish(board: chess.Board, stockfish: chess.engine.SimpleEngine | PooledEngine) -> int:
     """
     Calculate the score of the given board using stockfish
     """
@@ -9,3 +11,13 @@ def score_stockfish(board: chess.Board, stockfish: chess.engine.SimpleEngine) ->
     limit = chess.engine.Limit(depth=0)
     info = stockfish.analyse(board, limit)
     return info['score'].white().score(mate_score=100_000)
+
+
+async def score_stockfish_async(board: chess.Board, stockfish: chess.engine.UciProtocol) -> int:
+    """
+    Calculate the score of the given board using the asyncio protocol of stockfish
+    """
+
+    limit = chess.engine.Limit(depth=0)
+    info = await stockfish.analyse(board, limit)
+    return info['score'].white().score(mate_score=100_000)
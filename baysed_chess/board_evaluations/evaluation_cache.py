@@ -0,0 +1,184 @@
+import contextlib
+import multiprocessing.util
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, Iterator
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+import chess
+
+SCORE = 0
+MOVE = 1
+
+
+@contextlib.contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """
+    Hold an exclusive lock of `path` (a lock file next to it), between processes.
+    The operating system releases the lock if the process dies.
+    """
+    with open(path + ".lock", "a+b") as fp:
+        if os.name == 'nt':
+            fp.seek(0)
+            msvcrt.locking(fp.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == 'nt':
+                fp.seek(0)
+                msvcrt.locking(fp.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+
+
+def _merge(older: Iterable[tuple], newer: Iterable[tuple], capacity: int) -> OrderedDict:
+    """
+    Entries of both, the newer ones win and are the most recently used, the least recently used beyond `capacity`
+    are dropped.
+    """
+    merged = OrderedDict(older)
+    for key, value in newer:
+        merged[key] = value
+        merged.move_to_end(key)
+    while len(merged) > capacity:
+        merged.popitem(last=False)
+    return merged
+
+
+@dataclass
+class EvaluationCacheStatistics:
+    score_hits: int = 0
+    score_misses: int = 0
+    move_hits: int = 0
+    move_misses: int = 0
+    evictions: int = 0
+    """Number of entries dropped, because the cache was full"""
+
+
+class EvaluationCache:
+    """
+    Bounded LRU cache for board scores and picked moves, keyed by the zobrist hash of the position.
+    Can be saved to and loaded from disk, so a warm cache carries over to the next run.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, path: str | None = None):
+        """
+        :param capacity: Maximum number of entries (scores and moves together)
+        :param path: File to load the cache from (if it exists), and to save it to
+        """
+        self.capacity = capacity
+        self.path = path
+        self.statistics = EvaluationCacheStatistics()
+        self._entries: OrderedDict[tuple[int, int], int | chess.Move | None] = OrderedDict()
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get(self, key: tuple[int, int]) -> tuple[bool, int | chess.Move | None]:
+        # the counters are updated under the lock, the cache is shared by the threads of a search
+        with self._lock:
+            found = key in self._entries
+            if key[1] == SCORE:
+                if found:
+                    self.statistics.score_hits += 1
+                else:
+                    self.statistics.score_misses += 1
+            elif found:
+                self.statistics.move_hits += 1
+            else:
+                self.statistics.move_misses += 1
+
+            if not found:
+                return False, None
+            self._entries.move_to_end(key)
+            return True, self._entries[key]
+
+    def _put(self, key: tuple[int, int], value: int | chess.Move | None) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.statistics.evictions += 1
+
+    def get_score(self, key: int) -> int | None:
+        _, score = self._get((key, SCORE))
+        return score
+
+    def put_score(self, key: int, score: int) -> None:
+        self._put((key, SCORE), score)
+
+    def get_move(self, key: int) -> tuple[bool, chess.Move | None]:
+        """
+        :return: whether the position was found, and the cached move (which can be None, e.g. for a finished game)
+        """
+        return self._get((key, MOVE))
+
+    def put_move(self, key: int, move: chess.Move | None) -> None:
+        self._put((key, MOVE), move)
+
+    def load(self, path: str) -> None:
+        """
+        Add the entries saved in `path`, the entries in memory are more recent and win.
+        """
+        with open(path, "rb") as fp:
+            entries = pickle.load(fp)
+        with self._lock:
+            self._entries = _merge(entries[-self.capacity:], self._entries.items(), self.capacity)
+
+    def save(self, path: str | None = None) -> None:
+        """
+        Save the entries, from least to most recently used. The entries are merged with the ones in the file
+        under a file lock, so processes that save to the same file (e.g. the workers of a match) keep each other's
+        entries, and the file is replaced atomically.
+        """
+        path = path or self.path
+        if path is None:
+            return
+
+        with self._lock:
+            entries = list(self._entries.items())
+        with _file_lock(path):
+            if os.path.exists(path):
+                with open(path, "rb") as fp:
+                    entries = list(_merge(pickle.load(fp), entries, self.capacity).items())
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as fp:
+                pickle.dump(entries, fp, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+
+
+_caches: dict[tuple[str, str | None], EvaluationCache] = {}
+_caches_pid: int | None = None
+
+
+def get_evaluation_cache(name: str, capacity: int, path: str | None = None) -> EvaluationCache:
+    """
+    Return the evaluation cache `name` of the current process, so strategies of consecutive games share it.
+    If `path` is given, the cache is loaded from it at creation and saved to it when the process exits.
+    """
+    global _caches, _caches_pid
+    if _caches_pid != os.getpid():
+        # a forked process gets its own caches
+        _caches = {}
+        _caches_pid = os.getpid()
+
+    key = (name, path)
+    if key not in _caches:
+        cache = EvaluationCache(capacity, path)
+        if path is not None:
+            multiprocessing.util.Finalize(None, cache.save, exitpriority=5)
+        _caches[key] = cache
+    return _caches[key]
@@ -0,0 +1,159 @@
+import chess
+
+from baysed_chess.board_evaluations.evaluate_pestos import eg_table, gamephaseInc, mg_table
+
+# Incremental version of `score_pestos`:
+# the mg/eg sums of both colors and the game phase are updated from the delta of each move,
+# instead of scanning all 64 squares. It returns exactly the same scores as `score_pestos`.
+
+Delta = tuple[int, int, int, int, int]
+"""Change of (mg white, mg black, eg white, eg black, game phase) caused by a move"""
+
+
+def _piece_index(piece_type: chess.PieceType, color: chess.Color) -> int:
+    return (piece_type - 1) * 2 + (0 if color == chess.WHITE else 1)
+
+
+class IncrementalPesto:
+    """
+    PeSTO evaluation of one board, kept up to date with make/unmake (`push`/`pop`) deltas.
+    """
+
+    def __init__(self, board: chess.Board):
+        self.mg = [0, 0]
+        self.eg = [0, 0]
+        self.game_phase = 0
+        self._deltas: list[Delta] = []
+        self.reset(board)
+
+    def reset(self, board: chess.Board) -> None:
+        """
+        Evaluate `board` from scratch.
+        """
+        self.mg = [0, 0]
+        self.eg = [0, 0]
+        self.game_phase = 0
+        self._deltas = []
+        for sq, pc in board.piece_map().items():
+            color = 0 if pc.color == chess.WHITE else 1
+            piece_index = (pc.piece_type - 1) * 2 + color
+            self.mg[color] += mg_table[piece_index][sq]
+            self.eg[color] += eg_table[piece_index][sq]
+            self.game_phase += gamephaseInc[piece_index]
+
+    @staticmethod
+    def delta(board: chess.Board, move: chess.Move) -> Delta:
+        """
+        Change of the evaluation if `move` is played on `board`. Handles captures, promotions, castling and en passant.
+        """
+        mg = [0, 0]
+        eg = [0, 0]
+        phase = 0
+        us = 0 if board.turn == chess.WHITE else 1
+        them = 1 - us
+
+        piece_type = board.piece_type_at(move.from_square)
+        moved = _piece_index(piece_type, board.turn)
+        from_square = move.from_square
+        to_square = move.to_square
+
+        if board.is_castling(move):
+            rank = chess.square_rank(from_square)
+            kingside = board.is_kingside_castling(move)
+            king_to = chess.square(6 if kingside else 2, rank)
+            rook_to = chess.square(5 if kingside else 3, rank)
+            # standard notation moves the king two files, chess960 notation moves the king onto the rook
+            if board.piece_type_at(to_square) == chess.ROOK and board.color_at(to_square) == board.turn:
+                rook_from = to_square
+            else:
+                rook_from = chess.square(7 if kingside else 0, rank)
+            rook = _piece_index(chess.ROOK, board.turn)
+            mg[us] += mg_table[moved][king_to] - mg_table[moved][from_square]
+            eg[us] += eg_table[moved][king_to] - eg_table[moved][from_square]
+            mg[us] += mg_table[rook][rook_to] - mg_table[rook][rook_from]
+            eg[us] += eg_table[rook][rook_to] - eg_table[rook][rook_from]
+            return mg[0], mg[1], eg[0], eg[1], phase
+
+        # remove the moved piece, and add the (promoted) piece on its target square
+        placed = _piece_index(move.promotion, board.turn) if move.promotion else moved
+        mg[us] += mg_table[placed][to_square] - mg_table[moved][from_square]
+        eg[us] += eg_table[placed][to_square] - eg_table[moved][from_square]
+        phase += gamephaseInc[placed] - gamephaseInc[moved]
+
+        # remove the captured piece
+        if board.is_en_passant(move):
+            captured_square = to_square - 8 if board.turn == chess.WHITE else to_square + 8
+            captured_type = chess.PAWN
+        else:
+            captured_square = to_square
+            captured_type = board.piece_type_at(to_square)
+        if captured_type is not None:
+            captured = _piece_index(captured_type, not board.turn)
+            mg[them] -= mg_table[captured][captured_square]
+            eg[them] -= eg_table[captured][captured_square]
+            phase -= gamephaseInc[captured]
+
+        return mg[0], mg[1], eg[0], eg[1], phase
+
+    def apply(self, delta: Delta) -> None:
+        self.mg[0] += delta[0]
+        self.mg[1] += delta[1]
+        self.eg[0] += delta[2]
+        self.eg[1] += delta[3]
+        self.game_phase += delta[4]
+
+    def revert(self, delta: Delta) -> None:
+        self.mg[0] -= delta[0]
+        self.mg[1] -= delta[1]
+        self.eg[0] -= delta[2]
+        self.eg[1] -= delta[3]
+        self.game_phase -= delta[4]
+
+    def push(self, board: chess.Board, move: chess.Move) -> None:
+        """
+        Make `move` on `board`, and update the evaluation.
+        """
+        delta = self.delta(board, move)
+        board.push(move)
+        self.apply(delta)
+        self._deltas.append(delta)
+
+    def pop(self, board: chess.Board) -> chess.Move:
+        """
+        Unmake the last move pushed with `push`, and restore the evaluation.
+        """
+        self.revert(self._deltas.pop())
+        return board.pop()
+
+    def _tapered(self, side2move: int, delta: Delta = (0, 0, 0, 0, 0)) -> int:
+        other = 1 - side2move
+        mg = (self.mg[0] + delta[0], self.mg[1] + delta[1])
+        eg = (self.eg[0] + delta[2], self.eg[1] + delta[3])
+        mg_score = mg[side2move] - mg[other]
+        eg_score = eg[side2move] - eg[other]
+        mg_phase = min(self.game_phase + delta[4], 24)  # in case of early promotion
+        eg_phase = 24 - mg_phase
+        return (mg_score * mg_phase + eg_score * eg_phase) // 24
+
+    def score(self, board: chess.Board) -> int:
+        """
+        Same as `score_pestos(board)`, for the board this evaluation is in sync with.
+        """
+        # the only outcome with a winner is checkmate, the side to move lost
+        if board.is_checkmate():
+            return -100_000 if board.turn == chess.WHITE else 100_000
+        return self._tapered(0 if board.turn == chess.WHITE else 1)
+
+    def score_move(self, board: chess.Board, move: chess.Move, delta: Delta | None = None) -> int:
+        """
+        Same as `score_pestos` of `board` after `move`, without copying the board.
+        :param delta: the delta of the move, if it is already known
+        """
+        delta = delta if delta is not None else self.delta(board, move)
+        board.push(move)
+        try:
+            if board.is_checkmate():
+                return -100_000 if board.turn == chess.WHITE else 100_000
+        finally:
+            board.pop()
+        return self._tapered(1 if board.turn == chess.WHITE else 0, delta)
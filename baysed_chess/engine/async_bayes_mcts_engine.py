@@ -0,0 +1,91 @@
+import asyncio
+
+import chess
+import chess.engine
+
+from baysed_chess.engine.bayes_mcts_engine import BayesMctsEngine
+from baysed_chess.limit import Limit
+from baysed_chess.strategies.i_async_strategy import IAsyncStrategy
+
+
+class AsyncBayesMctsEngine(BayesMctsEngine):
+    """
+    Engine that plays using our Bayesian MCTS, with asynchronous rollouts on several engine instances.
+
+    Inside an event loop use `play_async`.
+    `play` runs the search on an event loop owned by the engine, because the engine processes of the strategies
+    are bound to the loop they were started on. So do not mix both in one engine.
+    Pondering runs on the loop of `play` as well, so it is only supported together with `play`.
+    """
+
+    PONDER_SLICE = 0.05
+    """Seconds of one asynchronous search while pondering, the ponder thread checks for a stop between slices"""
+
+    async_strategies: list[IAsyncStrategy]
+    """The strategies for the rollouts, each one has at most one rollout in flight"""
+
+    def __init__(self, board: chess.Board, color: chess.Color, strategies: list[IAsyncStrategy]):
+        super().__init__(board, color, None)
+        self.async_strategies = strategies
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def __del__(self):
+        self.close()
+
+    @staticmethod
+    def get_name() -> str:
+        return "BayesMctsAsyncEngine"
+
+    def play(self, board: chess.Board, limit: Limit) -> chess.engine.PlayResult:
+        self.stop_pondering()
+        return self._get_loop().run_until_complete(self.play_async(board, limit))
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop
+
+    def _sample(self) -> int:
+        # used by the ponder thread: one slice of the search, on the loop of `play`
+        return self._get_loop().run_until_complete(
+            self.mcts.sample_async(self.async_strategies, runs=None, time_limit=self.PONDER_SLICE))
+
+    async def play_async(self, board: chess.Board, limit: Limit) -> chess.engine.PlayResult:
+        if len(board.move_stack) != 0:  # apply previous move to mcts --> reuse previous simulation results
+            self._count_ponder_gain(board.peek())
+            self.mcts.apply_move(board.peek())
+
+        # the policy is checked before every rollout, which is cheap compared to the rollouts of an engine
+        limit.bind(self.mcts)
+        limit.reset()
+        node_count = await self.mcts.sample_async(self.async_strategies, runs=limit.nodes or None,
+                                                  stop=limit.should_stop)
+
+        self.node_counts.append(node_count)
+        best_move = self.get_best_move(self.mcts.get_moves(), board.turn, self.mcts.random_state)
+        self.mcts.apply_move(best_move)
+        return chess.engine.PlayResult(move=best_move, ponder=None)
+
+    def new_game(self, board: chess.Board, color: chess.Color) -> None:
+        """
+        Start a new tree, the engine processes of the strategies are kept.
+        """
+        super().new_game(board, color)
+        for strategy in self.async_strategies:
+            strategy.new_game()
+
+    async def close_async(self) -> None:
+        """
+        Close all strategies, e.g. quit their engine processes.
+        """
+        for strategy in self.async_strategies:
+            await strategy.close()
+
+    def close(self) -> None:
+        """
+        Close all strategies and the event loop of `play`.
+        """
+        self.stop_pondering()
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.run_until_complete(self.close_async())
+            self._loop.close()
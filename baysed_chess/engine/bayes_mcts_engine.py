@@ -1,50 +1,183 @@
+import random
+import threading
+
 import chess
 import chess.engine
-from torch import distributions as dist
 
 from baysed_chess.engine.i_engine import IEngine
 from baysed_chess.limit import Limit
 from baysed_chess.mcts.baysian_mcts import BayesianMcts
+from baysed_chess.mcts.baysian_mcts_array import BayesianMctsArray
+from baysed_chess.mcts.transposition_table import TranspositionStatistics, TranspositionTable
 from baysed_chess.strategies.i_strategy import IStrategy
 
 
 class BayesMctsEngine(IEngine):
     """Engine that plays using our bayesian mcts implementation"""
 
-    mcts: BayesianMcts
+    mcts: BayesianMcts | BayesianMctsArray
     """The Bayesian MCTS"""
+    ponder_nodes: list[int]
+    """Number of samples of each pondering, see `start_pondering`"""
+    ponder_gains: list[int]
+    """Number of samples pondering added to the subtree of the opponent's move, per pondering"""
+    ponder_hits: int
+    """Number of times the opponent played the reply that pondering searched most"""
 
-    def __init__(self, board: chess.Board, color: chess.Color, strategy: IStrategy):
+    def __init__(self, board: chess.Board, color: chess.Color, strategy: IStrategy, array_tree: bool = False,
+                 transposition_table_size: int = 0, seed_priors: bool = False):
+        """
+        :param transposition_table_size: if > 0, share nodes of transposed positions, see `TranspositionTable`
+        :param seed_priors: seed the priors of new children with a batched evaluation of the strategy
+        """
         super().__init__(board, color, strategy)
-        self.mcts = BayesianMcts(board, self.strategy, self.color)
+        if array_tree and (transposition_table_size > 0 or seed_priors):
+            raise ValueError("transpositions and seeded priors are not supported by the array tree")
+
+        self.array_tree = array_tree
+        self.transposition_table_size = transposition_table_size
+        self.seed_priors = seed_priors
+        self.mcts = self._create_mcts(board, None)
         self.node_counts = []
+        self.ponder_nodes = []
+        self.ponder_gains = []
+        self.ponder_hits = 0
+        self._ponder_thread: threading.Thread | None = None
+        self._ponder_stop = threading.Event()
+        self._pondered = 0
+        self._visits_before_pondering: dict[chess.Move, int] | None = None
+        self._expected_reply: chess.Move | None = None
+
+    def _create_mcts(self, board: chess.Board,
+                     transposition_table: TranspositionTable | None) -> BayesianMcts | BayesianMctsArray:
+        if self.array_tree:
+            return BayesianMctsArray(board, self.strategy, self.color)
+        if self.transposition_table_size > 0:
+            if transposition_table is None:
+                transposition_table = TranspositionTable(self.transposition_table_size)
+            return BayesianMcts(board, self.strategy, self.color, transposition_table=transposition_table,
+                                seed_priors=self.seed_priors)
+        return BayesianMcts(board, self.strategy, self.color, seed_priors=self.seed_priors)
+
+    def new_game(self, board: chess.Board, color: chess.Color) -> None:
+        """
+        Start a new tree and new statistics. The transposition table is cleared and reused.
+        """
+        self.stop_pondering()
+        super().new_game(board, color)
+        if self.strategy is not None:
+            # the strategy leases its engine again at the next use, which then starts with `ucinewgame`
+            self.strategy.close()
+
+        table = getattr(self.mcts, "transposition_table", None)
+        if table is not None:
+            table.statistics = TranspositionStatistics()
+        self.mcts = self._create_mcts(board, table)
+        self.node_counts = []
+        self.ponder_nodes = []
+        self.ponder_gains = []
+        self.ponder_hits = 0
+        self._visits_before_pondering = None
+        self._expected_reply = None
+
+    @property
+    def transposition_hits(self) -> int:
+        """Number of nodes that were shared instead of created, because of transpositions"""
+        table = getattr(self.mcts, "transposition_table", None)
+        return table.statistics.hits if table is not None else 0
 
     @staticmethod
     def get_name() -> str:
         return "BayesMctsEngine"
 
+    def _sample(self) -> int:
+        """
+        Perform one search iteration.
+        :return: Number of rollouts of the iteration
+        """
+        self.mcts.sample(1)
+        return 1
+
     def play(self, board: chess.Board, limit: Limit) -> chess.engine.PlayResult:
+        self.stop_pondering()
         if len(board.move_stack) != 0:  # apply previous move to mcts --> reuse previous simulation results
+            self._count_ponder_gain(board.peek())
             self.mcts.apply_move(board.peek())
 
         node_count = 0
 
         def do():
             nonlocal node_count
-            self.mcts.sample(1)
-            node_count += 1
+            node_count += self._sample()
 
+        limit.bind(self.mcts)
         limit.run(do)
         self.node_counts.append(node_count)
-        best_move = self.get_best_move(self.mcts.get_moves(), board.turn)
+        best_move = self.get_best_move(self.mcts.get_moves(), board.turn, self.mcts.random_state)
         self.mcts.apply_move(best_move)
         return chess.engine.PlayResult(move=best_move, ponder=None)
 
+    def _visits(self) -> dict[chess.Move, int]:
+        return {c.move: c.visits for c in self.mcts.get_children()}
+
+    def start_pondering(self) -> None:
+        """
+        Keep sampling the tree after our move in a background thread, while the opponent thinks.
+        The next `play` (or `stop_pondering`) stops it, and the subtree of the opponent's move keeps the samples.
+        """
+        if self._ponder_thread is not None or self.mcts.board.is_game_over():
+            return
+
+        self._visits_before_pondering = self._visits()
+        self._pondered = 0
+        self._ponder_stop.clear()
+        self._ponder_thread = threading.Thread(target=self._ponder, daemon=True)
+        self._ponder_thread.start()
+
+    def _ponder(self) -> None:
+        while not self._ponder_stop.is_set():
+            self._pondered += self._sample()
+
+    def stop_pondering(self) -> None:
+        """
+        Stop the ponder thread, if the engine ponders.
+        """
+        if self._ponder_thread is None:
+            return
+
+        self._ponder_stop.set()
+        self._ponder_thread.join()
+        self._ponder_thread = None
+        self.ponder_nodes.append(self._pondered)
+        visits = self._visits()
+        self._expected_reply = max(visits, key=visits.get) if visits else None
+
+    def _count_ponder_gain(self, move: chess.Move) -> None:
+        """
+        Record whether pondering expected the opponent's `move`, and the samples it added to the subtree of `move`.
+        """
+        if self._visits_before_pondering is None:
+            return
+
+        if move == self._expected_reply:
+            self.ponder_hits += 1
+        self.ponder_gains.append(self._visits().get(move, 0) - self._visits_before_pondering.get(move, 0))
+        self._visits_before_pondering = None
+        self._expected_reply = None
+
+    def close(self) -> None:
+        self.stop_pondering()
+        super().close()
+
     @staticmethod
-    def get_best_move(possible_moves: dict[chess.Move, dist.Normal], color: chess.Color) -> chess.Move:
+    def get_best_move(possible_moves: dict[chess.Move, tuple[float, float]], color: chess.Color,
+                      random_state: random.Random) -> chess.Move:
+        """
+        Thompson sampling: draw one sample from the Gaussian (mu, sigma) of each move and pick the best sample.
+        """
         moves = {}
-        for m, d in possible_moves.items():
-            moves[m] = d.sample()
+        for m, (mu, sigma) in possible_moves.items():
+            moves[m] = random_state.gauss(mu, sigma)
 
         return max(moves.items(), key=lambda x: x[1])[0] if color == chess.WHITE else (
             min(moves.items(), key=lambda x: x[1])[0])
@@ -1,25 +1,55 @@
+import threading
+
 import chess
 import chess.engine
 
 from baysed_chess.engine.i_engine import IEngine
 from baysed_chess.limit import Limit
 from baysed_chess.mcts.classic_mcts import ClassicMcts
+from baysed_chess.mcts.classic_mcts_node import ClassicMctsNode
 from baysed_chess.strategies.i_strategy import IStrategy
 
 
 class ClassicMctsEngine(IEngine):
     """Engine that plays using our classic mcts implementation"""
 
-    def __init__(self, board: chess.Board, color: chess.Color, strategy: IStrategy):
+    mcts: ClassicMcts | None
+    """The Classic MCTS, kept across moves if the tree is reused"""
+    retained_nodes: list[int]
+    """Number of samples kept from the previous searches, per move"""
+    ponder_nodes: list[int]
+    """Number of samples while pondering, per move"""
+    ponder_hits: int
+    """Number of times the opponent played the expected reply"""
+
+    def __init__(self, board: chess.Board, color: chess.Color, strategy: IStrategy, tree_reuse: bool = True,
+                 ponder: bool = False):
+        """
+        :param tree_reuse: keep the subtree of the played moves, instead of searching every move from scratch
+        :param ponder: while the opponent thinks, keep sampling the subtree of its expected reply (needs `tree_reuse`)
+        """
         super().__init__(board, color, strategy)
+        if ponder and not tree_reuse:
+            raise ValueError("pondering needs the tree reuse")
+
+        self.tree_reuse = tree_reuse
+        self.ponder = ponder
+        self.mcts = ClassicMcts(board, self.color, self.strategy) if tree_reuse else None
         self.node_counts = []
+        self.retained_nodes = []
+        self.ponder_nodes = []
+        self.ponder_hits = 0
+        self._ponder_thread: threading.Thread | None = None
+        self._ponder_stop = threading.Event()
+        self._ponder_move: chess.Move | None = None
+        self._pondered = 0
 
     @staticmethod
     def get_name() -> str:
         return "ClassicMctsEngine V2"
 
     def play(self, board: chess.Board, limit: Limit) -> chess.engine.PlayResult:
-        mcts = ClassicMcts(board, self.color, self.strategy)
+        mcts = self._sync(board) if self.tree_reuse else ClassicMcts(board, self.color, self.strategy)
         node_count = 0
 
         def do():
@@ -27,8 +57,92 @@ class ClassicMctsEngine(IEngine):
             mcts.sample(1)
             node_count += 1
 
+        # the policies that look at the tree need the Gaussians of the Bayesian MCTS, not the tree of another engine
+        limit.bind(None)
         limit.run(do)
         self.node_counts.append(node_count)
         best_move = max(mcts.root.children, key=lambda x: x.score).move if board.turn == chess.WHITE else (
             min(mcts.root.children, key=lambda x: x.score).move)
-        return chess.engine.PlayResult(move=best_move, ponder=None)
+        if not self.tree_reuse:
+            return chess.engine.PlayResult(move=best_move, ponder=None)
+
+        mcts.apply_move(best_move)
+        ponder_move = self._expected_reply()
+        if self.ponder:
+            self._start_pondering(ponder_move)
+        return chess.engine.PlayResult(move=best_move, ponder=ponder_move)
+
+    def _sync(self, board: chess.Board) -> ClassicMcts:
+        """
+        Stop pondering and apply the opponent's move to the tree, or start a new tree if the boards diverged.
+        """
+        ponder_nodes = self._stop_pondering()
+        if ponder_nodes is not None:
+            self.ponder_nodes.append(ponder_nodes)
+
+        if len(board.move_stack) == len(self.mcts.board.move_stack) + 1:
+            if board.peek() == self._ponder_move:
+                self.ponder_hits += 1
+            self.mcts.apply_move(board.peek())
+        if self.mcts.board != board:
+            # e.g. a game that started from another position
+            self.mcts = ClassicMcts(board.copy(), self.color, self.strategy)
+        self.retained_nodes.append(self.mcts.root.visits)
+        return self.mcts
+
+    def _expected_reply(self) -> chess.Move | None:
+        """
+        Return the reply of the opponent that the tree expects, the most visited child of the root.
+        """
+        if len(self.mcts.root.children) == 0:
+            return None
+        return max(self.mcts.root.children, key=lambda x: x.visits).move
+
+    def _start_pondering(self, ponder_move: chess.Move | None) -> None:
+        self._ponder_move = ponder_move
+        if self.mcts.root.is_game_over():
+            return
+
+        # sample the subtree of the expected reply, or the whole tree if there is nothing to search below it
+        subtree = next((c for c in self.mcts.root.children if c.move == ponder_move), None)
+        if subtree is not None and subtree.is_game_over():
+            subtree = None
+
+        self._pondered = 0
+        self._ponder_stop.clear()
+        self._ponder_thread = threading.Thread(target=self._ponder, args=(subtree,), daemon=True)
+        self._ponder_thread.start()
+
+    def _ponder(self, subtree: ClassicMctsNode | None) -> None:
+        while not self._ponder_stop.is_set():
+            self.mcts.sample(1, subtree)
+            self._pondered += 1
+
+    def _stop_pondering(self) -> int | None:
+        """
+        Stop the ponder thread.
+        :return: Number of samples while pondering, or None if the engine did not ponder
+        """
+        if self._ponder_thread is None:
+            return None
+
+        self._ponder_stop.set()
+        self._ponder_thread.join()
+        self._ponder_thread = None
+        return self._pondered
+
+    def new_game(self, board: chess.Board, color: chess.Color) -> None:
+        self._stop_pondering()
+        super().new_game(board, color)
+        # the strategy leases its engine again at the next use, which then starts with `ucinewgame`
+        self.strategy.close()
+        self.mcts = ClassicMcts(board, self.color, self.strategy) if self.tree_reuse else None
+        self.node_counts = []
+        self.retained_nodes = []
+        self.ponder_nodes = []
+        self.ponder_hits = 0
+        self._ponder_move = None
+
+    def close(self) -> None:
+        self._stop_pondering()
+        super().close()
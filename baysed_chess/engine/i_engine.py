@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 
 import chess.engine
@@ -31,6 +32,33 @@ class IEngine(ABC):
         """
         pass
 
+    async def play_async(self, board: chess.Board, limit: Limit) -> chess.engine.PlayResult:
+        """
+        Same as `play`, but awaitable from an event loop.
+        By default `play` runs in a separate thread, engines with asynchronous search override this.
+        :param board: the chess board
+        :param limit: a limit specifying when to stop searching
+        :return: the engine's PlayResult
+        """
+        return await asyncio.to_thread(self.play, board, limit)
+
+    def new_game(self, board: chess.Board, color: chess.Color) -> None:
+        """
+        Prepare the engine for a new game, so one engine can play several games one after the other.
+        Engines with state between moves (e.g. a search tree) override this to reset it.
+        :param board: start position of the new game
+        :param color: the side the engine plays in the new game
+        """
+        self.board = board
+        self.color = color
+
+    def close(self) -> None:
+        """
+        Release the resources of the engine, e.g. return the engines of its strategy to the engine pool.
+        """
+        if self.strategy is not None:
+            self.strategy.close()
+
     @staticmethod
     @abstractmethod
     def get_name() -> str:
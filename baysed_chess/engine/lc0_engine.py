@@ -2,6 +2,7 @@ import chess
 import chess.engine
 
 from baysed_chess.engine.i_engine import IEngine
+from baysed_chess.engine_pool import get_engine_pool
 from baysed_chess.limit import Limit
 
 
@@ -10,10 +11,20 @@ class Lc0Engine(IEngine):
 
     def __init__(self, board: chess.Board, color: chess, path: str):
         super().__init__(board, color, None)
-        self.lc0 = chess.engine.SimpleEngine.popen_uci(path)
+        self.path = path
+        self.lc0 = get_engine_pool().lease(path)
 
     def __del__(self):
-        self.lc0.quit()
+        self.close()
+
+    def new_game(self, board: chess.Board, color: chess.Color) -> None:
+        super().new_game(board, color)
+        # released engines start the next game with `ucinewgame`
+        self.lc0.release()
+        self.lc0 = get_engine_pool().lease(self.path)
+
+    def close(self) -> None:
+        self.lc0.release()
 
     def play(self, board: chess.Board, limit: Limit) -> chess.engine.PlayResult:
         return self.lc0.play(board, limit.translate_to_engine_limit())
@@ -0,0 +1,145 @@
+import multiprocessing as mp
+import random
+from multiprocessing.connection import Connection
+from typing import Callable
+
+import chess
+import chess.engine
+
+from baysed_chess.engine.bayes_mcts_engine import BayesMctsEngine
+from baysed_chess.engine.i_engine import IEngine
+from baysed_chess.limit import Limit
+from baysed_chess.mcts.baysian_mcts import BayesianMcts
+from baysed_chess.mcts.gaussian_utils import precision_weighted
+from baysed_chess.strategies.i_strategy import IStrategy
+
+
+def _search_worker(connection: Connection, board: chess.Board, color: chess.Color,
+                   strategy_factory: Callable[[], IStrategy], seed: int | None) -> None:
+    """
+    Grows one Bayesian MCTS and answers the commands of `RootParallelBayesMctsEngine`:
+        ("search", (moves, limit)): apply the moves, sample until the limit is reached and
+                                    send the root statistics {move: (mu, sigma)} and the number of samples back.
+        ("close", None): stop the worker.
+    """
+    mcts = BayesianMcts(board, strategy_factory(), color, seed)
+    while True:
+        command, arg = connection.recv()
+        if command == "close":
+            break
+
+        moves, limit = arg
+        for move in moves:
+            mcts.apply_move(move)
+
+        node_count = 0
+
+        def do():
+            nonlocal node_count
+            mcts.sample(1)
+            node_count += 1
+
+        limit.bind(mcts)
+        limit.run(do)
+        connection.send((mcts.get_moves(), node_count))
+
+    mcts.strategy.close()
+    connection.close()
+
+
+class RootParallelBayesMctsEngine(IEngine):
+    """
+    Engine that plays using root-parallel Bayesian MCTS:
+    Several worker processes grow independent trees from the same position (with different seeds),
+    the Gaussians of the root children are merged by precision-weighting before picking the move.
+
+    The workers are started at the first move and live until `close` is called, so their trees are reused.
+    Note: Daemonic processes can not start workers, i.e. this engine can not run inside a `multiprocessing.Pool`.
+    """
+
+    def __init__(self, board: chess.Board, color: chess.Color, strategy_factory: Callable[[], IStrategy],
+                 workers: int = 4, seed: int | None = None):
+        super().__init__(board, color, None)
+        self.strategy_factory = strategy_factory
+        self.workers = workers
+        self.seed = seed
+        self.random_state = random.Random(seed)
+        self.node_counts = []
+        self._connections: list[Connection] = []
+        self._processes: list[mp.Process] = []
+        self._pending_moves: list[chess.Move] = []
+
+    def __del__(self):
+        self.close()
+
+    @staticmethod
+    def get_name() -> str:
+        return "BayesMctsRootParallelEngine"
+
+    def _start_workers(self) -> None:
+        for i in range(self.workers):
+            parent_connection, child_connection = mp.Pipe()
+            seed = self.seed + i if self.seed is not None else None
+            process = mp.Process(target=_search_worker,
+                                 args=(child_connection, self.board.copy(), self.color, self.strategy_factory, seed))
+            process.start()
+            child_connection.close()
+            self._connections.append(parent_connection)
+            self._processes.append(process)
+
+    def new_game(self, board: chess.Board, color: chess.Color) -> None:
+        """
+        Stop the workers, the next move starts new ones with new trees.
+        """
+        self.close()
+        super().new_game(board, color)
+        self.node_counts = []
+        self._pending_moves = []
+
+    def close(self) -> None:
+        """
+        Stop all worker processes.
+        """
+        for connection in self._connections:
+            try:
+                connection.send(("close", None))
+                connection.close()
+            except (OSError, ValueError):
+                pass
+        for process in self._processes:
+            process.join()
+        self._connections = []
+        self._processes = []
+
+    def play(self, board: chess.Board, limit: Limit) -> chess.engine.PlayResult:
+        if not self._processes:
+            self._start_workers()
+
+        moves = self._pending_moves
+        if len(board.move_stack) != 0:  # apply previous move to mcts --> reuse previous simulation results
+            moves = moves + [board.peek()]
+
+        # every worker binds the limit to its own tree, do not send the tree the limit was bound to before
+        limit.bind(None)
+        for connection in self._connections:
+            connection.send(("search", (moves, limit)))
+        results = [connection.recv() for connection in self._connections]
+
+        self.node_counts.append(sum(node_count for _, node_count in results))
+        best_move = BayesMctsEngine.get_best_move(self.merge_moves([r for r, _ in results]), board.turn,
+                                                  self.random_state)
+        self._pending_moves = [best_move]
+        return chess.engine.PlayResult(move=best_move, ponder=None)
+
+    @staticmethod
+    def merge_moves(worker_moves: list[dict[chess.Move, tuple[float, float]]]) -> dict[chess.Move, tuple[float, float]]:
+        """
+        Merge the root children of all workers, by precision-weighting the Gaussians of each move.
+        """
+        gaussians: dict[chess.Move, list[tuple[float, float]]] = {}
+        for moves in worker_moves:
+            for move, gaussian in moves.items():
+                gaussians.setdefault(move, []).append(gaussian)
+
+        return {move: precision_weighted([mu for mu, _ in g], [sigma for _, sigma in g])
+                for move, g in gaussians.items()}
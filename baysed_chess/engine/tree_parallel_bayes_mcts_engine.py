@@ -0,0 +1,48 @@
+import chess
+
+from baysed_chess.engine.bayes_mcts_engine import BayesMctsEngine
+from baysed_chess.mcts.transposition_table import TranspositionTable
+from baysed_chess.mcts.tree_parallel_baysian_mcts import TreeParallelBayesianMcts
+from baysed_chess.strategies.i_strategy import IStrategy
+
+
+class TreeParallelBayesMctsEngine(BayesMctsEngine):
+    """
+    Engine that plays using tree-parallel Bayesian MCTS:
+    Every search step rolls out a batch of leaves of one shared tree concurrently, on a pool of strategies.
+    The node count of a move is the number of rollouts, not the number of batches.
+    """
+
+    mcts: TreeParallelBayesianMcts
+    """The tree-parallel Bayesian MCTS"""
+
+    def __init__(self, board: chess.Board, color: chess.Color, strategies: list[IStrategy], batch_size: int = 8):
+        # used by `_create_mcts`, which the constructor of the base class calls
+        self.strategies = strategies
+        self.batch_size = batch_size
+        super().__init__(board, color, strategies[0])
+
+    def _create_mcts(self, board: chess.Board,
+                     transposition_table: TranspositionTable | None) -> TreeParallelBayesianMcts:
+        return TreeParallelBayesianMcts(board, self.strategies, self.color, self.batch_size)
+
+    @staticmethod
+    def get_name() -> str:
+        return "BayesMctsTreeParallelEngine"
+
+    def new_game(self, board: chess.Board, color: chess.Color) -> None:
+        self.stop_pondering()
+        # the first strategy is the strategy of the engine, which the base class closes
+        for strategy in self.strategies[1:]:
+            strategy.close()
+        self.mcts.close()
+        super().new_game(board, color)
+
+    def close(self) -> None:
+        self.stop_pondering()
+        for strategy in self.mcts.strategies:
+            strategy.close()
+        self.mcts.close()
+
+    def _sample(self) -> int:
+        return self.mcts.sample_batch()
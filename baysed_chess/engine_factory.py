@@ -1,16 +1,32 @@
+import os
 import random
+import re
 from enum import Enum
+from functools import partial
+from typing import Callable
 
 import chess
 
+from baysed_chess.board_evaluations.evaluation_cache import EvaluationCache, get_evaluation_cache
+from baysed_chess.engine.async_bayes_mcts_engine import AsyncBayesMctsEngine
 from baysed_chess.engine.bayes_mcts_engine import BayesMctsEngine
 from baysed_chess.engine.classic_mcts_engine import ClassicMctsEngine
 from baysed_chess.engine.i_engine import IEngine
 from baysed_chess.engine.lc0_engine import Lc0Engine
+from baysed_chess.engine.root_parallel_bayes_mcts_engine import RootParallelBayesMctsEngine
 from baysed_chess.engine.stockfish_engine import StockfishEngine
+from baysed_chess.engine.tree_parallel_bayes_mcts_engine import TreeParallelBayesMctsEngine
+from baysed_chess.stockfish_client import StockfishClient
+from baysed_chess.strategies.async_lc0_strategy import AsyncLc0Strategy
+from baysed_chess.strategies.async_random_stockfish_strategy import AsyncRandomStockfishStrategy
+from baysed_chess.strategies.async_stockfish_strategy import AsyncStockfishStrategy
+from baysed_chess.strategies.async_strategy_adapter import AsyncStrategyAdapter
+from baysed_chess.strategies.cached_strategy import AsyncCachedStrategy, CachedStrategy
+from baysed_chess.strategies.i_async_strategy import IAsyncStrategy
 from baysed_chess.strategies.i_strategy import IStrategy
 from baysed_chess.strategies.lc0_strategy import Lc0Strategy
 from baysed_chess.strategies.pesto_strategy import PestoStrategy
+from baysed_chess.strategies.pipelined_stockfish_strategy import PipelinedStockfishStrategy
 from baysed_chess.strategies.random_stockfish_strategy import RandomStockfishStrategy
 from baysed_chess.strategies.random_strategy import RandomStrategy
 from baysed_chess.strategies.stockfish_strategy import StockfishStrategy
@@ -22,6 +38,9 @@ class EngineEnum(Enum):
     Stockfish = 2
     Lc0 = 3
     Random = 4
+    BayesianMctsRootParallel = 5
+    BayesianMctsTreeParallel = 6
+    BayesianMctsAsync = 7
 
 
 class StrategyEnum(Enum):
@@ -37,46 +56,185 @@ class EngineFactory:
 
     @staticmethod
     def create_engine(engine_name: EngineEnum, strategy_name: StrategyEnum, color: chess.Color, stockfish_path: str,
-                      lc0_path: str, stockfish_elo: int, rollout_depth: int = 4) -> IEngine:
+                      lc0_path: str, stockfish_elo: int, rollout_depth: int = 4, array_tree: bool = False,
+                      workers: int = 4, batch_size: int = 8, transposition_table_size: int = 0,
+                      eval_cache_size: int = 0, eval_cache_dir: str | None = None,
+                      seed_priors: bool = False, tree_reuse: bool = True, ponder: bool = False,
+                      pipeline_depth: int = 0, board: chess.Board | None = None, lc0_instances: int = 1) -> IEngine:
+        """
+        :param pipeline_depth: if > 0, the `BayesianMctsAsync` engine with the stockfish strategy shares `workers`
+            stockfish processes, with `pipeline_depth` rollouts in flight per process, see `StockfishClient`
+        :param lc0_instances: number of lc0 processes of every lc0 strategy for batched evaluations, see `Lc0Strategy`
+        :param board: start position of the game, by default the initial position
+        """
+        board = board.copy() if board is not None else chess.Board()
+        if engine_name == EngineEnum.BayesianMctsRootParallel:
+            # every worker process creates its own strategy
+            strategy_factory = partial(EngineFactory.create_strategy, strategy_name, stockfish_path, lc0_path,
+                                       rollout_depth, eval_cache_size, eval_cache_dir, lc0_instances)
+            return EngineFactory._get_root_parallel_bayesian_mcts_engine(board, color, strategy_factory, workers)
+        if engine_name == EngineEnum.BayesianMctsTreeParallel:
+            # one strategy (e.g. engine process) per rollout thread
+            strategies = [EngineFactory.create_strategy(strategy_name, stockfish_path, lc0_path, rollout_depth,
+                                                        eval_cache_size, eval_cache_dir, lc0_instances)
+                          for _ in range(workers)]
+            return EngineFactory._get_tree_parallel_bayesian_mcts_engine(board, color, strategies, batch_size)
+        if engine_name == EngineEnum.BayesianMctsAsync:
+            if pipeline_depth > 0 and strategy_name == StrategyEnum.Stockfish:
+                # one strategy per rollout in flight, all of them share the stockfish processes of one client
+                client = StockfishClient(stockfish_path, workers)
+                async_strategies = [EngineFactory.create_async_strategy(strategy_name, stockfish_path, lc0_path,
+                                                                        rollout_depth, eval_cache_size,
+                                                                        eval_cache_dir, client)
+                                    for _ in range(workers * pipeline_depth)]
+                return EngineFactory._get_async_bayesian_mcts_engine(board, color, async_strategies)
+
+            # one strategy (e.g. engine process) per rollout in flight
+            async_strategies = [EngineFactory.create_async_strategy(strategy_name, stockfish_path, lc0_path,
+                                                                    rollout_depth, eval_cache_size, eval_cache_dir)
+                                for _ in range(workers)]
+            return EngineFactory._get_async_bayesian_mcts_engine(board, color, async_strategies)
+
+        strategy = EngineFactory.create_strategy(strategy_name, stockfish_path, lc0_path, rollout_depth,
+                                                 eval_cache_size, eval_cache_dir, lc0_instances)
+
+        match engine_name:
+            case EngineEnum.ClassicMcts:
+                return EngineFactory._get_classic_mcts_engine(board, color, strategy, tree_reuse, ponder)
+            case EngineEnum.BayesianMcts:
+                return EngineFactory._get_bayesian_mcts_engine(board, color, strategy, array_tree,
+                                                               transposition_table_size, seed_priors)
+            case EngineEnum.Stockfish:
+                return EngineFactory._get_stockfish_engine(board, color, stockfish_path, stockfish_elo)
+            case EngineEnum.Lc0:
+                return EngineFactory._get_lc0_engine(board, color, lc0_path)
+
+    @staticmethod
+    def create_strategy(strategy_name: StrategyEnum, stockfish_path: str, lc0_path: str, rollout_depth: int = 4,
+                        eval_cache_size: int = 0, eval_cache_dir: str | None = None,
+                        lc0_instances: int = 1) -> IStrategy:
+        """
+        :param eval_cache_size: if > 0, cache the board scores of the strategy, see `CachedStrategy`
+        :param eval_cache_dir: directory to persist the cache in, with one file per kind of strategy
+        :param lc0_instances: number of lc0 processes the lc0 strategy spreads batched evaluations over
+        """
+        strategy = EngineFactory._create_uncached_strategy(strategy_name, stockfish_path, lc0_path, rollout_depth,
+                                                           lc0_instances)
+        if eval_cache_size <= 0:
+            return strategy
+
+        cache = EngineFactory._get_evaluation_cache(strategy_name, stockfish_path, lc0_path, rollout_depth,
+                                                    eval_cache_size, eval_cache_dir)
+        return CachedStrategy(strategy, cache, EngineFactory._is_deterministic(strategy_name))
+
+    @staticmethod
+    def _get_evaluation_cache(strategy_name: StrategyEnum, stockfish_path: str, lc0_path: str, rollout_depth: int,
+                              eval_cache_size: int, eval_cache_dir: str | None) -> EvaluationCache:
+        # all strategies of the same kind in this process share one cache, across games
+        name = f"{strategy_name.name}-{rollout_depth}"
+        if strategy_name in (StrategyEnum.Stockfish, StrategyEnum.RandomStockfish):
+            name += f"-{stockfish_path}"
+        elif strategy_name == StrategyEnum.Lc0:
+            name += f"-{lc0_path}"
+
+        path = None
+        if eval_cache_dir is not None:
+            os.makedirs(eval_cache_dir, exist_ok=True)
+            path = os.path.join(eval_cache_dir, re.sub(r"[^\w.-]", "_", name) + ".pickle")
+        return get_evaluation_cache(name, eval_cache_size, path)
+
+    @staticmethod
+    def _is_deterministic(strategy_name: StrategyEnum) -> bool:
+        """Only deterministic rollout policies can reuse their moves"""
+        return strategy_name in (StrategyEnum.Stockfish, StrategyEnum.Pestos)
+
+    @staticmethod
+    def _create_uncached_strategy(strategy_name: StrategyEnum, stockfish_path: str, lc0_path: str,
+                                  rollout_depth: int, lc0_instances: int = 1) -> IStrategy:
         match strategy_name:
             case StrategyEnum.Stockfish:
-                strategy = EngineFactory._get_stockfish_strategy(stockfish_path, rollout_depth)
+                return EngineFactory._get_stockfish_strategy(stockfish_path, rollout_depth)
             case StrategyEnum.Lc0:
-                strategy = EngineFactory._get_lc0_strategy(lc0_path, rollout_depth)
+                return EngineFactory._get_lc0_strategy(lc0_path, rollout_depth, lc0_instances)
             case StrategyEnum.Random:
-                strategy = EngineFactory._get_random_strategy(rollout_depth)
+                return EngineFactory._get_random_strategy(rollout_depth)
             case StrategyEnum.RandomStockfish:
-                strategy = EngineFactory._get_random_stockfish_strategy(stockfish_path, rollout_depth)
+                return EngineFactory._get_random_stockfish_strategy(stockfish_path, rollout_depth)
             case StrategyEnum.Pestos:
-                strategy = EngineFactory._get_pesto_strategy(rollout_depth)
+                return EngineFactory._get_pesto_strategy(rollout_depth)
             case _:
                 raise ValueError(f"strategy_name={strategy_name} not supported")
 
-        match engine_name:
-            case EngineEnum.ClassicMcts:
-                return EngineFactory._get_classic_mcts_engine(color, strategy)
-            case EngineEnum.BayesianMcts:
-                return EngineFactory._get_bayesian_mcts_engine(color, strategy)
-            case EngineEnum.Stockfish:
-                return EngineFactory._get_stockfish_engine(color, stockfish_path, stockfish_elo)
-            case EngineEnum.Lc0:
-                return EngineFactory._get_lc0_engine(color, lc0_path)
+    @staticmethod
+    def create_async_strategy(strategy_name: StrategyEnum, stockfish_path: str, lc0_path: str, rollout_depth: int = 4,
+                              eval_cache_size: int = 0, eval_cache_dir: str | None = None,
+                              stockfish_client: StockfishClient | None = None) -> IAsyncStrategy:
+        """
+        Same as `create_strategy`, but for `IAsyncStrategy`.
+        :param stockfish_client: if given, the stockfish strategy sends its requests to this shared client
+        """
+        strategy = EngineFactory._create_uncached_async_strategy(strategy_name, stockfish_path, lc0_path,
+                                                                 rollout_depth, stockfish_client)
+        if eval_cache_size <= 0:
+            return strategy
+
+        cache = EngineFactory._get_evaluation_cache(strategy_name, stockfish_path, lc0_path, rollout_depth,
+                                                    eval_cache_size, eval_cache_dir)
+        return AsyncCachedStrategy(strategy, cache, EngineFactory._is_deterministic(strategy_name))
+
+    @staticmethod
+    def _create_uncached_async_strategy(strategy_name: StrategyEnum, stockfish_path: str, lc0_path: str,
+                                        rollout_depth: int,
+                                        stockfish_client: StockfishClient | None = None) -> IAsyncStrategy:
+        match strategy_name:
+            case StrategyEnum.Stockfish if stockfish_client is not None:
+                return PipelinedStockfishStrategy(stockfish_client, rollout_depth)
+            case StrategyEnum.Stockfish:
+                return AsyncStockfishStrategy(stockfish_path, rollout_depth)
+            case StrategyEnum.Lc0:
+                return AsyncLc0Strategy(lc0_path, rollout_depth)
+            case StrategyEnum.RandomStockfish:
+                return AsyncRandomStockfishStrategy(rollout_depth, stockfish_path)
+            case StrategyEnum.Random | StrategyEnum.Pestos:
+                # no engine process to wait for, run the synchronous strategy directly
+                return AsyncStrategyAdapter(
+                    EngineFactory.create_strategy(strategy_name, stockfish_path, lc0_path, rollout_depth))
+            case _:
+                raise ValueError(f"strategy_name={strategy_name} not supported")
+
+    @staticmethod
+    def _get_stockfish_engine(board: chess.Board, color: chess.Color, engine_path: str, stockfish_elo: int) -> IEngine:
+        return StockfishEngine(board, color, stockfish_elo, engine_path)
+
+    @staticmethod
+    def _get_lc0_engine(board: chess.Board, color: chess.Color, engine_path: str) -> IEngine:
+        return Lc0Engine(board, color, engine_path)
+
+    @staticmethod
+    def _get_bayesian_mcts_engine(board: chess.Board, color: chess.Color, strategy: IStrategy, array_tree: bool,
+                                  transposition_table_size: int, seed_priors: bool) -> IEngine:
+        return BayesMctsEngine(board, color, strategy, array_tree, transposition_table_size, seed_priors)
 
     @staticmethod
-    def _get_stockfish_engine(color: chess.Color, engine_path: str, stockfish_elo: int) -> IEngine:
-        return StockfishEngine(chess.Board(), color, stockfish_elo, engine_path)
+    def _get_root_parallel_bayesian_mcts_engine(board: chess.Board, color: chess.Color,
+                                                strategy_factory: Callable[[], IStrategy],
+                                                workers: int) -> IEngine:
+        return RootParallelBayesMctsEngine(board, color, strategy_factory, workers)
 
     @staticmethod
-    def _get_lc0_engine(color: chess.Color, engine_path: str) -> IEngine:
-        return Lc0Engine(chess.Board(), color, engine_path)
+    def _get_tree_parallel_bayesian_mcts_engine(board: chess.Board, color: chess.Color, strategies: list[IStrategy],
+                                                batch_size: int) -> IEngine:
+        return TreeParallelBayesMctsEngine(board, color, strategies, batch_size)
 
     @staticmethod
-    def _get_bayesian_mcts_engine(color: chess.Color, strategy: IStrategy) -> IEngine:
-        return BayesMctsEngine(chess.Board(), color, strategy)
+    def _get_async_bayesian_mcts_engine(board: chess.Board, color: chess.Color,
+                                        strategies: list[IAsyncStrategy]) -> IEngine:
+        return AsyncBayesMctsEngine(board, color, strategies)
 
     @staticmethod
-    def _get_classic_mcts_engine(color: chess.Color, strategy: IStrategy) -> IEngine:
-        return ClassicMctsEngine(chess.Board(), color, strategy)
+    def _get_classic_mcts_engine(board: chess.Board, color: chess.Color, strategy: IStrategy, tree_reuse: bool,
+                                 ponder: bool) -> IEngine:
+        return ClassicMctsEngine(board, color, strategy, tree_reuse, ponder)
 
     @staticmethod
     def _get_random_strategy(rollout_depth: int) -> IStrategy:
@@ -91,8 +249,8 @@ class EngineFactory:
         return RandomStockfishStrategy(rollout_depth, engine_path)
 
     @staticmethod
-    def _get_lc0_strategy(engine_path: str, rollout_depth: int) -> IStrategy:
-        return Lc0Strategy(engine_path, rollout_depth)
+    def _get_lc0_strategy(engine_path: str, rollout_depth: int, instances: int = 1) -> IStrategy:
+        return Lc0Strategy(engine_path, rollout_depth, instances)
 
     @staticmethod
     def _get_pesto_strategy(rollout_depth: int) -> IStrategy:
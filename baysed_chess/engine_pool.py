@@ -0,0 +1,194 @@
+import multiprocessing.util
+import os
+from dataclasses import dataclass
+
+import chess
+import chess.engine
+
+EngineKey = tuple[str, tuple[tuple[str, str | int | bool | None], ...]]
+
+
+@dataclass
+class EnginePoolStatistics:
+    started: int = 0
+    """Number of engine processes started"""
+    reused: int = 0
+    """Number of leases served by an idle engine"""
+    restarted: int = 0
+    """Number of engines replaced, because they crashed or did not answer"""
+
+
+class PooledEngine:
+    """
+    A UCI engine leased from an `EnginePool`.
+    Offers `play` and `analyse` like `chess.engine.SimpleEngine`, and restarts the engine once if it crashed.
+    """
+
+    def __init__(self, pool: "EnginePool", key: EngineKey, engine: chess.engine.SimpleEngine):
+        self.pool = pool
+        self.key = key
+        self.engine = engine
+
+    def _restart(self) -> None:
+        self.engine = self.pool.restart(self.key, self.engine)
+
+    def play(self, board: chess.Board, limit: chess.engine.Limit, **kwargs) -> chess.engine.PlayResult:
+        try:
+            return self.engine.play(board, limit, **kwargs)
+        except chess.engine.EngineTerminatedError:
+            self._restart()
+            return self.engine.play(board, limit, **kwargs)
+
+    def analyse(self, board: chess.Board, limit: chess.engine.Limit, **kwargs) -> chess.engine.InfoDict:
+        try:
+            return self.engine.analyse(board, limit, **kwargs)
+        except chess.engine.EngineTerminatedError:
+            self._restart()
+            return self.engine.analyse(board, limit, **kwargs)
+
+    def release(self) -> None:
+        """
+        Return the engine to the pool. The handle must not be used afterwards.
+        """
+        if self.engine is not None:
+            self.pool.release(self.key, self.engine)
+            self.engine = None
+
+
+class EnginePool:
+    """
+    Pool of UCI engine processes, keyed by (path, options).
+
+    Strategies and engines lease an engine for a game and release it afterwards, instead of starting a new process.
+    On release the engine state is reset, so the next `play`/`analyse` starts with `ucinewgame`.
+    Idle engines are health-checked before they are leased again, dead engines are replaced.
+
+    Use `get_engine_pool` to get the pool of the current process.
+    """
+
+    def __init__(self, max_idle: int = 8):
+        """
+        :param max_idle: Maximum number of idle engines per key, further released engines are quit.
+        """
+        self.max_idle = max_idle
+        self.statistics = EnginePoolStatistics()
+        self._idle: dict[EngineKey, list[chess.engine.SimpleEngine]] = {}
+        self._leased: set[chess.engine.SimpleEngine] = set()
+
+    @staticmethod
+    def make_key(path: str, options: dict | None = None) -> EngineKey:
+        return path, tuple(sorted((options or {}).items()))
+
+    def _start(self, key: EngineKey) -> chess.engine.SimpleEngine:
+        path, options = key
+        engine = chess.engine.SimpleEngine.popen_uci(path)
+        if options:
+            engine.configure(dict(options))
+        self.statistics.started += 1
+        return engine
+
+    @staticmethod
+    def _is_healthy(engine: chess.engine.SimpleEngine) -> bool:
+        try:
+            engine.ping()
+            return True
+        except (chess.engine.EngineError, TimeoutError):
+            return False
+
+    @staticmethod
+    def _quit(engine: chess.engine.SimpleEngine) -> None:
+        try:
+            engine.quit()
+        except (chess.engine.EngineError, TimeoutError):
+            engine.close()
+
+    def lease(self, path: str, options: dict | None = None) -> PooledEngine:
+        """
+        Lease an engine for `path` configured with `options`. Reuses an idle engine if there is a healthy one.
+        """
+        key = self.make_key(path, options)
+        idle = self._idle.get(key, [])
+        engine = None
+        while idle and engine is None:
+            candidate = idle.pop()
+            if self._is_healthy(candidate):
+                engine = candidate
+                self.statistics.reused += 1
+            else:
+                candidate.close()
+                self.statistics.restarted += 1
+
+        if engine is None:
+            engine = self._start(key)
+        self._leased.add(engine)
+        return PooledEngine(self, key, engine)
+
+    def release(self, key: EngineKey, engine: chess.engine.SimpleEngine) -> None:
+        """
+        Take back a leased engine. The next command to the engine will be preceded by `ucinewgame`.
+        """
+        self._leased.discard(engine)
+        if engine.protocol.returncode.done():
+            return
+
+        idle = self._idle.setdefault(key, [])
+        if len(idle) >= self.max_idle:
+            self._quit(engine)
+            return
+
+        engine.protocol.first_game = True
+        idle.append(engine)
+
+    def restart(self, key: EngineKey, engine: chess.engine.SimpleEngine) -> chess.engine.SimpleEngine:
+        """
+        Replace a crashed, leased engine with a new process.
+        """
+        self._leased.discard(engine)
+        engine.close()
+        self.statistics.restarted += 1
+        new_engine = self._start(key)
+        self._leased.add(new_engine)
+        return new_engine
+
+    @property
+    def idle_count(self) -> int:
+        return sum(len(engines) for engines in self._idle.values())
+
+    @property
+    def leased_count(self) -> int:
+        return len(self._leased)
+
+    def close(self) -> None:
+        """
+        Quit all engines, idle and leased ones.
+        """
+        for engine in [e for engines in self._idle.values() for e in engines] + list(self._leased):
+            self._quit(engine)
+        self._idle = {}
+        self._leased = set()
+
+
+_pool: EnginePool | None = None
+_pool_pid: int | None = None
+
+
+def get_engine_pool() -> EnginePool:
+    """
+    Return the engine pool of the current process.
+    A process started by `multiprocessing` gets its own pool, which is closed when the process exits.
+    """
+    global _pool, _pool_pid
+    if _pool is None or _pool_pid != os.getpid():
+        # a forked process must not use the engines of its parent
+        _pool = EnginePool()
+        _pool_pid = os.getpid()
+        multiprocessing.util.Finalize(None, _pool.close, exitpriority=10)
+    return _pool
+
+
+def close_engine_pool() -> None:
+    """
+    Quit all engines of the pool of the current process.
+    """
+    if _pool is not None and _pool_pid == os.getpid():
+        _pool.close()
@@ -3,6 +3,12 @@ import time
 import chess
 import chess.engine
 
+from baysed_chess.stopping.any_policy import AnyPolicy
+from baysed_chess.stopping.i_stopping_policy import IStoppingPolicy
+from baysed_chess.stopping.node_policy import NodePolicy
+from baysed_chess.stopping.time_policy import TimePolicy
+from baysed_chess.time_manager import TimeManager
+
 
 class Limit:
     """ Class to determine when to stop searching for moves """
@@ -13,37 +19,106 @@ class Limit:
     nodes: int | None
     """ Search for a limited number of `nodes`"""
 
-    def __init__(self, time: float | None = None, nodes: int | None = None):
+    time_manager: TimeManager | None
+    """ Search for the time the `time_manager` allocated from the clock, or less once the best move dominates """
+
+    policy: IStoppingPolicy | None
+    """ Stopping policy of the search, any of the given limits stops it """
+
+    CHECK_PERIOD = 0.001
+    """ Seconds between two checks of the policy, `run` adapts the number of iterations between checks to this """
+
+    MAX_CHECK_INTERVAL = 1024
+    """ Maximal number of iterations between two checks of the policy """
+
+    def __init__(self, time: float | None = None, nodes: int | None = None, time_manager: TimeManager | None = None,
+                 policy: IStoppingPolicy | None = None):
+        """
+        :param policy: an additional stopping policy, e.g. `MemoryPolicy` or policies combined with `AllPolicy`
+        """
         self.time = time
         self.nodes = nodes
+        self.time_manager = time_manager
+        policies = []
+        if nodes:
+            policies.append(NodePolicy(nodes))
+        if time_manager is not None:
+            policies.append(time_manager.policy())
+        elif time:
+            policies.append(TimePolicy(time))
+        if policy is not None:
+            policies.append(policy)
+        self.policy = policies[0] if len(policies) == 1 else AnyPolicy(*policies) if policies else None
         self.node_count = 0
+        self._tree = None
+
+    @property
+    def stop_reason(self) -> str | None:
+        """ Why the last search stopped """
+        return self.policy.stop_reason if self.policy is not None else None
+
+    def bind(self, tree) -> None:
+        """
+        Let the limit watch the search tree, for policies that look at the tree, like `ConvergencePolicy`.
+        :param tree: the MCTS that is searched, None for a search the policies can not look at
+        """
+        self._tree = tree
+
+    def reset(self) -> None:
+        """
+        Prepare the limit for a new search.
+        :raises ValueError: if the policy can only stop with a tree (e.g. `MemoryPolicy`) and the limit is not bound
+        """
+        if self.policy is not None and self.policy.needs_tree and self._tree is None:
+            # the search would never stop
+            raise ValueError("the stopping policy needs the searched tree, bind the limit to it or add a time or "
+                             "node limit")
+        self.node_count = 0
+        if self.policy is not None:
+            self.policy.reset()
 
     def run(self, func, *args, **kwargs):
         """
-        Run `func` until the limit condition is reached
+        Run `func` until the limit condition is reached.
+        The policy is only checked every few iterations, about every `CHECK_PERIOD` seconds at the measured rate.
         :param func: the func that performs one search iteration
         :param *args: are passed to `func`
         :param **kwargs: are passed to `func`
         """
+        self.reset()
+        if self.policy is None:
+            return
 
-        if self.nodes:
-            self._run_nodes(func, *args, **kwargs)
-            self.node_count = self.nodes
-        elif self.time:
-            self._run_time(func, *args, **kwargs)
+        start = time.perf_counter()
+        next_check = 0
+        while True:
+            if self.node_count >= next_check:
+                elapsed = time.perf_counter() - start
+                if self.policy.should_stop(elapsed, self.node_count, self._tree):
+                    return
 
-    def _run_nodes(self, func, *args, **kwargs):
-        for _ in range(self.nodes):
-            func(*args, **kwargs)
+                rate = self.node_count / elapsed if elapsed > 0 else 0
+                interval = min(max(1, int(rate * self.CHECK_PERIOD)), self.MAX_CHECK_INTERVAL)
+                nodes_until_check = self.policy.nodes_until_check(self.node_count)
+                if nodes_until_check is not None:
+                    interval = min(interval, max(1, nodes_until_check))
+                next_check = self.node_count + interval
 
-    def _run_time(self, func, *args, **kwargs):
-        start = time.perf_counter_ns()
-        while (time.perf_counter_ns() - start) / 1e9 < self.time:
             func(*args, **kwargs)
             self.node_count += 1
 
+    def should_stop(self, elapsed: float, node_count: int) -> bool:
+        """
+        Whether the policy stops the search after `elapsed` seconds and `node_count` iterations.
+        For searches that do not use `run`, call `reset` before the search.
+        """
+        return self.policy is None or self.policy.should_stop(elapsed, node_count, self._tree)
+
     def translate_to_engine_limit(self) -> chess.engine.Limit:
-        if self.nodes:
-            return chess.engine.Limit(nodes=self.nodes)
-        elif self.time:
-            return chess.engine.Limit(time=self.time)
+        """
+        Translate the policies that UCI engines understand (nodes and time), the others are left out.
+        """
+        if self.policy is not None:
+            engine_limit = self.policy.engine_limit()
+            if engine_limit:
+                return chess.engine.Limit(**engine_limit)
@@ -1,8 +1,10 @@
 import multiprocessing as mp
+import multiprocessing.util
 import random
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
+from typing import Container, Iterable, Iterator, TYPE_CHECKING
 
 import chess
 import chess.pgn
@@ -10,6 +12,14 @@ import chess.pgn
 from baysed_chess.engine.i_engine import IEngine
 from baysed_chess.engine_factory import StrategyEnum, EngineFactory, EngineEnum
 from baysed_chess.limit import Limit
+from baysed_chess.opening_suite import OpeningSuite
+
+if TYPE_CHECKING:
+    from baysed_chess.results_log import ResultsLog
+
+# engines of this process that are kept between games, see `Matchmaker.worker_games`
+_worker_engines: dict[tuple, IEngine] = {}
+_worker_games = 0
 
 
 class Winner(Enum):
@@ -27,6 +37,14 @@ class GameStatistics:
     nodes_white: int
     nodes_black: int
     length: int
+    transposition_hits_white: int = 0
+    transposition_hits_black: int = 0
+    retained_nodes_white: int = 0
+    """Average number of nodes kept from previous searches per move, for engines that reuse their tree"""
+    retained_nodes_black: int = 0
+    ponder_nodes_white: int = 0
+    """Average number of nodes searched while pondering per move"""
+    ponder_nodes_black: int = 0
 
 
 @dataclass
@@ -34,6 +52,69 @@ class MatchResult:
     winner: Winner
     game_as_pgn: str
     statistics: GameStatistics
+    engine_a_white: bool = True
+    """Whether engine A played white"""
+    game: int | None = None
+    """Index of the game in the match, games 2k and 2k + 1 are a pair if the match has an opening suite"""
+    opening: str | None = None
+    """FEN of the start position, if the match has an opening suite"""
+
+    @property
+    def score_a(self) -> float:
+        """Points of engine A"""
+        return {Winner.Engine_A: 1.0, Winner.Engine_B: 0.0, Winner.Draw: 0.5}[self.winner]
+
+
+@dataclass
+class MatchTally:
+    """
+    Running score of a match, updated game by game.
+    """
+    a_wins: int = 0
+    b_wins: int = 0
+    draws: int = 0
+    nodes_a: int = 0
+    """Sum over the games of the average node count per move of engine A"""
+    nodes_b: int = 0
+    pairs: list[int] = field(default_factory=lambda: [0] * 5)
+    """Number of finished game pairs in which engine A scored 0, 0.5, 1, 1.5 and 2 points (pentanomial)"""
+    _unpaired: dict[int, float] = field(default_factory=dict)
+
+    @property
+    def games(self) -> int:
+        return self.a_wins + self.b_wins + self.draws
+
+    def add(self, result: MatchResult) -> None:
+        match result.winner:
+            case Winner.Engine_A:
+                self.a_wins += 1
+            case Winner.Engine_B:
+                self.b_wins += 1
+            case _:
+                self.draws += 1
+
+        stats = result.statistics
+        if result.engine_a_white:
+            self.nodes_a += stats.nodes_white
+            self.nodes_b += stats.nodes_black
+        else:
+            self.nodes_a += stats.nodes_black
+            self.nodes_b += stats.nodes_white
+
+        if result.opening is not None and result.game is not None:
+            pair = result.game // 2
+            if pair in self._unpaired:
+                self.pairs[int(2 * (self._unpaired.pop(pair) + result.score_a))] += 1
+            else:
+                self._unpaired[pair] = result.score_a
+
+    def __str__(self) -> str:
+        games = max(self.games, 1)
+        text = (f"W/D/L {self.a_wins}/{self.draws}/{self.b_wins} after {self.games} games, "
+                f"average node count A: {self.nodes_a // games}, B: {self.nodes_b // games}")
+        if sum(self.pairs) > 0:
+            text += f", pairs (0, 0.5, 1, 1.5, 2 points of A): {self.pairs}"
+        return text
 
 
 class Matchmaker:
@@ -41,7 +122,17 @@ class Matchmaker:
     Class to let 2 engines playing against each other.
     """
     def __init__(self, engine_a: EngineEnum, strategy_a: StrategyEnum, engine_b: EngineEnum, strategy_b: StrategyEnum, limit: Limit,
-                 stockfish_path: str, lc0_path: str, stockfish_elo: int):
+                 stockfish_path: str, lc0_path: str, stockfish_elo: int, engine_options: dict | None = None,
+                 engine_options_b: dict | None = None, openings: OpeningSuite | None = None,
+                 limit_b: Limit | None = None, worker_games: int = 0):
+        """
+        :param openings: if given, every opening of the suite is played twice with swapped colors,
+            otherwise the games start from the initial position with random colors
+        :param limit_b: limit of engine B, if it differs from the one of engine A
+        :param worker_games: if > 0, every process keeps its engines between games and resets them with
+            `IEngine.new_game`, instead of creating them for every game. Processes are replaced after this many games,
+            to contain leaks. 0 creates the engines of every game.
+        """
         self.engine_a = engine_a
         self.strategy_a = strategy_a
         self.engine_b = engine_b
@@ -50,49 +141,169 @@ class Matchmaker:
         self.lc0_path = lc0_path
         self.limit = limit
         self.stockfish_elo = stockfish_elo
+        # additional keyword arguments for `EngineFactory.create_engine`, e.g. `workers`
+        self.engine_options = engine_options or {}
+        # ... for engine B, if they differ from the ones of engine A
+        self.engine_options_b = engine_options_b if engine_options_b is not None else self.engine_options
+        self.openings = openings
+        self.limit_b = limit_b if limit_b is not None else limit
+        self.worker_games = worker_games
 
     def run(self, n_games: int = 100, proc: int = mp.cpu_count()) -> list[MatchResult]:
         """
         Let the engines play multiple games against each other.
-        The colors are assigned randomly for each game.
+        The colors are assigned randomly for each game, or per game pair if the match has an opening suite.
 
         :param n_games: Number of games that should be played.
         :param proc: Number of processors that should be used. This enables to run games in parallel.
         :returns: List of results of each game.
         """
+        return list(self.run_iter(n_games, proc))
+
+    def run_iter(self, n_games: int = 100, proc: int = mp.cpu_count(),
+                 log: "ResultsLog | None" = None, skip: Container[int] = ()) -> Iterator[MatchResult]:
+        """
+        Like `run`, but yield the result of every game as soon as it is finished, in the order they finish.
+        Only the games in progress are held in memory.
+
+        Closing the iterator early (e.g. `break` once a sequential test is decided) cancels the outstanding games.
+
+        :param log: if given, every finished game is appended to it before it is yielded
+        :param skip: indices of games that were already played, e.g. the games of a resumed results log
+        """
         proc = min(proc, mp.cpu_count())
+        Matchmaker._check_pool_engines([self.engine_a, self.engine_b], proc)
+        args = self.tasks(n_games, skip)
+        if proc > 1:
+            # leaving the block early terminates the workers, with the games they are playing
+            with mp.Pool(proc, initializer=Matchmaker._init_worker, maxtasksperchild=self.worker_games or None) as pool:
+                for result in pool.imap_unordered(Matchmaker._run_single_match, args):
+                    if log is not None:
+                        log.append(result)
+                    yield result
+                # let the workers exit normally, so they quit the engines of their engine pool
+                pool.close()
+                pool.join()
+            return
+
+        try:
+            for a in args:
+                result = Matchmaker._run_single_match(a)
+                if log is not None:
+                    log.append(result)
+                yield result
+        finally:
+            Matchmaker._close_worker_engines()
+
+    def tasks(self, n_games: int, skip: Container[int] = ()) -> list[tuple]:
+        """
+        Arguments of `_run_single_match` for every game of the match that is not skipped,
+        e.g. to play the games of several matches on one pool.
+        """
         arg = (
             self.engine_a, self.strategy_a, self.engine_b, self.strategy_b, self.limit, self.stockfish_path,
             self.lc0_path,
-            self.stockfish_elo)
-        if proc > 1:
-            with mp.Pool(proc) as pool:
-                args = [arg for i in range(n_games)]
-                return pool.map(Matchmaker._run_single_match, args)
-        return [
-            Matchmaker._run_single_match(arg)
-            for _ in range(n_games)
-        ]
+            self.stockfish_elo, self.engine_options, self.engine_options_b, self.limit_b, self.worker_games)
+        # the two games of a pair are queued one after the other, so they are played at about the same time
+        return [arg + self._schedule(game) for game in range(n_games) if game not in skip]
+
+    def _schedule(self, game: int) -> tuple[int, chess.Board | None, bool | None]:
+        if self.openings is None:
+            return game, None, None
+        board, engine_a_white = self.openings.schedule(game)
+        return game, board, engine_a_white
 
     @staticmethod
-    def _run_single_match(arg: tuple[EngineEnum, StrategyEnum, EngineEnum, StrategyEnum, Limit, str, str, int]) -> MatchResult:
+    def _check_pool_engines(engines: Iterable[EngineEnum], proc: int) -> None:
         """
-        Runs a single game of chess.
-        The colors are assigned randomly.
+        Raise a ValueError if an engine cannot play in the processes of a pool.
+        """
+        # the root parallel engine starts processes of its own, which the daemonic processes of a pool cannot
+        if proc > 1 and EngineEnum.BayesianMctsRootParallel in engines:
+            raise ValueError("the engine BayesianMctsRootParallel starts processes of its own, "
+                             "its games cannot be played in parallel, use proc=1")
+
+    @staticmethod
+    def _init_worker() -> None:
+        """
+        Initializer of the pool processes: quit the engines kept between games when the process exits.
+        """
+        # before the engine pool (exitpriority 10), so the engines can return their processes to it
+        multiprocessing.util.Finalize(None, Matchmaker._close_worker_engines, exitpriority=20)
+
+    @staticmethod
+    def _close_worker_engines() -> None:
+        global _worker_games
+        for engine in _worker_engines.values():
+            engine.close()
+        _worker_engines.clear()
+        _worker_games = 0
+
+    @staticmethod
+    def _get_engine(role: str, engine_name: EngineEnum, strategy_name: StrategyEnum, color: chess.Color,
+                    stockfish_path: str, lc0_path: str, stockfish_elo: int, options: dict, board: chess.Board | None,
+                    worker_games: int) -> IEngine:
+        """
+        Create the engine of a game, or reuse the engine of the same configuration from a previous game of the process.
         """
-        engine_a, strategy_a, engine_b, strategy_b, limit, stockfish_path, lc0_path, stockfish_elo = arg
+        if worker_games <= 0:
+            return EngineFactory.create_engine(engine_name, strategy_name, color, stockfish_path, lc0_path,
+                                               stockfish_elo, board=board, **options)
 
-        # assign color randomly
-        flip_engines = bool(random.getrandbits(1))
-        if flip_engines:
-            black = EngineFactory.create_engine(engine_a, strategy_a, chess.BLACK, stockfish_path, lc0_path, stockfish_elo)
-            white = EngineFactory.create_engine(engine_b, strategy_b, chess.WHITE, stockfish_path, lc0_path, stockfish_elo)
+        # both engines are kept, even if they have the same configuration
+        key = (role, engine_name, strategy_name, stockfish_path, lc0_path, stockfish_elo, repr(sorted(options.items())))
+        engine = _worker_engines.get(key)
+        if engine is None:
+            engine = EngineFactory.create_engine(engine_name, strategy_name, color, stockfish_path, lc0_path,
+                                                 stockfish_elo, board=board, **options)
+            _worker_engines[key] = engine
         else:
-            white = EngineFactory.create_engine(engine_a, strategy_a, chess.WHITE, stockfish_path, lc0_path, stockfish_elo)
-            black = EngineFactory.create_engine(engine_b, strategy_b, chess.BLACK, stockfish_path, lc0_path, stockfish_elo)
+            engine.new_game(board.copy() if board is not None else chess.Board(), color)
+        return engine
+
+    @staticmethod
+    def _release_engines(white: IEngine, black: IEngine, worker_games: int, failed: bool) -> None:
+        global _worker_games
+        if worker_games <= 0:
+            white.close()
+            black.close()
+            return
+
+        _worker_games += 1
+        # an engine in an unknown state after an error is not reused
+        if failed or _worker_games >= worker_games:
+            Matchmaker._close_worker_engines()
+
+    @staticmethod
+    def _run_single_match(arg: tuple[EngineEnum, StrategyEnum, EngineEnum, StrategyEnum, Limit, str, str, int, dict, dict,
+                                     Limit, int, int, chess.Board | None, bool | None]) -> MatchResult:
+        """
+        Runs a single game of chess.
+        Without a start position, the game starts from the initial position and the colors are assigned randomly.
+        """
+        (engine_a, strategy_a, engine_b, strategy_b, limit, stockfish_path, lc0_path, stockfish_elo, options_a, options_b,
+         limit_b, worker_games, game_index, board, engine_a_white) = arg
+
+        # assign color randomly, unless given by the opening suite
+        flip_engines = bool(random.getrandbits(1)) if engine_a_white is None else not engine_a_white
+        opening = board.fen() if board is not None else None
+        color_a = chess.BLACK if flip_engines else chess.WHITE
+        engine_a = Matchmaker._get_engine("a", engine_a, strategy_a, color_a, stockfish_path, lc0_path, stockfish_elo,
+                                          options_a, board, worker_games)
+        engine_b = Matchmaker._get_engine("b", engine_b, strategy_b, not color_a, stockfish_path, lc0_path,
+                                          stockfish_elo, options_b, board, worker_games)
+        white, black = (engine_b, engine_a) if flip_engines else (engine_a, engine_b)
 
-        # run single match of chess
-        game, statistics = Matchmaker.simulate_game(white, black, limit, chess.Board())
+        # run single match of chess, afterwards return the engine processes to the engine pool for the next game
+        failed = True
+        try:
+            limit_white, limit_black = (limit_b, limit) if flip_engines else (limit, limit_b)
+            game, statistics = Matchmaker.simulate_game(white, black, limit_white,
+                                                        board if board is not None else chess.Board(), limit_black)
+            failed = False
+        finally:
+            Matchmaker._release_engines(white, black, worker_games, failed)
+        game.headers['Round'] = str(game_index + 1)
         winner = game.end().board().outcome().winner
 
         # figure out winner
@@ -104,21 +315,24 @@ class Matchmaker:
             case _:
                 result = Winner.Draw
 
-        return MatchResult(result, str(game), statistics)
+        return MatchResult(result, str(game), statistics, not flip_engines, game_index, opening)
 
     @staticmethod
-    def simulate_game(white: IEngine, black: IEngine, limit: Limit, board: chess.Board) -> tuple[chess.pgn.Game, GameStatistics]:
+    def simulate_game(white: IEngine, black: IEngine, limit: Limit, board: chess.Board,
+                      limit_black: Limit | None = None) -> tuple[chess.pgn.Game, GameStatistics]:
         """
         Runs a single game of chess.
+        :param limit_black: limit of black, if it differs from `limit`
         """
-        is_white_playing = True
+        limit_black = limit_black if limit_black is not None else limit
+        is_white_playing = board.turn == chess.WHITE
         times_white = []
         times_black = []
         game_length = 0
 
         while not board.is_game_over():
             start = time.time()
-            play_result = white.play(board, limit) if is_white_playing else black.play(board, limit)
+            play_result = white.play(board, limit) if is_white_playing else black.play(board, limit_black)
             end = time.time()
             times_white.append(end - start) if is_white_playing else times_black.append(end - start)
             board.push(play_result.move)
@@ -129,16 +343,23 @@ class Matchmaker:
         game.headers['White'] = white.get_name()
         game.headers['Black'] = black.get_name()
 
-        white_nodes = sum(white.node_counts) // len(white.node_counts) if hasattr(white, "node_counts") else 0
-        black_nodes = sum(black.node_counts) // len(black.node_counts) if hasattr(black, "node_counts") else 0
+        def average(engine: IEngine, counts: str) -> int:
+            values = getattr(engine, counts, [])
+            return sum(values) // len(values) if len(values) > 0 else 0
 
         statistics = GameStatistics(white=white.get_name(),
                                     black=black.get_name(),
-                                    average_time_white=(sum(times_white) / len(times_white)),
-                                    average_time_black=(sum(times_black) / len(times_black)),
-                                    nodes_white=white_nodes,
-                                    nodes_black=black_nodes,
-                                    length=game_length
+                                    average_time_white=(sum(times_white) / len(times_white)) if times_white else 0.0,
+                                    average_time_black=(sum(times_black) / len(times_black)) if times_black else 0.0,
+                                    nodes_white=average(white, "node_counts"),
+                                    nodes_black=average(black, "node_counts"),
+                                    length=game_length,
+                                    transposition_hits_white=getattr(white, "transposition_hits", 0),
+                                    transposition_hits_black=getattr(black, "transposition_hits", 0),
+                                    retained_nodes_white=average(white, "retained_nodes"),
+                                    retained_nodes_black=average(black, "retained_nodes"),
+                                    ponder_nodes_white=average(white, "ponder_nodes"),
+                                    ponder_nodes_black=average(black, "ponder_nodes")
                                     )
 
         return game, statistics
@@ -1,9 +1,15 @@
+import asyncio
+import time
+from typing import Callable
+
 import chess
-import torch.distributions as dist
 
 from baysed_chess.mcts.baysian_mcts_node import BayesianMctsNode
 from baysed_chess.mcts.i_mcts import IMcts
 from baysed_chess.mcts.i_mcts_node import IMctsNode
+from baysed_chess.mcts.transposition_baysian_mcts_node import TranspositionBayesianMctsNode
+from baysed_chess.mcts.transposition_table import TranspositionTable
+from baysed_chess.strategies.i_async_strategy import IAsyncStrategy
 from baysed_chess.strategies.i_strategy import IStrategy
 
 
@@ -12,44 +18,162 @@ class BayesianMcts(IMcts):
     Implementation of our Bayesian MCTS, focused on chess.
     """
 
-    def __init__(self, board: chess.Board, strategy: IStrategy, color: chess.Color, seed: int | None = None):
+    def __init__(self, board: chess.Board, strategy: IStrategy, color: chess.Color, seed: int | None = None,
+                 transposition_table: TranspositionTable | None = None, seed_priors: bool = False,
+                 scratch_board: bool = True):
+        """
+        :param transposition_table: if given, nodes of the same position share their statistics (DAG search)
+        :param seed_priors: seed the priors of new children with a batched static evaluation of the strategy
+        :param scratch_board: let `sample` walk and roll out on one shared board with push/pop, instead of copying
+            the board of every leaf. Not used with a transposition table, where a node is reached on several paths.
+        """
         super().__init__(board, strategy, seed)
-        self.root = BayesianMctsNode(board, strategy, color, None, None, self.random_state, visits=1)
+        self.transposition_table = transposition_table
+        self.seed_priors = seed_priors
+        self.scratch_board = scratch_board and transposition_table is None
+        self._scratch: chess.Board | None = None
+        self.root = self._create_root(board, strategy, color)
         self.color = color
 
+    def _create_root(self, board: chess.Board, strategy: IStrategy, color: chess.Color) -> BayesianMctsNode:
+        # the root gets its own board: children create their boards from it, after moves were applied to `self.board`
+        board = board.copy()
+        if self.transposition_table is None:
+            return BayesianMctsNode(board, strategy, color, None, None, self.random_state, visits=1,
+                                    seed_priors=self.seed_priors)
+
+        self.transposition_table.clear()
+        root = TranspositionBayesianMctsNode(board, strategy, color, None, None, self.random_state,
+                                             self.transposition_table, visits=1, seed_priors=self.seed_priors)
+        self.transposition_table.put((root.zobrist, 0), root)
+        return root
+
     def sample(self, runs: int = 1000) -> None:
         for i in range(runs):
-            if self.board.is_game_over():
+            if self.root.is_game_over():
                 break
 
-            leaf_node = self.root.select().expand()
-            _ = leaf_node.rollout()
-            leaf_node.backpropagate()
+            if self.scratch_board:
+                self._sample_on_scratch_board()
+            else:
+                leaf_node = self.root.select().expand()
+                _ = leaf_node.rollout()
+                leaf_node.backpropagate()
+
+    def _sample_on_scratch_board(self) -> None:
+        """
+        One sample on the scratch board: push the moves from the root to the leaf and of the rollout, then unwind.
+        """
+        if self._scratch is None:
+            self._scratch = self.board.copy()
+        board = self._scratch
+        ply = len(board.move_stack)
+        try:
+            leaf_node = self.root.select(board).expand(board)
+            _ = leaf_node.rollout(board=board)
+        finally:
+            while len(board.move_stack) > ply:
+                board.pop()
+        leaf_node.backpropagate()
+
+    async def sample_async(self, strategies: list[IAsyncStrategy], runs: int | None = 1000,
+                           time_limit: float | None = None, stop: Callable[[float, int], bool] | None = None) -> int:
+        """
+        Run the MCTS with asynchronous rollouts, keeping one rollout in flight per strategy (e.g. engine instance).
+        Selected leaves get a virtual loss until their rollout is backed up, so the rollouts in flight differ.
+        :param strategies: Strategies to roll out with, each one is used by at most one rollout at a time
+        :param runs: Number of runs/samples, or None to only stop at the time limit
+        :param time_limit: Stop starting new rollouts after this many seconds
+        :param stop: Stop starting new rollouts once `stop(elapsed seconds, finished runs)` is true
+        :return: Number of finished runs/samples
+        """
+        start = time.perf_counter()
+        idle = list(strategies)
+        pending: dict[asyncio.Task, tuple[BayesianMctsNode, IAsyncStrategy]] = {}
+        started = 0
+        finished = 0
+
+        def can_start() -> bool:
+            if self.board.is_game_over() or (runs is not None and started >= runs):
+                return False
+            elapsed = time.perf_counter() - start
+            if stop is not None and stop(elapsed, finished):
+                return False
+            return time_limit is None or elapsed < time_limit
+
+        try:
+            while True:
+                while idle and can_start():
+                    leaf = self.root.select().expand()
+                    if leaf.virtual_loss > 0:
+                        # leaf is already in flight, wait for a rollout to finish
+                        break
+
+                    strategy = idle.pop()
+                    leaf.add_virtual_loss(1)
+                    task = asyncio.create_task(leaf.rollout_async(strategy))
+                    pending[task] = (leaf, strategy)
+                    started += 1
+
+                if not pending:
+                    return finished
+
+                done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    leaf, strategy = pending.pop(task)
+                    idle.append(strategy)
+                    leaf.add_virtual_loss(-1)
+                    task.result()
+                    leaf.backpropagate()
+                    finished += 1
+        finally:
+            # on errors or cancellation: drop the rollouts in flight, and leave the tree without virtual loss
+            for task, (leaf, _) in pending.items():
+                task.cancel()
+                leaf.add_virtual_loss(-1)
 
     def apply_move(self, move: chess.Move) -> None:
         self.board.push(move)
+        if self._scratch is not None:
+            self._scratch.push(move)
         self.color = self.board.turn
 
         # if a child node contains the move, set this child as new root
         for child in self.get_children():
             if child.move == move:
+                child.materialize()
                 self.root = child
-                child.depth = 0
-                self.root.parent = None
-                self.root.update_depth(0)
+                if isinstance(child, TranspositionBayesianMctsNode):
+                    child.make_root()
+                else:
+                    child.depth = 0
+                    self.root.parent = None
+                    self.root.update_depth(0)
                 self.root.visits = 1
                 return
 
         # if no child node contains the move, initialize a new tree.
-        self.root = BayesianMctsNode(self.board, self.root.strategy, self.color, None, None, self.random_state, visits=1)
+        self.root = self._create_root(self.board, self.root.strategy, self.color)
 
     def get_children(self) -> list[BayesianMctsNode]:
         return self.root.children
 
-    def get_moves(self) -> dict[chess.Move, dist.Normal]:
+    @property
+    def node_count(self) -> int:
+        """Number of nodes of the tree, counted by walking it. Shared nodes of transpositions are counted once."""
+        seen = {id(self.root)}
+        stack = [self.root]
+        while stack:
+            for child in stack.pop().children:
+                if id(child) not in seen:
+                    seen.add(id(child))
+                    stack.append(child)
+        return len(seen)
+
+    def get_moves(self) -> dict[chess.Move, tuple[float, float]]:
         res = {}
         for c in self.root.children:
-            res[c.move] = dist.Normal(c.mu, c.sigma)
+            res[c.move] = (c.mu, c.sigma)
         return res
 
     def print(self):
@@ -0,0 +1,348 @@
+import math
+from dataclasses import dataclass
+
+import chess
+import numpy as np
+
+from baysed_chess.mcts.gaussian_utils import max_gaussians, min_gaussians
+from baysed_chess.mcts.i_mcts import IMcts
+from baysed_chess.strategies.i_strategy import IStrategy
+
+
+def encode_move(move: chess.Move) -> int:
+    """
+    Encode a move as a single integer: from-square, to-square and promotion piece in 6, 6 and 3 bits.
+    """
+    return move.from_square | (move.to_square << 6) | ((move.promotion or 0) << 12)
+
+
+def decode_move(code: int) -> chess.Move:
+    """
+    Inverse of `encode_move`.
+    """
+    promotion = code >> 12
+    return chess.Move(code & 63, (code >> 6) & 63, promotion if promotion else None)
+
+
+@dataclass
+class ArrayNodeView:
+    """Read-only snapshot of a single node of the `ArrayTree`."""
+    move: chess.Move
+    mu: float
+    sigma: float
+    visits: int
+    depth: int
+
+
+class ArrayTree:
+    """
+    Structure-of-arrays store for the nodes of our Bayesian MCTS.
+
+    Every node is an index into preallocated NumPy arrays.
+    The children of a node are stored in one contiguous block, described by `first_child` and `child_count`.
+    Boards are not stored, they are rebuilt from the moves on the path from the root.
+    """
+
+    def __init__(self, capacity: int = 4096):
+        self.size = 0
+        self.mu = np.zeros(capacity, dtype=np.float64)
+        self.sigma = np.ones(capacity, dtype=np.float64)
+        self.result = np.zeros(capacity, dtype=np.float64)
+        self.visits = np.zeros(capacity, dtype=np.int32)
+        self.depth = np.zeros(capacity, dtype=np.int32)
+        self.parent = np.full(capacity, -1, dtype=np.int32)
+        self.first_child = np.full(capacity, -1, dtype=np.int32)
+        self.child_count = np.zeros(capacity, dtype=np.int32)
+        self.move = np.zeros(capacity, dtype=np.int32)
+
+    _FIELDS = ("mu", "sigma", "result", "visits", "depth", "parent", "first_child", "child_count", "move")
+    _DEFAULTS = {"sigma": 1, "parent": -1, "first_child": -1}
+
+    @property
+    def capacity(self) -> int:
+        return len(self.mu)
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes allocated by the arrays of the tree."""
+        return sum(getattr(self, f).nbytes for f in self._FIELDS)
+
+    @property
+    def bytes_per_node(self) -> float:
+        """Allocated bytes divided by the number of nodes in use."""
+        return self.nbytes / max(1, self.size)
+
+    def _reserve(self, n: int) -> None:
+        """Grow all arrays (by doubling) until `n` additional nodes fit."""
+        needed = self.size + n
+        if needed <= self.capacity:
+            return
+
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+
+        for f in self._FIELDS:
+            old = getattr(self, f)
+            new = np.full(capacity, self._DEFAULTS.get(f, 0), dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, f, new)
+
+    def add_root(self, result: float = 0, visits: int = 1) -> int:
+        self._reserve(1)
+        node = self.size
+        self.size += 1
+        self.mu[node] = result
+        self.sigma[node] = 1
+        self.result[node] = result
+        self.visits[node] = visits
+        self.depth[node] = 0
+        self.parent[node] = -1
+        self.first_child[node] = -1
+        self.child_count[node] = 0
+        self.move[node] = 0
+        return node
+
+    def add_children(self, node: int, moves: list[chess.Move]) -> None:
+        """
+        Append one child per move to `node`. The children inherit the result of `node` as prior.
+        """
+        n = len(moves)
+        if n == 0:
+            return
+        self._reserve(n)
+        first = self.size
+        end = first + n
+        self.size = end
+
+        result = self.result[node]
+        self.mu[first:end] = result
+        self.sigma[first:end] = 1
+        self.result[first:end] = result
+        self.visits[first:end] = 0
+        self.depth[first:end] = self.depth[node] + 1
+        self.parent[first:end] = node
+        self.first_child[first:end] = -1
+        self.child_count[first:end] = 0
+        self.move[first:end] = [encode_move(m) for m in moves]
+
+        self.first_child[node] = first
+        self.child_count[node] = n
+
+    def children(self, node: int) -> range:
+        first = self.first_child[node]
+        return range(first, first + self.child_count[node]) if first >= 0 else range(0)
+
+    def compact(self, root: int) -> "ArrayTree":
+        """
+        Return a new tree containing only the subtree below `root`, with `root` as node 0 at depth 0.
+        Children blocks stay contiguous, because the subtree is copied in breadth-first order.
+        """
+        order = [root]
+        new_index = {root: 0}
+        i = 0
+        while i < len(order):
+            node = order[i]
+            for c in self.children(node):
+                new_index[c] = len(order)
+                order.append(c)
+            i += 1
+
+        old = np.array(order, dtype=np.int64)
+        tree = ArrayTree(max(4096, 2 * len(order)))
+        tree.size = len(order)
+        for f in ("mu", "sigma", "result", "visits", "child_count", "move"):
+            getattr(tree, f)[:tree.size] = getattr(self, f)[old]
+
+        tree.depth[:tree.size] = self.depth[old] - self.depth[root]
+        tree.parent[:tree.size] = [new_index.get(p, -1) for p in self.parent[old].tolist()]
+        tree.parent[0] = -1
+        tree.first_child[:tree.size] = [new_index[f] if f >= 0 else -1 for f in self.first_child[old].tolist()]
+        return tree
+
+
+class BayesianMctsArray(IMcts):
+    """
+    Implementation of our Bayesian MCTS, backed by an `ArrayTree` instead of `BayesianMctsNode` objects.
+    Given the same seed, it builds the same tree as `BayesianMcts`.
+    """
+
+    def __init__(self, board: chess.Board, strategy: IStrategy, color: chess.Color, seed: int | None = None,
+                 capacity: int = 4096):
+        super().__init__(board, strategy, seed)
+        self.color = color
+        self.tree = ArrayTree(capacity)
+        self.root = self.tree.add_root(visits=1)
+
+    def _node_color(self, node: int) -> chess.Color:
+        return self.color if self.tree.depth[node] % 2 == 0 else not self.color
+
+    def board_of(self, node: int) -> chess.Board:
+        """
+        Rebuild the board of `node` by replaying the moves on the path from the root.
+        """
+        moves = []
+        while node != self.root:
+            moves.append(decode_move(int(self.tree.move[node])))
+            node = int(self.tree.parent[node])
+
+        board = self.board.copy()
+        for m in reversed(moves):
+            board.push(m)
+        return board
+
+    def _is_new_ucb1_better(self, color: chess.Color, current: float, new: float) -> bool:
+        if color == chess.WHITE:
+            # maximize ucb1
+            return new > current
+        else:
+            # minimize ubc1
+            return new < current
+
+    def _select_best_child(self, node: int, board: chess.Board) -> int:
+        """
+        Returns the child with the *best* ucb1 score, see `BayesianMctsNode._select_best_child`.
+        """
+        if board.is_game_over():
+            return node
+
+        tree = self.tree
+        first = int(tree.first_child[node])
+        end = first + int(tree.child_count[node])
+        best_child = first + self.random_state.randrange(end - first)
+
+        # if a child has no visits, prioritize this child.
+        unvisited = np.flatnonzero(tree.visits[first:end] == 0)
+        if len(unvisited) > 0:
+            return first + int(unvisited[0])
+
+        ucb1 = tree.mu[first:end] + np.sqrt(2 * math.log(int(tree.visits[node])) * tree.sigma[first:end])
+        color = self._node_color(node)
+        best = int(np.argmax(ucb1)) if color == chess.WHITE else int(np.argmin(ucb1))
+        if self._is_new_ucb1_better(color, ucb1[best_child - first], ucb1[best]):
+            best_child = first + best
+        return best_child
+
+    def select(self) -> tuple[int, chess.Board]:
+        """
+        Descend from the root to a leaf, and return the leaf together with its board.
+        """
+        tree = self.tree
+        node = self.root
+        board = self.board.copy()
+        while tree.child_count[node] != 0 and not board.is_game_over():
+            child = self._select_best_child(node, board)
+            if child == node:
+                break
+            board.push(decode_move(int(tree.move[child])))
+            node = child
+        return node, board
+
+    def expand(self, node: int, board: chess.Board) -> tuple[int, chess.Board]:
+        if self.tree.visits[node] == 0:
+            return node, board
+
+        self.tree.add_children(node, list(board.legal_moves))
+        child = self._select_best_child(node, board)
+        if child != node:
+            board.push(decode_move(int(self.tree.move[child])))
+        return child, board
+
+    def rollout(self, node: int, board: chess.Board, rollout_depth: int = 4) -> int:
+        steps = int(self.tree.depth[node])
+        for i in range(rollout_depth):
+            if board.is_game_over():
+                break
+
+            m = self.strategy.pick_next_move(board)
+            if m is None:
+                break
+
+            board.push(m)
+            steps += 1
+
+        steps = max(2, steps)
+        score = int(self.strategy.analyze_board(board) / math.log2(steps))
+        self.tree.result[node] = score
+        return score
+
+    def backpropagate(self, node: int) -> None:
+        tree = self.tree
+        while node >= 0:
+            tree.visits[node] += 1
+
+            n = int(tree.child_count[node])
+            if n == 0:
+                # leaf node
+                # prior
+                mu_pri = float(tree.mu[node])
+                sig_pri = float(tree.sigma[node])
+
+                # likelyhood
+                mu_li = float(tree.result[node])
+                sig_li = 1
+
+                # posterior
+                tree.sigma[node] = math.sqrt(sig_pri ** 2 + sig_li ** 2)
+                tree.mu[node] = (sig_pri ** 2 * mu_li + sig_li ** 2 * mu_pri) / (sig_pri ** 2 + sig_li ** 2)
+            else:
+                # interior node
+                first = int(tree.first_child[node])
+                combine = max_gaussians if self._node_color(node) == chess.WHITE else min_gaussians
+                tree.mu[node], tree.sigma[node] = combine(tree.mu[first:first + n], tree.sigma[first:first + n])
+
+            node = int(tree.parent[node]) if node != self.root else -1
+
+    def sample(self, runs: int = 1000) -> None:
+        for i in range(runs):
+            if self.board.is_game_over():
+                break
+
+            node, board = self.select()
+            leaf, board = self.expand(node, board)
+            _ = self.rollout(leaf, board)
+            self.backpropagate(leaf)
+
+    def apply_move(self, move: chess.Move) -> None:
+        self.board.push(move)
+        self.color = self.board.turn
+
+        # if a child node contains the move, keep the subtree of this child as new tree
+        code = encode_move(move)
+        for child in self.tree.children(self.root):
+            if self.tree.move[child] == code:
+                self.tree = self.tree.compact(child)
+                self.root = 0
+                self.tree.visits[self.root] = 1
+                return
+
+        # if no child node contains the move, initialize a new tree.
+        self.tree = ArrayTree(self.tree.capacity)
+        self.root = self.tree.add_root(visits=1)
+
+    def get_children(self) -> list[ArrayNodeView]:
+        tree = self.tree
+        return [ArrayNodeView(decode_move(int(tree.move[c])), float(tree.mu[c]), float(tree.sigma[c]),
+                              int(tree.visits[c]), int(tree.depth[c]))
+                for c in tree.children(self.root)]
+
+    def get_moves(self) -> dict[chess.Move, tuple[float, float]]:
+        res = {}
+        for c in self.get_children():
+            res[c.move] = (c.mu, c.sigma)
+        return res
+
+    @property
+    def node_count(self) -> int:
+        return self.tree.size
+
+    def print(self):
+        print("================================")
+        self._print(self.root)
+
+    def _print(self, node: int, indent: int = 0):
+        move = decode_move(int(self.tree.move[node])) if node != self.root else None
+        print("\t" * indent + f"move={move}, visits={self.tree.visits[node]}, mu={self.tree.mu[node]}, "
+                              f"sigma={self.tree.sigma[node]}")
+        for c in self.tree.children(node):
+            self._print(c, indent + 1)
@@ -3,9 +3,11 @@ import random
 from typing import Self
 
 import chess
+import numpy as np
 
-from baysed_chess.mcts.gaussian_utils import gaussian_ucb1, max_gaussian, min_gaussian
+from baysed_chess.mcts.gaussian_utils import gaussian_ucb1, max_gaussians, min_gaussians
 from baysed_chess.mcts.i_mcts_node import IMctsNode
+from baysed_chess.strategies.i_async_strategy import IAsyncStrategy
 from baysed_chess.strategies.i_strategy import IStrategy
 
 
@@ -14,9 +16,16 @@ class BayesianMctsNode(IMctsNode):
     Nodes of that our Bayesian MCTS uses internally.
     """
 
-    def __init__(self, board: chess.Board, strategy: IStrategy, color: chess.Color, parent: Self | None,
+    def __init__(self, board: chess.Board | None, strategy: IStrategy, color: chess.Color, parent: Self | None,
                  move: chess.Move | None,
-                 random_state: random.Random, inherit_result: int | None = None, depth: int = 0, visits: int = 0):
+                 random_state: random.Random, inherit_result: int | None = None, depth: int = 0, visits: int = 0,
+                 seed_priors: bool = False):
+        """
+        :param board: board of the node, or None to create it from the parent's board and the move when it is needed
+        :param seed_priors: seed the priors of the children with a batched evaluation when expanding, see `expand`
+        """
+        self._board = None
+        self._legal_moves = None
         super().__init__(board, strategy, parent, move, random_state)
         self.color = color  # Color of the player whose turn it is
         self.visits = visits
@@ -25,12 +34,51 @@ class BayesianMctsNode(IMctsNode):
         self.mu = self.result
         self.sigma = 1
         self.depth = depth
+        self.virtual_loss = 0  # number of pending rollouts below this node, see `add_virtual_loss`
+        self.seed_priors = seed_priors
 
-    def _create_child(self, move: chess.Move) -> IMctsNode:
-        copied_board = self.board.copy()
-        copied_board.push(move)
-        return BayesianMctsNode(copied_board, self.strategy, not self.color, self, move, self.random_state, self.result,
-                                self.depth + 1)
+    @property
+    def board(self) -> chess.Board:
+        """
+        The board of the node. Children are created without a board, it is only created when the child is selected.
+        """
+        if self._board is None:
+            board = self.parent.board.copy()
+            board.push(self.move)
+            self._board = board
+        return self._board
+
+    @board.setter
+    def board(self, board: chess.Board | None) -> None:
+        self._board = board
+
+    @property
+    def legal_moves(self) -> list[chess.Move]:
+        if self._legal_moves is None:
+            self._legal_moves = list(self.board.legal_moves)
+        return self._legal_moves
+
+    @legal_moves.setter
+    def legal_moves(self, legal_moves: list[chess.Move] | None) -> None:
+        self._legal_moves = legal_moves
+
+    @property
+    def is_materialized(self) -> bool:
+        """Whether the board of the node was created"""
+        return self._board is not None
+
+    def materialize(self) -> None:
+        """
+        Create the board of the node now, e.g. before the node is detached from its parent.
+        """
+        _ = self.board
+
+    def _create_child(self, move: chess.Move, board: chess.Board | None = None) -> IMctsNode:
+        """
+        :param board: board positioned at this node, if the node's own board should not be used
+        """
+        return BayesianMctsNode(None, self.strategy, not self.color, self, move, self.random_state, self.result,
+                                self.depth + 1, seed_priors=self.seed_priors)
 
     def _is_new_ucb1_better(self, current, new) -> bool:
         if self.color == chess.WHITE:
@@ -40,25 +88,53 @@ class BayesianMctsNode(IMctsNode):
             # minimize ubc1
             return new < current
 
-    def _select_best_child(self) -> IMctsNode:
+    def _virtual_mu(self, child: Self) -> float:
+        """
+        Returns mu of the child, made worse by one sigma (for the player to move) per pending rollout below the child.
+        """
+        if child.virtual_loss == 0:
+            return child.mu
+
+        penalty = child.virtual_loss * child.sigma
+        return child.mu - penalty if self.color == chess.WHITE else child.mu + penalty
+
+    def _best_unvisited_child(self) -> IMctsNode | None:
+        """
+        Returns the unvisited child (without pending rollouts) with the best prior, or None if there is none.
+        """
+        best_child = None
+        for child in self.children:
+            if child.visits == 0 and child.virtual_loss == 0 and (
+                    best_child is None or self._is_new_ucb1_better(best_child.mu, child.mu)):
+                best_child = child
+        return best_child
+
+    def _select_best_child(self, board: chess.Board | None = None) -> IMctsNode:
         """
         Returns the child with the *best* ucb1 score.
         It chooses the child with maximum ucb1 for WHITE, and with minimum ucb1 for BLACK.
+        :param board: board positioned at this node, if the node's own board should not be used
         """
 
-        if self.board.is_game_over():
+        if self.is_game_over(board):
             return self
 
+        if self.seed_priors:
+            # the priors differ, visit the most promising unvisited child first
+            best_child = self._best_unvisited_child()
+            if best_child is not None:
+                return best_child
+
         best_child = self.random_state.choice(self.children)
-        best_ucb1 = gaussian_ucb1(best_child.mu, best_child.sigma, self.visits)
+        best_ucb1 = gaussian_ucb1(self._virtual_mu(best_child), best_child.sigma, self.visits)
         for child in self.children:
-            # if child has no visits, prioritize this child.
-            if child.visits == 0:
+            # if child has no visits (and no pending rollouts), prioritize this child.
+            if child.visits == 0 and child.virtual_loss == 0:
                 best_child = child
                 break
 
             # save child if it has a *better* score, than our previous best child.
-            ucb1 = gaussian_ucb1(child.mu, child.sigma, self.visits)
+            ucb1 = gaussian_ucb1(self._virtual_mu(child), child.sigma, self.visits)
             if self._is_new_ucb1_better(best_ucb1, ucb1):
                 best_ucb1 = ucb1
                 best_child = child
@@ -70,29 +146,132 @@ class BayesianMctsNode(IMctsNode):
         for c in self.children:
             c.update_depth(depth + 1)
 
-    def select(self) -> IMctsNode:
-        if len(self.children) == 0 or self.board.is_game_over():
-            return self
-
-        return self._select_best_child().select()
-
-    def expand(self) -> IMctsNode:
+    def select(self, board: chess.Board | None = None) -> IMctsNode:
+        """
+        Selects the next leaf node, see `IMctsNode.select`.
+        :param board: scratch board positioned at this node, the moves down to the selected leaf are pushed onto it
+        """
+        node = self
+        while len(node.children) > 0 and not node.is_game_over(board):
+            child = node._select_best_child(board)
+            if board is not None:
+                board.push(child.move)
+            node = child
+        return node
+
+    def expand(self, board: chess.Board | None = None) -> IMctsNode:
+        """
+        Expands the node, see `IMctsNode.expand`.
+        :param board: scratch board positioned at this node, the move to the returned child is pushed onto it
+        """
         if self.visits == 0:
             return self
 
+        if board is not None and self._legal_moves is None:
+            self.legal_moves = list(board.legal_moves)
         for move in self.legal_moves:
-            self.children.append(self._create_child(move))
+            self.children.append(self._create_child(move, board))
+
+        if self.seed_priors:
+            self._seed_child_priors(board)
+        child = self._select_best_child(board)
+        if board is not None and child is not self:
+            board.push(child.move)
+        return child
+
+    def _seed_child_priors(self, board: chess.Board | None = None) -> None:
+        """
+        Set the prior mu of all unvisited children with one batched static evaluation (`IStrategy.analyze_boards`),
+        scaled like the score of a rollout without moves. The boards of the children are not kept.
+        :param board: board positioned at this node, if the node's own board should not be used
+        """
+        board = board if board is not None else self.board
+        children = []
+        boards = []
+        for child, move in zip(self.children, self.legal_moves):
+            if child.visits == 0:
+                child_board = board.copy(stack=False)
+                child_board.push(move)
+                children.append(child)
+                boards.append(child_board)
+
+        for child, score in zip(children, self.strategy.analyze_boards(boards)):
+            child.result = int(score / math.log2(max(2, child.depth)))
+            child.mu = child.result
+
+    def rollout(self, rollout_depth: int = 4, strategy: IStrategy | None = None,
+                board: chess.Board | None = None) -> int:
+        """
+        Rolls out the node, see `IMctsNode.rollout`.
+        :param strategy: strategy to use instead of the node's strategy, e.g. one of a pool of engines
+        :param board: scratch board positioned at this node, to push and pop the rollout on instead of a copy
+        """
+        strategy = strategy or self.strategy
+        rollout_board = board if board is not None else self.board.copy()
+        steps = self.depth
+        plies = 0
+        try:
+            for i in range(rollout_depth):
+                if self.is_game_over(rollout_board) if i == 0 else rollout_board.is_game_over():
+                    break
+
+                m = strategy.pick_next_move(rollout_board)
+                if m is None:
+                    break
+
+                rollout_board.push(m)
+                plies += 1
+                steps += 1
+
+            steps = max(2, steps)
+            score = int(strategy.analyze_board(rollout_board) / math.log2(steps))
+        finally:
+            if board is not None:
+                for _ in range(plies):
+                    board.pop()
+        self.result = score
+        return score
 
-        return self._select_best_child()
+    def play_rollout(self, rollout_depth: int = 4, strategy: IStrategy | None = None) -> tuple[chess.Board, int]:
+        """
+        Plays the moves of a rollout on a copy of the board, but leaves the evaluation of the final board to the
+        caller, e.g. to evaluate the final boards of several rollouts in one batch. See `finish_rollout`.
+        :return: the final board of the rollout, and the number of steps its evaluation is scaled with
+        """
+        strategy = strategy or self.strategy
+        rollout_board = self.board.copy()
+        steps = self.depth
+        for i in range(rollout_depth):
+            if self.is_game_over(rollout_board) if i == 0 else rollout_board.is_game_over():
+                break
 
-    def rollout(self, rollout_depth: int = 4) -> int:
+            m = strategy.pick_next_move(rollout_board)
+            if m is None:
+                break
+
+            rollout_board.push(m)
+            steps += 1
+        return rollout_board, max(2, steps)
+
+    def finish_rollout(self, evaluation: int, steps: int) -> int:
+        """
+        Sets the result of a rollout played by `play_rollout`, from the evaluation of its final board.
+        """
+        score = int(evaluation / math.log2(steps))
+        self.result = score
+        return score
+
+    async def rollout_async(self, strategy: IAsyncStrategy, rollout_depth: int = 4) -> int:
+        """
+        Same as `rollout`, but awaits the moves and the evaluation of an asynchronous strategy.
+        """
         copied_board = self.board.copy()
         steps = self.depth
         for i in range(rollout_depth):
             if copied_board.is_game_over():
                 break
 
-            m = self.strategy.pick_next_move(copied_board)
+            m = await strategy.pick_next_move(copied_board)
             if m is None:
                 break
 
@@ -100,22 +279,30 @@ class BayesianMctsNode(IMctsNode):
             steps += 1
 
         steps = max(2, steps)
-        score = int(self.strategy.analyze_board(copied_board) / math.log2(steps))
+        score = int(await strategy.analyze_board(copied_board) / math.log2(steps))
         self.result = score
         return score
 
-    def _combine_gaussians(self, mu1: float, sigma1: float, mu2: float, sigma2: float) -> tuple[float, float]:
+    def add_virtual_loss(self, delta: int) -> None:
+        """
+        Add `delta` pending rollouts to this node and all its ancestors.
+        While a rollout is pending, the selection treats the path as worse, so concurrent selections pick other leaves.
+        """
+        node = self
+        while node is not None:
+            node.virtual_loss += delta
+            node = node.parent
+
+    def _combine_gaussians(self, mus: np.ndarray, sigmas: np.ndarray) -> tuple[float, float]:
         if self.color == chess.WHITE:
-            return max_gaussian(mu1, sigma1, mu2, sigma2)
+            return max_gaussians(mus, sigmas)
         else:
-            return min_gaussian(mu1, sigma1, mu2, sigma2)
-
-    def backpropagate(self, score: int | None = None) -> None:
-        self.visits += 1
-
-        if score is not None:
-            self.result = score
+            return min_gaussians(mus, sigmas)
 
+    def _update_gaussian(self) -> None:
+        """
+        Update mu and sigma: for a leaf from its prior and rollout result, for an interior node from its children.
+        """
         if len(self.children) == 0:
             # leaf node
             # prior
@@ -134,16 +321,18 @@ class BayesianMctsNode(IMctsNode):
             self.sigma = sig_pos
         else:
             # interior node
-            shuffled_children = self.random_state.sample(self.children, len(self.children))
-            mu = shuffled_children[0].mu
-            sigma = shuffled_children[0].sigma
-            for c in shuffled_children[1:]:
-                mu, sigma = self._combine_gaussians(mu, sigma, c.mu, c.sigma)
-
-            # if max_sigma == 0:
-            #     max_sigma = 0.001
-            self.mu = mu
-            self.sigma = sigma
+            n = len(self.children)
+            mus = np.fromiter((c.mu for c in self.children), dtype=np.float64, count=n)
+            sigmas = np.fromiter((c.sigma for c in self.children), dtype=np.float64, count=n)
+            self.mu, self.sigma = self._combine_gaussians(mus, sigmas)
+
+    def backpropagate(self, score: int | None = None) -> None:
+        self.visits += 1
+
+        if score is not None:
+            self.result = score
+
+        self._update_gaussian()
 
         if self.parent:
             self.parent.backpropagate()
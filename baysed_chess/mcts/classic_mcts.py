@@ -11,20 +11,77 @@ class ClassicMcts(IMcts):
     Implementation of our Classic MCTS, focused on chess.
     """
 
-    def __init__(self, board: chess.Board, color: chess.Color, strategy: IStrategy, seed: int | None = None):
+    def __init__(self, board: chess.Board, color: chess.Color, strategy: IStrategy, seed: int | None = None,
+                 scratch_board: bool = True):
+        """
+        :param scratch_board: walk and roll out on one shared board with push/pop, instead of copying boards
+        """
         super().__init__(board, strategy, seed)
         self.color = color
-        self.root = ClassicMctsNode(board, color, strategy, None, None, self.random_state)
+        self.scratch_board = scratch_board
+        self._scratch: chess.Board | None = None
+        # the root gets its own board, `apply_move` pushes onto `self.board`
+        self.root = ClassicMctsNode(board.copy(), color, strategy, None, None, self.random_state)
 
     def apply_move(self, move: chess.Move) -> None:
-        # TODO: Add implementation for apply move, and benchmark the changes, to see if they make a difference.
-        pass
+        self.board.push(move)
+        if self._scratch is not None:
+            self._scratch.push(move)
+        self.color = self.board.turn
+
+        # if a child node contains the move, set this child as new root
+        for child in self.get_children():
+            if child.move == move:
+                self.root = child
+                self.root.parent = None
+                self.root.update_depth(0)
+                if self.root.board is None:
+                    # children expanded on the scratch board have no board of their own
+                    self.root.board = self.board.copy()
+                return
+
+        # if no child node contains the move, initialize a new tree.
+        self.root = ClassicMctsNode(self.board.copy(), self.color, self.strategy, None, None, self.random_state)
 
     def get_children(self) -> list[ClassicMctsNode]:
         return self.root.children
 
-    def sample(self, samples: int = 1000):
+    def sample(self, samples: int = 1000, subtree: ClassicMctsNode | None = None):
+        """
+        Run the MCTS with the given number of samples.
+        :param samples: Number of samples
+        :param subtree: Node below the root to sample, instead of the root, e.g. the expected reply when pondering.
+            The results are still backed up to the root.
+        """
+        subtree = subtree or self.root
         for i in range(samples):
-            node = self.root.select().expand()
-            score = node.rollout()
-            node.backpropagate(score)
+            if self.scratch_board:
+                self._sample_on_scratch_board(subtree)
+            else:
+                node = subtree.select().expand()
+                score = node.rollout()
+                node.backpropagate(score)
+
+    def _sample_on_scratch_board(self, subtree: ClassicMctsNode) -> None:
+        """
+        One sample on the scratch board: push the moves from the root to the leaf and of the rollout, then unwind.
+        """
+        if self._scratch is None:
+            self._scratch = self.board.copy()
+        board = self._scratch
+        ply = len(board.move_stack)
+
+        moves = []
+        node = subtree
+        while node is not self.root:
+            moves.append(node.move)
+            node = node.parent
+        try:
+            for move in reversed(moves):
+                board.push(move)
+            node = subtree.select(board).expand(board)
+            score = node.rollout(board=board)
+        finally:
+            while len(board.move_stack) > ply:
+                board.pop()
+        node.backpropagate(score)
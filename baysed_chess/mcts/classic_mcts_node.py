@@ -15,8 +15,12 @@ class ClassicMctsNode(IMctsNode):
     """
 
     def __init__(self, board: chess.Board, color: chess.Color, strategy: IStrategy, parent: Self | None, move: chess.Move | None,
-                 random_state: random.Random, depth: int = 0):
-        super().__init__(board, strategy, parent, move, random_state)
+                 random_state: random.Random, depth: int = 0, scratch: bool = False):
+        """
+        :param scratch: `board` is a shared scratch board positioned at this node. The node reads it now, but keeps
+            no reference, and has no board of its own.
+        """
+        super().__init__(None if scratch else board, strategy, parent, move, random_state)
         self.color = color
         self.parent = parent
         self.move = move
@@ -26,32 +30,53 @@ class ClassicMctsNode(IMctsNode):
         self.untried_actions = self.legal_moves
         self.score = 0
         self.depth = depth
+        if scratch:
+            self.is_game_over(board)
 
-    def expand(self) -> Self:
+    def expand(self, board: chess.Board | None = None) -> Self:
+        """
+        Expands the node, see `IMctsNode.expand`.
+        :param board: scratch board positioned at this node, the move to the new child is pushed onto it
+        """
         if self.is_fully_expanded():
             return self
 
         move = self.random_state.choice(self.untried_actions)
         self.untried_actions.remove(move)
-        next_board = self.board.copy()
-        next_board.push(move)
-        child_node = ClassicMctsNode(next_board, color=not self.color, strategy=self.strategy, parent=self, move=move, depth=self.depth + 1, random_state=self.random_state)
+        if board is not None:
+            board.push(move)
+            child_node = ClassicMctsNode(board, color=not self.color, strategy=self.strategy, parent=self, move=move, depth=self.depth + 1, random_state=self.random_state, scratch=True)
+        else:
+            next_board = self.board.copy()
+            next_board.push(move)
+            child_node = ClassicMctsNode(next_board, color=not self.color, strategy=self.strategy, parent=self, move=move, depth=self.depth + 1, random_state=self.random_state)
         self.children.append(child_node)
         return child_node
 
-    def rollout(self, rollout_depth: int = 4) -> int:
-        copied_board = self.board.copy()
+    def rollout(self, rollout_depth: int = 4, board: chess.Board | None = None) -> int:
+        """
+        Rolls out the node, see `IMctsNode.rollout`.
+        :param board: scratch board positioned at this node, to push and pop the rollout on instead of a copy
+        """
+        rollout_board = board if board is not None else self.board.copy()
         steps = self.depth
-        for i in range(rollout_depth):
-            if copied_board.is_game_over():
-                break
-
-            m = self.strategy.pick_next_move(copied_board)
-            copied_board.push(m)
-            steps += 1
-
-        steps = max(2, steps)
-        return int(self.strategy.analyze_board(copied_board) / math.log2(steps))
+        plies = 0
+        try:
+            for i in range(rollout_depth):
+                if self.is_game_over(rollout_board) if i == 0 else rollout_board.is_game_over():
+                    break
+
+                m = self.strategy.pick_next_move(rollout_board)
+                rollout_board.push(m)
+                plies += 1
+                steps += 1
+
+            steps = max(2, steps)
+            return int(self.strategy.analyze_board(rollout_board) / math.log2(steps))
+        finally:
+            if board is not None:
+                for _ in range(plies):
+                    board.pop()
 
     def backpropagate(self, score: float | None = None) -> None:
         self.visits += 1
@@ -62,6 +87,11 @@ class ClassicMctsNode(IMctsNode):
         if self.parent:
             self.parent.backpropagate(score)
 
+    def update_depth(self, depth: int) -> None:
+        self.depth = depth
+        for c in self.children:
+            c.update_depth(depth + 1)
+
     def is_fully_expanded(self) -> bool:
         return len(self.untried_actions) == 0
 
@@ -75,11 +105,17 @@ class ClassicMctsNode(IMctsNode):
         best_child_index = np.argmax(choices_weights) if self.color == chess.WHITE else np.argmin(choices_weights)
         return self.children[best_child_index]
 
-    def select(self) -> Self:
+    def select(self, board: chess.Board | None = None) -> Self:
+        """
+        Selects the next leaf node, see `IMctsNode.select`.
+        :param board: scratch board positioned at this node, the moves down to the selected node are pushed onto it
+        """
         current_node = self
-        while not current_node.board.is_game_over():
+        while not current_node.is_game_over(board):
             if not current_node.is_fully_expanded():
                 return current_node
             current_node = current_node._best_child()
+            if board is not None:
+                board.push(current_node.move)
 
         return current_node
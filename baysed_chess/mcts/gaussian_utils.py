@@ -1,31 +1,117 @@
 import math
 from functools import cache
 
-import torch
-import torch.distributions as dist
-from torch import exp
+import numpy as np
+from scipy.special import ndtr
 
-total_count = 0
-calculation_count = 0
+_SQRT_2 = math.sqrt(2)
+_INV_SQRT_2PI = 1 / math.sqrt(2 * math.pi)
+
+
+def normal_cdf(x: float) -> float:
+    """
+    Returns the CDF of the standard normal distribution at x
+    """
+    return 0.5 * math.erfc(-x / _SQRT_2)
+
+
+def normal_pdf(x: float) -> float:
+    """
+    Returns the PDF of the standard normal distribution at x
+    """
+    return _INV_SQRT_2PI * math.exp(-0.5 * x * x)
 
 
-@cache
 def calc_cdf(alpha: float) -> tuple[float, float, float]:
     """
     Returns the calculated CDF and parameters f1,f2 from the input alpha
     """
-    global calculation_count
-    calculation_count += 1
-
-    normal = dist.Normal(0, 1)
-    cdf_alpha = normal.cdf(torch.tensor(alpha)).item()
-    pdf_alpha = exp(normal.log_prob(torch.tensor(alpha))).item()
+    cdf_alpha = normal_cdf(alpha)
+    pdf_alpha = normal_pdf(alpha)
     f1 = alpha * cdf_alpha + pdf_alpha
     f2 = alpha ** 2 * cdf_alpha * (1 - cdf_alpha) + (
             1 - 2 * cdf_alpha) * alpha * pdf_alpha - pdf_alpha ** 2
     return cdf_alpha, f1, f2
 
 
+class AlphaTable:
+    """
+    Precomputed table of `calc_cdf` over alpha in [-alpha_max, alpha_max], which is linearly interpolated.
+    Outside of this range the values saturate to their limits, i.e. (0, 0, 0) below and (1, alpha, 0) above.
+    """
+
+    def __init__(self, alpha_max: float = 8.0, step: float = 0.01, count: bool = False):
+        """
+        :param alpha_max: the table covers [-alpha_max, alpha_max]
+        :param step: distance between two entries of the table
+        :param count: whether to count the lookups in `lookups` and `saturated`
+        """
+        self.alpha_max = alpha_max
+        self.step = step
+        self.size = int(round(2 * alpha_max / step)) + 1
+        self.cdf, self.f1, self.f2 = map(list, zip(*(calc_cdf(-alpha_max + i * step) for i in range(self.size))))
+
+        self.count = count
+        self.lookups = 0
+        """Number of lookups, only counted if `count` is set"""
+        self.saturated = 0
+        """Number of lookups outside of the table, only counted if `count` is set"""
+
+    def lookup(self, alpha: float) -> tuple[float, float, float]:
+        """
+        Returns the interpolated CDF and parameters f1,f2 from the input alpha
+        """
+        if self.count:
+            self.lookups += 1
+
+        x = (alpha + self.alpha_max) / self.step
+        if x <= 0 or x >= self.size - 1:
+            if self.count:
+                self.saturated += 1
+            return (0.0, 0.0, 0.0) if x <= 0 else (1.0, alpha, 0.0)
+
+        i = int(x)
+        t = x - i
+        cdf, f1, f2 = self.cdf, self.f1, self.f2
+        return (cdf[i] + t * (cdf[i + 1] - cdf[i]),
+                f1[i] + t * (f1[i + 1] - f1[i]),
+                f2[i] + t * (f2[i + 1] - f2[i]))
+
+    def max_gaussian(self, mu1, sigma1, mu2, sigma2) -> tuple[float, float]:
+        """
+        Returns the combined max gaussian of two Gaussians represented by mu1, sigma1, mu2, simga2
+        :param mu1: mu of the first Gaussian
+        :param sigma1: sigma of the first Gaussian
+        :param mu2: mu of the second Gaussian
+        :param sigma2: sigma of the second Gaussian
+        :return: mu and sigma maximized
+        """
+        # we assume independence of the two gaussians
+        sigma_m = math.sqrt(sigma1 ** 2 + sigma2 ** 2)
+        alpha = (mu1 - mu2) / sigma_m
+
+        cdf_alpha, f1_alpha, f2_alpha = self.lookup(alpha)
+        mu = mu2 + sigma_m * f1_alpha
+        variance = sigma2 ** 2 + (sigma1 ** 2 - sigma2 ** 2) * cdf_alpha + sigma_m ** 2 * f2_alpha
+        return mu, math.sqrt(max(variance, 0.0))
+
+    def min_gaussian(self, mu1, sigma1, mu2, sigma2) -> tuple[float, float]:
+        """
+        Returns the combined min gaussian of two Gaussians represented by mu1, sigma1, mu2, simga2,
+        using min(X1, X2) = -max(-X1, -X2)
+        :param mu1: mu of the first Gaussian
+        :param sigma1: sigma of the first Gaussian
+        :param mu2: mu of the second Gaussian
+        :param sigma2: sigma of the second Gaussian
+        :return: mu and sigma minimized
+        """
+        mu, sigma = self.max_gaussian(-mu1, sigma1, -mu2, sigma2)
+        return -mu, sigma
+
+
+_alpha_table = AlphaTable()
+
+
 def max_gaussian(mu1, sigma1, mu2, sigma2) -> tuple[float, float]:
     """
     Returns the combined max gaussian of two Gaussians represented by mu1, sigma1, mu2, simga2
@@ -35,24 +121,7 @@ def max_gaussian(mu1, sigma1, mu2, sigma2) -> tuple[float, float]:
     :param sigma2: sigma of the second Gaussian
     :return: mu and sigma maximized
     """
-    global total_count
-    total_count += 1
-
-    # we assume independence of the two gaussians
-    # print(mu1, sigma1, mu2, sigma2)
-    # normal = dist.Normal(0, 1)
-    sigma_m = math.sqrt(sigma1 ** 2 + sigma2 ** 2)
-
-    # round to two significant digits to enable float lookup
-    alpha = round((mu1 - mu2) / sigma_m, 2)
-
-    cdf_alpha, f1_alpha, f2_alpha = calc_cdf(alpha)
-
-    mu = mu2 + sigma_m * f1_alpha
-    sigma = math.sqrt(sigma2 ** 2 + (sigma1 ** 2 - sigma2 ** 2) * cdf_alpha + sigma_m ** 2 * f2_alpha)
-    # sigma = math.sqrt((mu1**2 + sigma1**2) * cdf_alpha + (mu2**2 + sigma2**2) * (1 - cdf_alpha) + (mu1 + mu2) * sigma_m * pdf_alpha - mu**2)
-
-    return mu, sigma
+    return _alpha_table.max_gaussian(mu1, sigma1, mu2, sigma2)
 
 
 def min_gaussian(mu1, sigma1, mu2, sigma2) -> tuple[float, float]:
@@ -64,22 +133,92 @@ def min_gaussian(mu1, sigma1, mu2, sigma2) -> tuple[float, float]:
     :param sigma2: sigma of the second Gaussian
     :return: mu and sigma minimized
     """
-    try:
-        normal = dist.Normal(0, 1)
-        sigma_m = math.sqrt(sigma1 ** 2 + sigma2 ** 2)
-        alpha = (mu1 - mu2) / sigma_m
+    return _alpha_table.min_gaussian(mu1, sigma1, mu2, sigma2)
+
+
+# half-width of the integration range in standard deviations
+_SPAN = 6.0
+
+
+def max_gaussians(mus: np.ndarray, sigmas: np.ndarray, grid_size: int = 65) -> tuple[float, float]:
+    """
+    Returns mu and sigma of the maximum of n independent Gaussians in one vectorized pass.
+    The CDF of the maximum is the product of the CDFs of all Gaussians, the moments are integrated from it with
+    Simpson's rule. In contrast to folding `max_gaussian` pairwise, the result does not depend on the order of the
+    Gaussians and does not accumulate the error of the pairwise approximation.
+    :param mus: mus of the Gaussians
+    :param sigmas: sigmas of the Gaussians
+    :param grid_size: number of points of the quadrature grid, has to be odd
+    :return: mu and sigma maximized
+    """
+    mus = np.asarray(mus, dtype=np.float64)
+    sigmas = np.maximum(np.asarray(sigmas, dtype=np.float64), 1e-12)
+
+    # the maximum is (almost surely) inside [lower, upper]
+    lower = np.max(mus - _SPAN * sigmas)
+    upper = np.max(mus + _SPAN * sigmas)
+
+    # Gaussians that are (almost surely) below `lower` can not be the maximum
+    relevant = mus + _SPAN * sigmas > lower
+    mus = mus[relevant]
+    sigmas = sigmas[relevant]
+    if len(mus) == 1:
+        return float(mus[0]), float(sigmas[0])
+
+    y = np.linspace(0, upper - lower, grid_size)
+    cdf = np.prod(ndtr((y[:, None] + (lower - mus)) / sigmas), axis=1)
 
-        cdf_alpha = normal.cdf(torch.tensor(alpha)).item()
-        pdf_alpha = exp(normal.log_prob(torch.tensor(alpha))).item()
-        pdf_alpha_neg = exp(normal.log_prob(torch.tensor(-alpha))).item()
+    # moments of y = max - lower, using E[y] = int (1 - F(y)) dy and E[y^2] = int 2y (1 - F(y)) dy
+    weights = _simpson_weights(grid_size) * (y[1] - y[0])
+    tail = 1 - cdf
+    mean = weights @ tail
+    second_moment = weights @ (2 * y * tail)
 
-        mu = mu1 * (1 - cdf_alpha) + mu2 * cdf_alpha - pdf_alpha_neg * sigma_m
-        sigma = math.sqrt((mu1 ** 2 + sigma1 ** 2) * (1 - cdf_alpha) + (mu2 ** 2 + sigma2 ** 2) * cdf_alpha - (
-                    mu1 + mu2) * sigma_m * pdf_alpha - mu ** 2)
-        return mu, sigma
-    except ValueError:
-        print(mu1, sigma1, mu2, sigma2)
+    return float(lower + mean), math.sqrt(max(second_moment - mean ** 2, 0.0))
+
+
+@cache
+def _simpson_weights(n: int) -> np.ndarray:
+    weights = np.ones(n)
+    weights[1:-1:2] = 4
+    weights[2:-1:2] = 2
+    return weights / 3
+
+
+def min_gaussians(mus: np.ndarray, sigmas: np.ndarray, grid_size: int = 65) -> tuple[float, float]:
+    """
+    Returns mu and sigma of the minimum of n independent Gaussians, see `max_gaussians`.
+    :param mus: mus of the Gaussians
+    :param sigmas: sigmas of the Gaussians
+    :param grid_size: number of points of the quadrature grid
+    :return: mu and sigma minimized
+    """
+    mu, sigma = max_gaussians(-np.asarray(mus, dtype=np.float64), sigmas, grid_size)
+    return -mu, sigma
 
 
 def gaussian_ucb1(mu, sigma, N) -> float:
     return mu + math.sqrt(2 * math.log(N) * sigma)
+
+
+def precision_weighted(mus: list[float], sigmas: list[float]) -> tuple[float, float]:
+    """
+    Returns the precision-weighted combination of independent estimates N(mu_i, sigma_i^2) of the same quantity
+    :param mus: mus of the estimates
+    :param sigmas: sigmas of the estimates
+    :return: combined mu and sigma
+    """
+    precisions = [1 / max(s, 1e-12) ** 2 for s in sigmas]
+    precision = sum(precisions)
+    mu = sum(p * m for p, m in zip(precisions, mus)) / precision
+    return mu, math.sqrt(1 / precision)
+
+
+def prob_greater(mu1, sigma1, mu2, sigma2) -> float:
+    """
+    Returns P(X1 > X2) of the independent Gaussians X1 ~ N(mu1, sigma1^2) and X2 ~ N(mu2, sigma2^2)
+    """
+    sigma = math.sqrt(sigma1 ** 2 + sigma2 ** 2)
+    if sigma == 0:
+        return 1.0 if mu1 > mu2 else 0.0
+    return normal_cdf((mu1 - mu2) / sigma)
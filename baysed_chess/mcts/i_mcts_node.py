@@ -10,15 +10,25 @@ from baysed_chess.strategies.i_strategy import IStrategy
 class IMctsNode(ABC):
     """Interface for the nodes in our MCTS (Monte Carlo Tree Search) implementations"""
 
-    def __init__(self, board: chess.Board, strategy: IStrategy, parent: Self | None, move: chess.Move | None,
+    def __init__(self, board: chess.Board | None, strategy: IStrategy, parent: Self | None, move: chess.Move | None,
                  random_state: random.Random):
         self.board = board
         self.strategy = strategy
         self.parent = parent
         self.children = []
         self.move = move
-        self.legal_moves = list(board.legal_moves)
+        self.legal_moves = list(board.legal_moves) if board is not None else None
         self.random_state = random_state
+        self._game_over: bool | None = None
+
+    def is_game_over(self, board: chess.Board | None = None) -> bool:
+        """
+        Whether the game is over at this node. Computed once, the position (and history) of a node never changes.
+        :param board: board positioned at this node (e.g. a shared scratch board), to use instead of the node's board
+        """
+        if self._game_over is None:
+            self._game_over = (board if board is not None else self.board).is_game_over()
+        return self._game_over
 
     @abstractmethod
     def select(self) -> Self:
@@ -0,0 +1,117 @@
+import random
+from typing import Self
+
+import chess
+import chess.polyglot
+
+from baysed_chess.mcts.baysian_mcts_node import BayesianMctsNode
+from baysed_chess.mcts.transposition_table import TranspositionTable
+from baysed_chess.strategies.i_strategy import IStrategy
+
+
+class TranspositionBayesianMctsNode(BayesianMctsNode):
+    """
+    Node of our Bayesian MCTS, that shares itself between all parents reaching the same position (DAG search).
+
+    Nodes are looked up by (zobrist hash, depth). Keeping the depth in the key means edges always go from depth d
+    to d + 1, so the graph has no cycles, even if a position repeats.
+    """
+
+    def __init__(self, board: chess.Board | None, strategy: IStrategy, color: chess.Color, parent: Self | None,
+                 move: chess.Move | None, random_state: random.Random, table: TranspositionTable[Self],
+                 inherit_result: int | None = None, depth: int = 0, visits: int = 0, seed_priors: bool = False,
+                 zobrist: int | None = None):
+        """
+        :param zobrist: zobrist hash of the board, required if the board is created lazily
+        """
+        super().__init__(board, strategy, color, parent, move, random_state, inherit_result, depth, visits,
+                         seed_priors)
+        self.table = table
+        self.zobrist = zobrist if zobrist is not None else chess.polyglot.zobrist_hash(board)
+        self.parents: list[Self] = [parent] if parent is not None else []
+
+    def _create_child(self, move: chess.Move, board: chess.Board | None = None) -> BayesianMctsNode:
+        # hash the child position without creating its board
+        board = board if board is not None else self.board
+        board.push(move)
+        zobrist = chess.polyglot.zobrist_hash(board)
+        board.pop()
+        key = (zobrist, self.depth + 1)
+
+        child = self.table.get(key)
+        if child is not None:
+            child.parents.append(self)
+            return child
+
+        child = TranspositionBayesianMctsNode(None, self.strategy, not self.color, self, move, self.random_state,
+                                              self.table, self.result, self.depth + 1,
+                                              seed_priors=self.seed_priors, zobrist=zobrist)
+        self.table.put(key, child)
+        return child
+
+    def backpropagate(self, score: int | None = None) -> None:
+        """
+        Update this node and every ancestor once, deepest first, so each node combines already updated children.
+        """
+        self.visits += 1
+
+        if score is not None:
+            self.result = score
+
+        self._update_gaussian()
+
+        ancestors = {}
+        stack = list(self.parents)
+        while stack:
+            node = stack.pop()
+            if id(node) not in ancestors:
+                ancestors[id(node)] = node
+                stack.extend(node.parents)
+
+        for node in sorted(ancestors.values(), key=lambda n: n.depth, reverse=True):
+            node.visits += 1
+            node._update_gaussian()
+
+    def descendants(self) -> list[Self]:
+        """
+        Return this node and all nodes below it, each once, in breadth-first order.
+        """
+        order = [self]
+        seen = {id(self)}
+        i = 0
+        while i < len(order):
+            for c in order[i].children:
+                if id(c) not in seen:
+                    seen.add(id(c))
+                    order.append(c)
+            i += 1
+        return order
+
+    def make_root(self) -> None:
+        """
+        Make this node the root: drop parents outside the new tree, fix depths and moves, and re-index the table.
+        """
+        nodes = self.descendants()
+        reachable = {id(n) for n in nodes}
+        # a node without board is created from its parent and move, which may change below
+        for node in nodes:
+            if not node.is_materialized and id(node.parent) not in reachable:
+                node.materialize()
+        self.parent = None
+        self.parents = []
+        for node in nodes[1:]:
+            node.parents = [p for p in node.parents if id(p) in reachable]
+            node.parent = node.parents[0]
+
+        # breadth-first order visits the parents of a node before the node itself
+        self.depth = 0
+        for node in nodes[1:]:
+            node.depth = node.parents[0].depth + 1
+
+        # a shared child stores the move of the parent that created it, the root children need their own moves
+        for child, move in zip(self.children, self.legal_moves):
+            child.move = move
+
+        self.table.clear()
+        for node in nodes:
+            self.table.put((node.zobrist, node.depth), node)
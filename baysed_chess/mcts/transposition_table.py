@@ -0,0 +1,59 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+Node = TypeVar("Node")
+TranspositionKey = tuple[int, int]
+
+
+@dataclass
+class TranspositionStatistics:
+    hits: int = 0
+    """Number of lookups that found a node, i.e. nodes that did not have to be created"""
+    misses: int = 0
+    """Number of lookups that found no node"""
+    evictions: int = 0
+    """Number of entries dropped by the replacement policy"""
+
+
+class TranspositionTable(Generic[Node]):
+    """
+    Bounded map from (zobrist hash, depth) to the node of that position.
+
+    The table only decides which nodes can be *found* again. Evicting an entry does not remove the node from the tree.
+    When the table is full, the least recently used entry is replaced.
+    """
+
+    def __init__(self, capacity: int = 100_000):
+        self.capacity = capacity
+        self.statistics = TranspositionStatistics()
+        self._entries: OrderedDict[TranspositionKey, Node] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: TranspositionKey) -> Node | None:
+        node = self._entries.get(key)
+        if node is None:
+            self.statistics.misses += 1
+            return None
+
+        self.statistics.hits += 1
+        self._entries.move_to_end(key)
+        return node
+
+    def put(self, key: TranspositionKey, node: Node) -> None:
+        if self.capacity <= 0:
+            return
+
+        self._entries[key] = node
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.statistics.evictions += 1
+
+    def clear(self) -> None:
+        """
+        Remove all entries, the statistics are kept.
+        """
+        self._entries.clear()
@@ -0,0 +1,96 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import chess
+
+from baysed_chess.mcts.baysian_mcts import BayesianMcts
+from baysed_chess.mcts.baysian_mcts_node import BayesianMctsNode
+from baysed_chess.strategies.i_strategy import IStrategy
+
+
+class TreeParallelBayesianMcts(BayesianMcts):
+    """
+    Bayesian MCTS that evaluates several leaves of one shared tree concurrently (tree parallelization).
+
+    Every batch selects up to `batch_size` leaves. A virtual loss is added along the path of each selected leaf,
+    which penalizes mu by one sigma per pending rollout, so that the next selection picks a different leaf.
+    The leaves are rolled out concurrently, one thread per strategy of the pool (e.g. one engine process each),
+    afterwards the virtual loss is removed and all leaves are backed up.
+    Each strategy evaluates the final boards of its rollouts with one `IStrategy.analyze_boards` call,
+    so strategies with a batched evaluation (e.g. `Lc0Strategy`) get the whole group at once.
+
+    The interior backup combines *all* children at once, so the tree after a batch does not depend on the order
+    in which the rollouts finish. Given the same seed (and deterministic strategies) the search is reproducible.
+    """
+
+    def __init__(self, board: chess.Board, strategies: list[IStrategy], color: chess.Color, batch_size: int = 8,
+                 seed: int | None = None):
+        super().__init__(board, strategies[0], color, seed)
+        self.strategies = strategies
+        self.batch_size = batch_size
+        self._executor = ThreadPoolExecutor(max_workers=len(strategies))
+
+    def __del__(self):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stop the rollout threads.
+        """
+        self._executor.shutdown(wait=True)
+
+    def select_batch(self) -> list[BayesianMctsNode]:
+        """
+        Select up to `batch_size` distinct leaves, and mark their paths with a virtual loss.
+        Stops early if the selection returns a leaf that is already part of the batch.
+        """
+        leaves = []
+        for _ in range(self.batch_size):
+            leaf = self.root.select().expand()
+            if any(leaf is other for other in leaves):
+                break
+
+            leaf.add_virtual_loss(1)
+            leaves.append(leaf)
+        return leaves
+
+    @staticmethod
+    def _rollout_group(strategy: IStrategy, leaves: list[BayesianMctsNode]) -> list[int]:
+        rollouts = [leaf.play_rollout(strategy=strategy) for leaf in leaves]
+        evaluations = strategy.analyze_boards([board for board, _ in rollouts])
+        return [leaf.finish_rollout(evaluation, steps)
+                for leaf, (_, steps), evaluation in zip(leaves, rollouts, evaluations)]
+
+    def sample_batch(self) -> int:
+        """
+        Run one batch: select, roll out concurrently and back up.
+        :return: Number of rolled out leaves
+        """
+        if self.board.is_game_over():
+            return 0
+
+        leaves = self.select_batch()
+
+        # leaf i is always rolled out by strategy i % n, in the order of selection
+        n = len(self.strategies)
+        groups = [leaves[i::n] for i in range(n)]
+        futures = [self._executor.submit(self._rollout_group, self.strategies[i], group)
+                   for i, group in enumerate(groups) if group]
+        for future in futures:
+            future.result()
+
+        for leaf in leaves:
+            leaf.add_virtual_loss(-1)
+        for leaf in leaves:
+            leaf.backpropagate()
+        return len(leaves)
+
+    def sample(self, runs: int = 1000) -> None:
+        """
+        Run the MCTS with the given number of batches.
+        :param runs: Number of batches
+        """
+        for i in range(runs):
+            if self.board.is_game_over():
+                break
+
+            self.sample_batch()
@@ -0,0 +1,48 @@
+import chess
+import chess.pgn
+
+
+class OpeningSuite:
+    """
+    Start positions for a match, each one is played twice with swapped colors (a game pair).
+
+    Playing both colors of the same opening cancels most of the advantage of the opening itself,
+    so the result of a pair is less noisy than the results of two games from random colors.
+    """
+
+    def __init__(self, openings: list[chess.Board]):
+        """
+        :param openings: start positions
+        """
+        if not openings:
+            raise ValueError("the opening suite is empty")
+        self.openings = openings
+
+    @classmethod
+    def load(cls, path: str) -> "OpeningSuite":
+        """
+        Load the openings of an EPD file (one position per line) or a PGN file (the end position of every game).
+        """
+        openings = []
+        with open(path) as f:
+            if path.lower().endswith(".pgn"):
+                while (game := chess.pgn.read_game(f)) is not None:
+                    # without the moves: the engines start their search trees from the position
+                    openings.append(chess.Board(game.end().board().fen()))
+            else:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith("#"):
+                        board, _ = chess.Board.from_epd(line)
+                        openings.append(board)
+        return cls(openings)
+
+    def __len__(self) -> int:
+        return len(self.openings)
+
+    def schedule(self, game: int) -> tuple[chess.Board, bool]:
+        """
+        Start position of a game and whether engine A plays white in it.
+        Games 2k and 2k + 1 are the pair of opening k (cycling through the suite), engine A is white in the first one.
+        """
+        return self.openings[(game // 2) % len(self.openings)].copy(), game % 2 == 0
@@ -0,0 +1,78 @@
+import dataclasses
+import json
+import os
+
+from baysed_chess.matchmaker import GameStatistics, MatchResult, Winner
+
+
+class ResultsLog:
+    """
+    On-disk log of finished games, so a long match can be followed live and resumed after an interruption.
+
+    Every game is appended as one JSON line to `<path>.jsonl` (index, winner, colors, opening, statistics and PGN),
+    and then its PGN to `<path>.pgn`. A line that was cut off by a crash is ignored when the log is read.
+
+    The JSON line is the commit point of a game, `<path>.pgn` is rewritten from the JSON lines when the log is loaded,
+    so a crash between the two files neither loses nor duplicates a game in it.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: path of the log without extension
+        """
+        self.path = path
+        self.jsonl_path = path + ".jsonl"
+        self.pgn_path = path + ".pgn"
+
+    def load(self) -> list[MatchResult]:
+        """
+        Read the games of the log, and rewrite `<path>.pgn` with their PGNs.
+        """
+        if not os.path.exists(self.jsonl_path):
+            return []
+
+        results = []
+        with open(self.jsonl_path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                results.append(MatchResult(Winner[entry["winner"]], entry.get("pgn", ""),
+                                           GameStatistics(**entry["statistics"]), entry["engine_a_white"],
+                                           entry.get("game", len(results)), entry.get("opening")))
+
+        # logs written before the PGN was part of the entries keep their PGN file
+        if all(result.game_as_pgn for result in results):
+            with open(self.pgn_path + ".tmp", "w") as f:
+                f.writelines(result.game_as_pgn + "\n\n" for result in results)
+            os.replace(self.pgn_path + ".tmp", self.pgn_path)
+        return results
+
+    def append(self, result: MatchResult) -> None:
+        """
+        Append a finished game to the log.
+        """
+        directory = os.path.dirname(self.jsonl_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        entry = {"game": result.game, "winner": result.winner.name, "engine_a_white": result.engine_a_white,
+                 "opening": result.opening, "statistics": dataclasses.asdict(result.statistics),
+                 "pgn": result.game_as_pgn}
+        self._repair()
+        with open(self.jsonl_path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        with open(self.pgn_path, "a") as f:
+            f.write(result.game_as_pgn + "\n\n")
+
+    def _repair(self) -> None:
+        # a line cut off by a crash must not swallow the next entry
+        if not os.path.exists(self.jsonl_path) or os.path.getsize(self.jsonl_path) == 0:
+            return
+        with open(self.jsonl_path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
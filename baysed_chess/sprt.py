@@ -0,0 +1,146 @@
+import math
+from typing import TypedDict
+
+from scipy.stats import norm
+
+SprtResult = TypedDict('SprtResult', {"llr": float, "lower": float, "upper": float, "decision": str | None})
+EloEstimate = TypedDict('EloEstimate', {"elo": float, "lower": float, "upper": float})
+
+
+def elo_to_score(elo: float) -> float:
+    """
+    Expected score of an engine that is `elo` points stronger, with the logistic Elo model.
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def score_to_elo(score: float) -> float:
+    """
+    Elo difference of an expected score, the inverse of `elo_to_score`.
+    """
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+EMPTY_BIN_COUNT = 1e-3
+"""Count of the results that did not occur in the LLR, so that every result has a probability (as in fishtest)"""
+PSEUDO_COUNT = 0.5
+"""Virtual results added to every bin of the Elo estimate if all results are equal, so its interval has a width"""
+
+
+def _mean_and_variance(frequencies: dict[float, float]) -> tuple[float, float, float]:
+    n = sum(frequencies.values())
+    if n == 0:
+        return 0, 0.0, 0.0
+    mean = sum(score * count for score, count in frequencies.items()) / n
+    variance = sum(count * (score - mean) ** 2 for score, count in frequencies.items()) / n
+    return n, mean, variance
+
+
+def _mle(probabilities: dict[float, float], score: float) -> dict[float, float]:
+    """
+    Distribution of the results with the expected `score` that is most likely to give the observed `probabilities`.
+    The maximum is q_i = p_i / (1 + x (a_i - score)) (Lagrange multiplier x), x is found by bisection.
+    """
+    lower = -1 / (max(probabilities) - score)
+    upper = -1 / (min(probabilities) - score)
+    for _ in range(100):
+        x = (lower + upper) / 2
+        # decreasing in x, the expected score of q is `score` at its root
+        if sum(p * (a - score) / (1 + x * (a - score)) for a, p in probabilities.items()) > 0:
+            lower = x
+        else:
+            upper = x
+    x = (lower + upper) / 2
+    return {a: p / (1 + x * (a - score)) for a, p in probabilities.items()}
+
+
+def _llr(frequencies: dict[float, int], elo0: float, elo1: float) -> float:
+    # generalized SPRT: log-likelihood ratio of the most likely distributions with the scores of H0 and H1,
+    # as in fishtest. Unlike its normal approximation, a few equal results do not have a variance of 0.
+    if sum(frequencies.values()) == 0:
+        return 0.0
+    frequencies = {score: count if count > 0 else EMPTY_BIN_COUNT for score, count in frequencies.items()}
+    n = sum(frequencies.values())
+    probabilities = {score: count / n for score, count in frequencies.items()}
+    q0 = _mle(probabilities, elo_to_score(elo0))
+    q1 = _mle(probabilities, elo_to_score(elo1))
+    return sum(count * math.log(q1[score] / q0[score]) for score, count in frequencies.items())
+
+
+def _trinomial(wins: int, draws: int, losses: int) -> dict[float, int]:
+    return {1.0: wins, 0.5: draws, 0.0: losses}
+
+
+def _pentanomial(pairs: list[int]) -> dict[float, int]:
+    return {i / 4: count for i, count in enumerate(pairs)}
+
+
+def sprt(wins: int, draws: int, losses: int, elo0: float = 0, elo1: float = 50, alpha: float = 0.05,
+         beta: float = 0.05) -> SprtResult:
+    """
+    Sequential probability ratio test with the trinomial model (every game on its own).
+
+    Null Hypothesis: Engine A is `elo0` Elo stronger than engine B.
+    Alternative Hypothesis: Engine A is `elo1` Elo stronger than engine B.
+
+    Evaluate it after every game, and stop the match once a decision is made.
+    The probability to accept H1 if H0 is true is at most `alpha`, to accept H0 if H1 is true at most `beta`.
+
+    :returns: dict of the log-likelihood ratio, its bounds, and the decision "H0", "H1" or None to continue
+    """
+    return _decide(_llr(_trinomial(wins, draws, losses), elo0, elo1), alpha, beta)
+
+
+def sprt_pentanomial(pairs: list[int], elo0: float = 0, elo1: float = 50, alpha: float = 0.05,
+                     beta: float = 0.05) -> SprtResult:
+    """
+    Sequential probability ratio test with the pentanomial model, see `sprt`.
+
+    Use it for game pairs, where both engines played the same opening once with each color.
+    The results of the two games are correlated, counting pairs removes that variance from the test.
+
+    :param pairs: number of pairs in which engine A scored 0, 0.5, 1, 1.5 and 2 points
+    """
+    return _decide(_llr(_pentanomial(pairs), elo0, elo1), alpha, beta)
+
+
+def _decide(llr: float, alpha: float, beta: float) -> SprtResult:
+    lower = math.log(beta / (1 - alpha))
+    upper = math.log((1 - beta) / alpha)
+    decision = "H1" if llr >= upper else "H0" if llr <= lower else None
+    return {
+        "llr": llr,
+        "lower": lower,
+        "upper": upper,
+        "decision": decision
+    }
+
+
+def elo_estimate(wins: int, draws: int, losses: int, confidence: float = 0.95) -> EloEstimate:
+    """
+    Elo difference of engine A to engine B with the bounds of its confidence interval (normal approximation).
+    """
+    return _elo_estimate(_trinomial(wins, draws, losses), confidence)
+
+
+def elo_estimate_pentanomial(pairs: list[int], confidence: float = 0.95) -> EloEstimate:
+    """
+    Like `elo_estimate`, from the counts of game pairs, see `sprt_pentanomial`.
+    """
+    return _elo_estimate(_pentanomial(pairs), confidence)
+
+
+def _elo_estimate(frequencies: dict[float, int], confidence: float) -> EloEstimate:
+    n, mean, variance = _mean_and_variance(frequencies)
+    if n == 0:
+        return {"elo": 0.0, "lower": -math.inf, "upper": math.inf}
+    if variance == 0:
+        # e.g. only wins, an interval of zero width would claim an exact Elo difference
+        n, mean, variance = _mean_and_variance({score: count + PSEUDO_COUNT for score, count in frequencies.items()})
+    error = norm.ppf((1 + confidence) / 2) * math.sqrt(variance / n)
+    return {
+        "elo": score_to_elo(mean),
+        "lower": score_to_elo(mean - error),
+        "upper": score_to_elo(mean + error)
+    }
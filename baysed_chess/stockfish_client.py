@@ -0,0 +1,143 @@
+import asyncio
+import concurrent.futures
+import threading
+
+import chess
+import chess.engine
+
+
+class StockfishClient:
+    """
+    Pipelined client for several stockfish processes, with a futures-based API.
+
+    `analyse` and `play` queue the request and return a `concurrent.futures.Future` immediately.
+    The requests are spread over the processes, each one gets the request of the process with the fewest queued ones.
+    Every process works through its queue back to back on the event loop of the client (in a background thread),
+    so a process gets its next position as soon as it sent `bestmove`, without a round trip to the caller.
+    A process that crashed is restarted, and its request is retried once.
+
+    Use `asyncio.wrap_future` to await the futures on another event loop, see `PipelinedStockfishStrategy`.
+    """
+
+    def __init__(self, path: str, processes: int = 4, options: dict | None = None):
+        """
+        :param processes: number of stockfish processes
+        :param options: UCI options of the processes, by default one thread each
+        """
+        self.path = path
+        self.processes = processes
+        self.options = options if options is not None else {"Threads": 1}
+        self._queued = [0] * processes
+        self._lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name="StockfishClient", daemon=True)
+        self._thread.start()
+        self._queues: list[asyncio.Queue] = []
+        self._workers: list[asyncio.Task] = []
+        self._closed = False
+        self.restarted = 0
+        """Number of processes that were restarted after a crash"""
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+
+    def _run_loop(self) -> None:
+        # setting the loop of the thread attaches the child watcher of the event loop policy to it (subprocesses)
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    async def _popen(self) -> chess.engine.UciProtocol:
+        _, stockfish = await chess.engine.popen_uci(self.path)
+        if self.options:
+            await stockfish.configure(self.options)
+        return stockfish
+
+    async def _start(self) -> None:
+        for i in range(self.processes):
+            stockfish = await self._popen()
+            queue = asyncio.Queue()
+            self._queues.append(queue)
+            self._workers.append(asyncio.ensure_future(self._work(i, stockfish, queue)))
+
+    async def _work(self, i: int, stockfish: chess.engine.UciProtocol, queue: asyncio.Queue) -> None:
+        while True:
+            request = await queue.get()
+            if request is None:
+                try:
+                    await stockfish.quit()
+                except chess.engine.EngineTerminatedError:
+                    pass
+                return
+
+            command, board, limit, future = request
+            try:
+                try:
+                    result = await self._request(stockfish, command, board, limit)
+                except chess.engine.EngineTerminatedError:
+                    # otherwise every later request of this process fails, and it has the shortest queue
+                    stockfish = await self._popen()
+                    self.restarted += 1
+                    result = await self._request(stockfish, command, board, limit)
+                future.set_result(result)
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._queued[i] -= 1
+
+    @staticmethod
+    async def _request(stockfish: chess.engine.UciProtocol, command: str, board: chess.Board,
+                       limit: chess.engine.Limit) -> int | chess.Move | None:
+        if command == "analyse":
+            info = await stockfish.analyse(board, limit)
+            return info["score"].white().score(mate_score=100_000)
+        return (await stockfish.play(board, limit)).move
+
+    def _submit(self, command: str, board: chess.Board, limit: chess.engine.Limit) -> concurrent.futures.Future:
+        if self._closed:
+            raise RuntimeError("the client is closed")
+
+        future = concurrent.futures.Future()
+        with self._lock:
+            i = min(range(self.processes), key=self._queued.__getitem__)
+            self._queued[i] += 1
+        # copy the board, the caller may push and pop it while the request is queued
+        self._loop.call_soon_threadsafe(self._queues[i].put_nowait, (command, board.copy(), limit, future))
+        return future
+
+    def analyse(self, board: chess.Board, limit: chess.engine.Limit = chess.engine.Limit(depth=0)
+                ) -> concurrent.futures.Future[int]:
+        """
+        Queue the evaluation of `board`, the future gets the score from the perspective of white like `score_stockfish`.
+        """
+        return self._submit("analyse", board, limit)
+
+    def play(self, board: chess.Board, limit: chess.engine.Limit = chess.engine.Limit(depth=4)
+             ) -> concurrent.futures.Future[chess.Move | None]:
+        """
+        Queue the search of the best move of `board`, the future gets the move.
+        """
+        return self._submit("play", board, limit)
+
+    @property
+    def queued(self) -> int:
+        """Number of requests that are queued or in progress"""
+        with self._lock:
+            return sum(self._queued)
+
+    def close(self) -> None:
+        """
+        Finish the queued requests, quit the processes and stop the background thread.
+        """
+        if self._closed:
+            return
+
+        self._closed = True
+        for queue in self._queues:
+            self._loop.call_soon_threadsafe(queue.put_nowait, None)
+
+        async def join():
+            await asyncio.gather(*self._workers, return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(join(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
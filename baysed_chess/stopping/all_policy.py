@@ -0,0 +1,39 @@
+from baysed_chess.mcts.i_mcts import IMcts
+from baysed_chess.stopping.i_stopping_policy import IStoppingPolicy
+
+
+class AllPolicy(IStoppingPolicy):
+    """
+    Stop once all policies stop. A policy that stopped stays stopped for the rest of the search.
+    The policies are checked in order, and only after all previous ones stopped, so put the cheap ones first.
+    UCI engines can not combine limits like this, so it translates to no engine limit.
+    """
+
+    def __init__(self, *policies: IStoppingPolicy):
+        super().__init__()
+        self.policies = list(policies)
+        self._stopped = [False] * len(self.policies)
+
+    def reset(self) -> None:
+        super().reset()
+        self._stopped = [False] * len(self.policies)
+        for policy in self.policies:
+            policy.reset()
+
+    def should_stop(self, elapsed: float, node_count: int, tree: IMcts | None) -> bool:
+        for i, policy in enumerate(self.policies):
+            if not self._stopped[i]:
+                self._stopped[i] = policy.should_stop(elapsed, node_count, tree)
+                if not self._stopped[i]:
+                    return False
+        self.stop_reason = " and ".join(policy.stop_reason for policy in self.policies)
+        return True
+
+    @property
+    def needs_tree(self) -> bool:
+        return any(policy.needs_tree for policy in self.policies)
+
+    def nodes_until_check(self, node_count: int) -> int | None:
+        counts = [p.nodes_until_check(node_count) for i, p in enumerate(self.policies) if not self._stopped[i]]
+        counts = [n for n in counts if n is not None]
+        return min(counts) if counts else None
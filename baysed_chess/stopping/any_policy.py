@@ -0,0 +1,42 @@
+from typing import Any
+
+from baysed_chess.mcts.i_mcts import IMcts
+from baysed_chess.stopping.i_stopping_policy import IStoppingPolicy
+
+
+class AnyPolicy(IStoppingPolicy):
+    """
+    Stop as soon as any of the policies stops.
+    """
+
+    def __init__(self, *policies: IStoppingPolicy):
+        super().__init__()
+        self.policies = list(policies)
+
+    def reset(self) -> None:
+        super().reset()
+        for policy in self.policies:
+            policy.reset()
+
+    def should_stop(self, elapsed: float, node_count: int, tree: IMcts | None) -> bool:
+        for policy in self.policies:
+            if policy.should_stop(elapsed, node_count, tree):
+                self.stop_reason = policy.stop_reason
+                return True
+        return False
+
+    @property
+    def needs_tree(self) -> bool:
+        return all(policy.needs_tree for policy in self.policies)
+
+    def nodes_until_check(self, node_count: int) -> int | None:
+        counts = [n for n in (p.nodes_until_check(node_count) for p in self.policies) if n is not None]
+        return min(counts) if counts else None
+
+    def engine_limit(self) -> dict[str, Any]:
+        # a UCI engine stops at the first limit it reaches, so the limits of all policies apply
+        limit = {}
+        for policy in self.policies:
+            for key, value in policy.engine_limit().items():
+                limit[key] = min(limit[key], value) if key in limit else value
+        return limit
@@ -0,0 +1,69 @@
+import chess
+
+from baysed_chess.mcts.gaussian_utils import prob_greater
+from baysed_chess.mcts.i_mcts import IMcts
+from baysed_chess.stopping.i_stopping_policy import IStoppingPolicy
+
+
+def dominance(moves: dict[chess.Move, tuple[float, float]], color: chess.Color, min_sigma: float = 0.0) -> float:
+    """
+    Probability that the best move of the root is better than the second best move.
+    :param moves: the Gaussian (mu, sigma) of each move, from the perspective of white
+    :param color: the side to move
+    :param min_sigma: lower bound of the sigmas
+    :return: P(best > second), 1 if there is only one move
+    """
+    if len(moves) < 2:
+        return 1.0
+    ranked = sorted(moves.values(), key=lambda x: x[0], reverse=color == chess.WHITE)
+    (mu1, sigma1), (mu2, sigma2) = ranked[0], ranked[1]
+    sigma1, sigma2 = max(sigma1, min_sigma), max(sigma2, min_sigma)
+    if color == chess.WHITE:
+        return prob_greater(mu1, sigma1, mu2, sigma2)
+    return prob_greater(-mu1, sigma1, -mu2, sigma2)
+
+
+class ConvergencePolicy(IStoppingPolicy):
+    """
+    Stop once the best move of the root clearly dominates, i.e. P(best > second) of the Gaussians of the root's
+    children exceeds `threshold`. Needs a tree with `get_moves`, like the Bayesian MCTS.
+    """
+
+    threshold: float
+    """Stop, once P(best > second) exceeds this probability"""
+    min_sigma: float
+    """Lower bound of the sigmas for P(best > second). The sigmas of the tree stay in the order of 1,
+    while mu is in centipawns, so without a bound almost any difference of the mus would dominate."""
+    check_interval: int
+    """Number of iterations between two checks of P(best > second)"""
+
+    def __init__(self, color: chess.Color, threshold: float = 0.95, min_sigma: float = 20.0,
+                 check_interval: int = 32):
+        """
+        :param color: the side to move
+        """
+        super().__init__()
+        self.color = color
+        self.threshold = threshold
+        self.min_sigma = min_sigma
+        self.check_interval = check_interval
+        self._next_check = 0
+
+    def reset(self) -> None:
+        super().reset()
+        self._next_check = 0
+
+    @property
+    def needs_tree(self) -> bool:
+        return True
+
+    def should_stop(self, elapsed: float, node_count: int, tree: IMcts | None) -> bool:
+        if tree is None or node_count < self._next_check:
+            return False
+
+        self._next_check = node_count + self.check_interval
+        p = dominance(tree.get_moves(), self.color, self.min_sigma)
+        if p > self.threshold:
+            self.stop_reason = f"P(best > second) = {p:.3f}"
+            return True
+        return False
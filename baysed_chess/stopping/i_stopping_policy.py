@@ -0,0 +1,53 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+from baysed_chess.mcts.i_mcts import IMcts
+
+
+class IStoppingPolicy(ABC):
+    """
+    Interface for stopping policies, which decide when `Limit.run` stops a search.
+    Policies are combined with `AnyPolicy` and `AllPolicy`.
+    """
+
+    stop_reason: str | None
+    """Why the policy stopped the last search, None if it did not stop it"""
+
+    def __init__(self):
+        self.stop_reason = None
+
+    def reset(self) -> None:
+        """
+        Prepare the policy for a new search.
+        """
+        self.stop_reason = None
+
+    @abstractmethod
+    def should_stop(self, elapsed: float, node_count: int, tree: IMcts | None) -> bool:
+        """
+        Whether to stop the search, and if so set `stop_reason`.
+        :param elapsed: seconds searched so far
+        :param node_count: number of search iterations so far
+        :param tree: the searched tree, if the limit is bound to one
+        """
+        pass
+
+    @property
+    def needs_tree(self) -> bool:
+        """
+        Whether the policy can only stop a search that it can look at, i.e. a `Limit` bound to the tree.
+        """
+        return False
+
+    def nodes_until_check(self, node_count: int) -> int | None:
+        """
+        Return after how many more iterations the policy has to be checked at the latest,
+        or None if the search may check it whenever it likes (see `Limit.run`).
+        """
+        return None
+
+    def engine_limit(self) -> dict[str, Any]:
+        """
+        Return the part of the policy that UCI engines understand, as arguments of `chess.engine.Limit`.
+        """
+        return {}
@@ -0,0 +1,33 @@
+from baysed_chess.mcts.i_mcts import IMcts
+from baysed_chess.stopping.i_stopping_policy import IStoppingPolicy
+
+
+class MemoryPolicy(IStoppingPolicy):
+    """
+    Stop once the tree has grown to a number of nodes.
+    Counting the nodes of an object tree walks the tree, so the size is only checked every `check_interval` iterations.
+    """
+
+    def __init__(self, max_nodes: int, check_interval: int = 256):
+        super().__init__()
+        self.max_nodes = max_nodes
+        self.check_interval = check_interval
+        self._next_check = 0
+
+    def reset(self) -> None:
+        super().reset()
+        self._next_check = 0
+
+    @property
+    def needs_tree(self) -> bool:
+        return True
+
+    def should_stop(self, elapsed: float, node_count: int, tree: IMcts | None) -> bool:
+        if tree is None or node_count < self._next_check:
+            return False
+
+        self._next_check = node_count + self.check_interval
+        if tree.node_count >= self.max_nodes:
+            self.stop_reason = f"tree of {self.max_nodes} nodes"
+            return True
+        return False
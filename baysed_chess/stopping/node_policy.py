@@ -0,0 +1,26 @@
+from typing import Any
+
+from baysed_chess.mcts.i_mcts import IMcts
+from baysed_chess.stopping.i_stopping_policy import IStoppingPolicy
+
+
+class NodePolicy(IStoppingPolicy):
+    """
+    Stop after a number of search iterations.
+    """
+
+    def __init__(self, nodes: int):
+        super().__init__()
+        self.nodes = nodes
+
+    def should_stop(self, elapsed: float, node_count: int, tree: IMcts | None) -> bool:
+        if node_count >= self.nodes:
+            self.stop_reason = f"{self.nodes} nodes"
+            return True
+        return False
+
+    def nodes_until_check(self, node_count: int) -> int | None:
+        return max(0, self.nodes - node_count)
+
+    def engine_limit(self) -> dict[str, Any]:
+        return {"nodes": self.nodes}
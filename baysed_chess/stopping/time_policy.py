@@ -0,0 +1,23 @@
+from typing import Any
+
+from baysed_chess.mcts.i_mcts import IMcts
+from baysed_chess.stopping.i_stopping_policy import IStoppingPolicy
+
+
+class TimePolicy(IStoppingPolicy):
+    """
+    Stop after a number of seconds.
+    """
+
+    def __init__(self, seconds: float):
+        super().__init__()
+        self.seconds = seconds
+
+    def should_stop(self, elapsed: float, node_count: int, tree: IMcts | None) -> bool:
+        if elapsed >= self.seconds:
+            self.stop_reason = f"{self.seconds:g}s"
+            return True
+        return False
+
+    def engine_limit(self) -> dict[str, Any]:
+        return {"time": self.seconds}
@@ -0,0 +1,40 @@
+import chess
+import chess.engine
+
+from baysed_chess.board_evaluations.evaluate_lc0 import score_lc0_async
+from baysed_chess.strategies.i_async_strategy import IAsyncStrategy
+
+
+class AsyncLc0Strategy(IAsyncStrategy):
+    """
+    Play the rollout with lc0.
+    Evaluate the terminal state with lc0.
+    Talks to lc0 with the asyncio protocol of `chess.engine`, the process is started on the first call.
+    """
+
+    def __init__(self, path: str, rollout_depth: int = 4):
+        super().__init__(rollout_depth)
+        self._lc0: chess.engine.UciProtocol | None = None
+        self.path = path
+        self.limit = chess.engine.Limit(depth=4)
+
+    async def lc0(self) -> chess.engine.UciProtocol:
+        if self._lc0 is None:
+            _, self._lc0 = await chess.engine.popen_uci(self.path)
+        return self._lc0
+
+    async def pick_next_move(self, board: chess.Board) -> chess.Move | None:
+        lc0 = await self.lc0()
+        return (await lc0.play(board, self.limit)).move
+
+    async def analyze_board(self, board: chess.Board) -> int:
+        return await score_lc0_async(board, await self.lc0())
+
+    def new_game(self) -> None:
+        if self._lc0 is not None:
+            self._lc0.first_game = True
+
+    async def close(self) -> None:
+        if self._lc0 is not None:
+            await self._lc0.quit()
+            self._lc0 = None
@@ -0,0 +1,41 @@
+import random
+
+import chess
+import chess.engine
+
+from baysed_chess.board_evaluations.evaluate_stockfish import score_stockfish_async
+from baysed_chess.strategies.i_async_strategy import IAsyncStrategy
+
+
+class AsyncRandomStockfishStrategy(IAsyncStrategy):
+    """
+    Play the rollout randomly.
+    Evaluate the terminal state with stockfish.
+    Talks to stockfish with the asyncio protocol of `chess.engine`, the process is started on the first call.
+    """
+
+    def __init__(self, rollout_depth: int, path: str, random_seed: random.Random = random.Random()):
+        super().__init__(rollout_depth)
+        self._stockfish: chess.engine.UciProtocol | None = None
+        self.path = path
+        self.random_seed = random_seed
+
+    async def stockfish(self) -> chess.engine.UciProtocol:
+        if self._stockfish is None:
+            _, self._stockfish = await chess.engine.popen_uci(self.path)
+        return self._stockfish
+
+    async def pick_next_move(self, board: chess.Board) -> chess.Move:
+        return self.random_seed.choice(list(board.legal_moves))
+
+    async def analyze_board(self, board: chess.Board) -> int:
+        return await score_stockfish_async(board, await self.stockfish())
+
+    def new_game(self) -> None:
+        if self._stockfish is not None:
+            self._stockfish.first_game = True
+
+    async def close(self) -> None:
+        if self._stockfish is not None:
+            await self._stockfish.quit()
+            self._stockfish = None
@@ -0,0 +1,40 @@
+import chess
+import chess.engine
+
+from baysed_chess.board_evaluations.evaluate_stockfish import score_stockfish_async
+from baysed_chess.strategies.i_async_strategy import IAsyncStrategy
+
+
+class AsyncStockfishStrategy(IAsyncStrategy):
+    """
+    Play the rollout with stockfish.
+    Evaluate the terminal state with stockfish.
+    Talks to stockfish with the asyncio protocol of `chess.engine`, the process is started on the first call.
+    """
+
+    def __init__(self, path: str, rollout_depth: int = 4):
+        super().__init__(rollout_depth)
+        self._stockfish: chess.engine.UciProtocol | None = None
+        self.path = path
+        self.limit = chess.engine.Limit(depth=4)
+
+    async def stockfish(self) -> chess.engine.UciProtocol:
+        if self._stockfish is None:
+            _, self._stockfish = await chess.engine.popen_uci(self.path)
+        return self._stockfish
+
+    async def pick_next_move(self, board: chess.Board) -> chess.Move | None:
+        stockfish = await self.stockfish()
+        return (await stockfish.play(board, self.limit)).move
+
+    async def analyze_board(self, board: chess.Board) -> int:
+        return await score_stockfish_async(board, await self.stockfish())
+
+    def new_game(self) -> None:
+        if self._stockfish is not None:
+            self._stockfish.first_game = True
+
+    async def close(self) -> None:
+        if self._stockfish is not None:
+            await self._stockfish.quit()
+            self._stockfish = None
@@ -0,0 +1,25 @@
+import chess
+
+from baysed_chess.strategies.i_async_strategy import IAsyncStrategy
+from baysed_chess.strategies.i_strategy import IStrategy
+
+
+class AsyncStrategyAdapter(IAsyncStrategy):
+    """
+    Use a synchronous strategy as `IAsyncStrategy`.
+    Only meant for strategies without an engine process (e.g. random or PESTO), because the calls block the event loop.
+    """
+
+    def __init__(self, strategy: IStrategy):
+        super().__init__(strategy.rollout_depth)
+        self.strategy = strategy
+
+    async def pick_next_move(self, board: chess.Board) -> chess.Move | None:
+        return self.strategy.pick_next_move(board)
+
+    async def analyze_board(self, board: chess.Board) -> int:
+        return self.strategy.analyze_board(board)
+
+    def new_game(self) -> None:
+        # the strategy leases its engine again at the next use, which then starts with `ucinewgame`
+        self.strategy.close()
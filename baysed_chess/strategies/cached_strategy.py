@@ -0,0 +1,89 @@
+import chess
+import chess.polyglot
+
+from baysed_chess.board_evaluations.evaluation_cache import EvaluationCache
+from baysed_chess.strategies.i_async_strategy import IAsyncStrategy
+from baysed_chess.strategies.i_strategy import IStrategy
+
+
+class CachedStrategy(IStrategy):
+    """
+    Wrap a strategy, and cache its board scores (and optionally its moves) by the zobrist hash of the position.
+    Moves should only be cached for deterministic strategies, otherwise the rollouts lose their randomness.
+    """
+
+    def __init__(self, strategy: IStrategy, cache: EvaluationCache, cache_moves: bool = False):
+        super().__init__(strategy.rollout_depth)
+        self.strategy = strategy
+        self.cache = cache
+        self.cache_moves = cache_moves
+
+    def pick_next_move(self, board: chess.Board) -> chess.Move | None:
+        if not self.cache_moves:
+            return self.strategy.pick_next_move(board)
+
+        key = chess.polyglot.zobrist_hash(board)
+        found, move = self.cache.get_move(key)
+        if not found:
+            move = self.strategy.pick_next_move(board)
+            self.cache.put_move(key, move)
+        return move
+
+    def analyze_board(self, board: chess.Board) -> int:
+        key = chess.polyglot.zobrist_hash(board)
+        score = self.cache.get_score(key)
+        if score is None:
+            score = self.strategy.analyze_board(board)
+            self.cache.put_score(key, score)
+        return score
+
+    def analyze_boards(self, boards: list[chess.Board]) -> list[int]:
+        keys = [chess.polyglot.zobrist_hash(board) for board in boards]
+        scores = [self.cache.get_score(key) for key in keys]
+        # score the cache misses in one batch
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            for i, score in zip(missing, self.strategy.analyze_boards([boards[i] for i in missing])):
+                scores[i] = score
+                self.cache.put_score(keys[i], score)
+        return scores
+
+    def close(self) -> None:
+        self.strategy.close()
+
+
+class AsyncCachedStrategy(IAsyncStrategy):
+    """
+    Same as `CachedStrategy`, but for an `IAsyncStrategy`.
+    """
+
+    def __init__(self, strategy: IAsyncStrategy, cache: EvaluationCache, cache_moves: bool = False):
+        super().__init__(strategy.rollout_depth)
+        self.strategy = strategy
+        self.cache = cache
+        self.cache_moves = cache_moves
+
+    async def pick_next_move(self, board: chess.Board) -> chess.Move | None:
+        if not self.cache_moves:
+            return await self.strategy.pick_next_move(board)
+
+        key = chess.polyglot.zobrist_hash(board)
+        found, move = self.cache.get_move(key)
+        if not found:
+            move = await self.strategy.pick_next_move(board)
+            self.cache.put_move(key, move)
+        return move
+
+    async def analyze_board(self, board: chess.Board) -> int:
+        key = chess.polyglot.zobrist_hash(board)
+        score = self.cache.get_score(key)
+        if score is None:
+            score = await self.strategy.analyze_board(board)
+            self.cache.put_score(key, score)
+        return score
+
+    def new_game(self) -> None:
+        self.strategy.new_game()
+
+    async def close(self) -> None:
+        await self.strategy.close()
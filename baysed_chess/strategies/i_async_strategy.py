@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+
+import chess
+
+
+class IAsyncStrategy(ABC):
+    """
+    Interface for asynchronous strategies.
+    Same as `IStrategy`, but the engine calls are awaited on the running event loop,
+    so many rollouts can be in flight at the same time.
+    """
+
+    rollout_depth: int
+
+    def __init__(self, rollout_depth: int = 4):
+        self.rollout_depth = rollout_depth
+
+    @abstractmethod
+    async def pick_next_move(self, board: chess.Board) -> chess.Move | None:
+        pass
+
+    @abstractmethod
+    async def analyze_board(self, board: chess.Board) -> int:
+        pass
+
+    def new_game(self) -> None:
+        """
+        Forget the previous game, e.g. send `ucinewgame` before the next command to the engine process.
+        """
+        pass
+
+    async def close(self) -> None:
+        """
+        Release the resources of the strategy, e.g. quit its engine process.
+        """
+        pass
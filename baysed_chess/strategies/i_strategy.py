@@ -21,3 +21,16 @@ class IStrategy(ABC):
     @abstractmethod
     def analyze_board(self, board: chess.Board) -> int:
         pass
+
+    def analyze_boards(self, boards: list[chess.Board]) -> list[int]:
+        """
+        Score a list of boards, e.g. all children of a node, in one call.
+        Strategies with a batched evaluation override this, by default the boards are analyzed one by one.
+        """
+        return [self.analyze_board(board) for board in boards]
+
+    def close(self) -> None:
+        """
+        Release the resources of the strategy, e.g. return its engine to the engine pool.
+        """
+        pass
@@ -1,7 +1,8 @@
 import chess
 import chess.engine
 
-from baysed_chess.board_evaluations.evaluate_lc0 import score_lc0
+from baysed_chess.board_evaluations.evaluate_lc0 import score_lc0, score_lc0_batch
+from baysed_chess.engine_pool import PooledEngine, get_engine_pool
 from baysed_chess.strategies.i_strategy import IStrategy
 
 
@@ -9,22 +10,35 @@ class Lc0Strategy(IStrategy):
     """
     Play the rollout with lc0.
     Evaluate the terminal state with lc0.
+    `analyze_boards` spreads a batch of boards over `instances` lc0 processes.
     """
 
-    def __init__(self, path: str, rollout_depth: int = 4):
+    def __init__(self, path: str, rollout_depth: int = 4, instances: int = 1):
+        """
+        :param instances: number of lc0 processes that evaluate the boards of `analyze_boards`
+        """
         super().__init__(rollout_depth)
         self._lc0 = None
+        self._batch_lc0s: list[PooledEngine] = []
         self.path = path
+        self.instances = instances
         self.limit = chess.engine.Limit(depth=4)
 
     def __del__(self):
+        self.close()
+
+    def close(self) -> None:
         if self._lc0 is not None:
-            self._lc0.quit()
+            self._lc0.release()
+            self._lc0 = None
+        for lc0 in self._batch_lc0s:
+            lc0.release()
+        self._batch_lc0s = []
 
     @property
-    def lc0(self) -> chess.engine.SimpleEngine:
+    def lc0(self) -> PooledEngine:
         if self._lc0 is None:
-            self._lc0 = self.lc0 = chess.engine.SimpleEngine.popen_uci(self.path)
+            self._lc0 = self.lc0 = get_engine_pool().lease(self.path)
         return self._lc0
 
     @lc0.setter
@@ -36,3 +50,9 @@ class Lc0Strategy(IStrategy):
 
     def analyze_board(self, board: chess.Board) -> int:
         return score_lc0(board, self.lc0)
+
+    def analyze_boards(self, boards: list[chess.Board]) -> list[int]:
+        # the additional instances are only leased for batches
+        while len(self._batch_lc0s) < self.instances - 1:
+            self._batch_lc0s.append(get_engine_pool().lease(self.path))
+        return score_lc0_batch(boards, [self.lc0] + self._batch_lc0s)
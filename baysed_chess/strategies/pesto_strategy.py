@@ -1,10 +1,19 @@
 import chess
 import chess.engine
 
-from baysed_chess.board_evaluations.evaluate_pestos import score_pestos
+from baysed_chess.board_evaluations.evaluate_pestos import score_pestos_batch
+from baysed_chess.board_evaluations.incremental_pestos import Delta, IncrementalPesto
 from baysed_chess.strategies.i_strategy import IStrategy
 
 
+def _placement(board: chess.Board) -> tuple[int, ...]:
+    """
+    The piece placement of the board, all that PeSTO evaluates besides the side to move.
+    """
+    return (board.pawns, board.knights, board.bishops, board.rooks, board.queens, board.kings,
+            board.occupied_co[chess.WHITE], board.occupied_co[chess.BLACK])
+
+
 class PestoStrategy(IStrategy):
     """
     Play the rollout according to PESTOs board evaluation.
@@ -13,19 +22,63 @@ class PestoStrategy(IStrategy):
 
     def __init__(self, rollout_depth: int = 4):
         super().__init__(rollout_depth)
+        # the evaluation follows the board of a rollout: after the picked move was pushed, only its delta is applied
+        self._board: chess.Board | None = None
+        self._evaluation: IncrementalPesto | None = None
+        self._ply = -1
+        self._last_move: chess.Move | None = None
+        self._placement: tuple[int, ...] | None = None
+        self._picked: tuple[chess.Move, Delta, tuple[int, ...]] | None = None
+
+    def _sync(self, board: chess.Board) -> IncrementalPesto:
+        """
+        Return the evaluation of `board`, updated incrementally if `board` is the previous board plus the picked move.
+        The board may be a scratch board that is popped and pushed between calls, so the placement is compared as well.
+        """
+        ply = len(board.move_stack)
+        last_move = board.move_stack[-1] if ply > 0 else None
+        previous_move = board.move_stack[-2] if ply > 1 else None
+        placement = _placement(board)
+        if (board is self._board and ply == self._ply and last_move == self._last_move
+                and placement == self._placement):
+            return self._evaluation
+
+        if (board is self._board and ply == self._ply + 1 and previous_move == self._last_move
+                and self._picked is not None and last_move == self._picked[0] and placement == self._picked[2]):
+            self._evaluation.apply(self._picked[1])
+        else:
+            self._board = board
+            self._evaluation = IncrementalPesto(board)
+
+        self._ply = ply
+        self._last_move = last_move
+        self._placement = placement
+        self._picked = None
+        return self._evaluation
 
     def pick_next_move(self, board: chess.Board) -> chess.Move | None:
+        evaluation = self._sync(board)
+
         def score_move(move: chess.Move):
-            bc = board.copy(stack=False)
-            bc.push(move)
-            return move, score_pestos(bc)
+            delta = evaluation.delta(board, move)
+            return move, evaluation.score_move(board, move, delta), delta
 
         moves = [score_move(move) for move in board.legal_moves]
+        if len(moves) == 0:
+            # game is over
+            return None
+
         if board.turn != chess.WHITE:
             best_move = max(moves, key=lambda m: m[1])
         else:
             best_move = min(moves, key=lambda m: m[1])
+        board.push(best_move[0])
+        self._picked = (best_move[0], best_move[2], _placement(board))
+        board.pop()
         return best_move[0]
 
     def analyze_board(self, board: chess.Board) -> int:
-        return score_pestos(board)
+        return self._sync(board).score(board)
+
+    def analyze_boards(self, boards: list[chess.Board]) -> list[int]:
+        return score_pestos_batch(boards).tolist()
@@ -0,0 +1,31 @@
+import asyncio
+
+import chess
+import chess.engine
+
+from baysed_chess.stockfish_client import StockfishClient
+from baysed_chess.strategies.i_async_strategy import IAsyncStrategy
+
+
+class PipelinedStockfishStrategy(IAsyncStrategy):
+    """
+    Play the rollout with stockfish.
+    Evaluate the terminal state with stockfish.
+    Sends the requests to a `StockfishClient`, which is shared by several strategies: with more strategies than
+    stockfish processes, every process has the next request of another rollout queued while it searches.
+    """
+
+    def __init__(self, client: StockfishClient, rollout_depth: int = 4):
+        super().__init__(rollout_depth)
+        self.client = client
+        self.limit = chess.engine.Limit(depth=4)
+
+    async def pick_next_move(self, board: chess.Board) -> chess.Move | None:
+        return await asyncio.wrap_future(self.client.play(board, self.limit))
+
+    async def analyze_board(self, board: chess.Board) -> int:
+        return await asyncio.wrap_future(self.client.analyse(board))
+
+    async def close(self) -> None:
+        # the first strategy that is closed closes the shared client
+        self.client.close()
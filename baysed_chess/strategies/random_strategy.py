@@ -2,7 +2,7 @@ import random
 
 import chess
 
-from baysed_chess.board_evaluations.evaluate_michniewsk import score_michniewsk
+from baysed_chess.board_evaluations.evaluate_michniewsk import score_michniewsk, score_michniewsk_batch
 from baysed_chess.strategies.i_strategy import IStrategy
 
 
@@ -23,3 +23,6 @@ class RandomStrategy(IStrategy):
 
     def analyze_board(self, board: chess.Board) -> int:
         return score_michniewsk(board)
+
+    def analyze_boards(self, boards: list[chess.Board]) -> list[int]:
+        return score_michniewsk_batch(boards).tolist()
@@ -2,6 +2,7 @@ import chess
 import chess.engine
 
 from baysed_chess.board_evaluations.evaluate_stockfish import score_stockfish
+from baysed_chess.engine_pool import PooledEngine, get_engine_pool
 from baysed_chess.strategies.i_strategy import IStrategy
 
 
@@ -18,13 +19,17 @@ class StockfishStrategy(IStrategy):
         self.limit = chess.engine.Limit(depth=4)
 
     def __del__(self):
+        self.close()
+
+    def close(self) -> None:
         if self._stockfish is not None:
-            self._stockfish.quit()
+            self._stockfish.release()
+            self._stockfish = None
 
     @property
-    def stockfish(self) -> chess.engine.SimpleEngine:
+    def stockfish(self) -> PooledEngine:
         if self._stockfish is None:
-            self._stockfish = self.stockfish = chess.engine.SimpleEngine.popen_uci(self.path)
+            self._stockfish = self.stockfish = get_engine_pool().lease(self.path)
         return self._stockfish
 
     @stockfish.setter
@@ -0,0 +1,75 @@
+import chess
+import chess.engine
+
+from baysed_chess.stopping.all_policy import AllPolicy
+from baysed_chess.stopping.any_policy import AnyPolicy
+from baysed_chess.stopping.convergence_policy import ConvergencePolicy
+from baysed_chess.stopping.i_stopping_policy import IStoppingPolicy
+from baysed_chess.stopping.time_policy import TimePolicy
+
+
+def estimate_moves_to_go(board: chess.Board) -> int:
+    """
+    Estimate the number of moves we still have to play, from the game phase of PeSTO:
+    40 moves with all pieces on the board, down to 15 moves in a pawn endgame.
+    """
+    phase = (chess.popcount(board.knights | board.bishops) + 2 * chess.popcount(board.rooks)
+             + 4 * chess.popcount(board.queens))
+    return 15 + 25 * min(phase, 24) // 24
+
+
+class TimeManager:
+    """
+    Allocate the time of one move from the clock, and stop the search early once the best move clearly dominates,
+    i.e. P(best > second) of the Gaussians of the root's children exceeds `threshold`.
+    """
+
+    budget: float
+    """Seconds to search at most"""
+    min_time: float
+    """Seconds to search at least, before the search can stop early"""
+    threshold: float
+    """Stop early, once P(best > second) exceeds this probability"""
+    min_sigma: float
+    """Lower bound of the sigmas for P(best > second), see `ConvergencePolicy`"""
+
+    def __init__(self, budget: float, color: chess.Color, min_fraction: float = 0.2, threshold: float = 0.95,
+                 min_sigma: float = 20.0):
+        """
+        :param budget: seconds to search at most
+        :param color: the side to move
+        :param min_fraction: fraction of the budget to search at least
+        """
+        self.budget = budget
+        self.color = color
+        self.min_time = budget * min_fraction
+        self.threshold = threshold
+        self.min_sigma = min_sigma
+
+    @classmethod
+    def from_clock(cls, board: chess.Board, limit: chess.engine.Limit, overhead: float = 0.05,
+                   max_fraction: float = 0.25, default: float = 2.0, **kwargs) -> "TimeManager":
+        """
+        Allocate the time of the move from the clock and increment of the side to move in `limit`.
+        Without a clock, a fixed `limit.time` (or `default`) is the budget.
+        :param overhead: seconds to keep for finishing the search and sending the move
+        :param max_fraction: never spend more than this fraction of the remaining time on one move
+        :param kwargs: are passed to `TimeManager`
+        """
+        clock = limit.white_clock if board.turn == chess.WHITE else limit.black_clock
+        inc = (limit.white_inc if board.turn == chess.WHITE else limit.black_inc) or 0
+        if clock is None:
+            budget = (limit.time if limit.time is not None else default) - overhead
+        else:
+            moves_to_go = limit.remaining_moves or estimate_moves_to_go(board)
+            remaining = max(0.0, clock - overhead)
+            budget = min(remaining / moves_to_go + 0.75 * inc, max_fraction * remaining)
+        return cls(max(budget, 0.01), board.turn, **kwargs)
+
+    def policy(self) -> IStoppingPolicy:
+        """
+        Return the stopping policy: search for the budget, or stop after the minimal time once the best move dominates.
+        """
+        return AnyPolicy(TimePolicy(self.budget),
+                         AllPolicy(TimePolicy(self.min_time),
+                                   ConvergencePolicy(self.color, self.threshold, self.min_sigma)))
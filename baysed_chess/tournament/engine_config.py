@@ -0,0 +1,37 @@
+from dataclasses import dataclass, field
+
+from baysed_chess.engine_factory import EngineEnum, StrategyEnum
+from baysed_chess.limit import Limit
+
+
+@dataclass
+class EngineConfig:
+    """
+    An engine of a tournament: the engine, its strategy and its options, under a name of its own.
+    """
+    name: str
+    engine: EngineEnum
+    strategy: StrategyEnum
+    limit: Limit
+    rollout_depth: int = 4
+    options: dict = field(default_factory=dict)
+    """Additional keyword arguments for `EngineFactory.create_engine`, e.g. `workers`"""
+
+    SECONDS_PER_ROLLOUT_STEP = {StrategyEnum.Random: 2e-5, StrategyEnum.Pestos: 5e-5,
+                                StrategyEnum.RandomStockfish: 5e-4, StrategyEnum.Stockfish: 1e-3,
+                                StrategyEnum.Lc0: 5e-3}
+    """Rough cost of a rollout step of each strategy, only used to order the games of a tournament"""
+
+    @property
+    def engine_options(self) -> dict:
+        return {"rollout_depth": self.rollout_depth} | self.options
+
+    def cost(self) -> float:
+        """
+        Estimated seconds per move, from the time limit or from the node limit and the rollouts of the strategy.
+        """
+        if self.limit.time:
+            return self.limit.time
+        if self.limit.nodes:
+            return self.limit.nodes * self.rollout_depth * self.SECONDS_PER_ROLLOUT_STEP.get(self.strategy, 1e-3)
+        return 0.0
@@ -0,0 +1,60 @@
+import math
+from typing import TypedDict
+
+import numpy as np
+from scipy.stats import norm
+
+Rating = TypedDict('Rating', {"elo": float, "lower": float, "upper": float})
+
+
+def elo_ratings(points: np.ndarray, games: np.ndarray, prior: float = 2.0, confidence: float = 0.95,
+                iterations: int = 10_000, tolerance: float = 1e-10) -> list[Rating]:
+    """
+    Elo ratings of the players of a tournament, with the bounds of their confidence intervals.
+
+    Maximum likelihood of the Bradley-Terry model (logistic Elo), where a draw counts as half a win and half a loss.
+    Like BayesElo, `prior` virtual draws are added to every pairing that was played,
+    so a player who won all games gets a finite rating. The ratings have an average of 0.
+    The confidence intervals come from the curvature of the likelihood at its maximum (normal approximation).
+
+    :param points: points[i][j] is the number of points player i scored against player j
+    :param games: games[i][j] is the number of games between players i and j (symmetric)
+    :returns: rating of every player, players without games get a rating of 0 with infinite bounds
+    """
+    games = np.asarray(games, dtype=float)
+    points = np.asarray(points, dtype=float)
+    played = games > 0
+    n_games = games + prior * played
+    wins = (points + prior / 2 * played).sum(axis=1)
+    active = played.any(axis=1)
+
+    # minorization-maximization iterations of the Bradley-Terry strengths
+    gamma = np.ones(len(games))
+    for _ in range(iterations):
+        denominator = (n_games / (gamma[:, None] + gamma[None, :])).sum(axis=1)
+        new_gamma = np.where(active, wins / np.where(active, denominator, 1), 1.0)
+        new_gamma /= np.exp(np.log(new_gamma[active]).mean()) if active.any() else 1
+        converged = np.max(np.abs(new_gamma - gamma)) < tolerance
+        gamma = new_gamma
+        if converged:
+            break
+
+    theta = np.log(gamma)
+    p = gamma[:, None] / (gamma[:, None] + gamma[None, :])
+    information = n_games * p * p.T
+    hessian = np.diag(information.sum(axis=1)) - information
+    # the ratings are only defined up to a constant, the pseudo-inverse fixes their average
+    covariance = np.linalg.pinv(hessian)
+
+    scale = 400 / math.log(10)
+    z = norm.ppf((1 + confidence) / 2)
+    mean = theta[active].mean() if active.any() else 0.0
+    ratings = []
+    for i in range(len(games)):
+        if not active[i]:
+            ratings.append({"elo": 0.0, "lower": -math.inf, "upper": math.inf})
+            continue
+        elo = scale * (theta[i] - mean)
+        error = z * scale * math.sqrt(max(covariance[i, i], 0.0))
+        ratings.append({"elo": elo, "lower": elo - error, "upper": elo + error})
+    return ratings
@@ -0,0 +1,131 @@
+import multiprocessing as mp
+from enum import Enum
+from typing import Iterator
+
+import numpy as np
+
+from baysed_chess.matchmaker import Matchmaker, MatchResult
+from baysed_chess.opening_suite import OpeningSuite
+from baysed_chess.tournament.engine_config import EngineConfig
+from baysed_chess.tournament.ratings import Rating, elo_ratings
+
+
+class TournamentFormat(Enum):
+    RoundRobin = 0
+    """Every engine plays every other engine"""
+    Gauntlet = 1
+    """The first engine plays every other engine"""
+
+
+class Tournament:
+    """
+    Tournament of several engine configurations, all games are played on one process pool.
+    """
+
+    points: np.ndarray
+    """points[i][j] is the number of points engine i scored against engine j"""
+    games: np.ndarray
+    """games[i][j] is the number of games engines i and j played against each other"""
+
+    def __init__(self, configs: list[EngineConfig], tournament_format: TournamentFormat = TournamentFormat.RoundRobin,
+                 games_per_pairing: int = 2, stockfish_path: str = "", lc0_path: str = "", stockfish_elo: int = 1500,
+                 openings: OpeningSuite | None = None, worker_games: int = 0):
+        """
+        :param games_per_pairing: number of games of every pairing, see `Matchmaker` for the colors and openings
+        :param openings: if given, every pairing plays the openings of the suite as game pairs
+        :param worker_games: if > 0, the processes keep their engines between games, see `Matchmaker`
+        """
+        if len(configs) < 2:
+            raise ValueError("a tournament needs at least two engines")
+        if len({config.name for config in configs}) != len(configs):
+            raise ValueError("the names of the engines must be unique")
+
+        self.configs = configs
+        self.tournament_format = tournament_format
+        self.games_per_pairing = games_per_pairing
+        self.stockfish_path = stockfish_path
+        self.lc0_path = lc0_path
+        self.stockfish_elo = stockfish_elo
+        self.openings = openings
+        self.worker_games = worker_games
+        self.points = np.zeros((len(configs), len(configs)))
+        self.games = np.zeros((len(configs), len(configs)), dtype=int)
+
+    def pairings(self) -> list[tuple[int, int]]:
+        """
+        Indices of the engines of every pairing, engine A first.
+        """
+        n = len(self.configs)
+        if self.tournament_format == TournamentFormat.Gauntlet:
+            return [(0, j) for j in range(1, n)]
+        return [(i, j) for i in range(n) for j in range(i + 1, n)]
+
+    def _matchmaker(self, i: int, j: int) -> Matchmaker:
+        a = self.configs[i]
+        b = self.configs[j]
+        return Matchmaker(a.engine, a.strategy, b.engine, b.strategy, a.limit, self.stockfish_path, self.lc0_path,
+                          self.stockfish_elo, a.engine_options, b.engine_options, self.openings, b.limit,
+                          self.worker_games)
+
+    @property
+    def n_games(self) -> int:
+        return len(self.pairings()) * self.games_per_pairing
+
+    def run(self, proc: int = mp.cpu_count()) -> list[tuple[int, int, MatchResult]]:
+        """
+        Play all games of the tournament.
+        :returns: indices of engine A and B and the result of every game
+        """
+        return list(self.run_iter(proc))
+
+    def run_iter(self, proc: int = mp.cpu_count()) -> Iterator[tuple[int, int, MatchResult]]:
+        """
+        Like `run`, but yield every game as soon as it is finished, and update `points` and `games`.
+
+        The games of the pairings with the slowest engines (see `EngineConfig.cost`) are started first,
+        so that the pool does not wait for a few long games at the end.
+        """
+        tasks = []
+        for i, j in self.pairings():
+            cost = self.configs[i].cost() + self.configs[j].cost()
+            tasks += [(cost, i, j, arg) for arg in self._matchmaker(i, j).tasks(self.games_per_pairing)]
+        # stable, the games of a pair stay next to each other
+        tasks.sort(key=lambda task: -task[0])
+        tasks = [(i, j, arg) for _, i, j, arg in tasks]
+
+        proc = min(proc, mp.cpu_count())
+        Matchmaker._check_pool_engines([config.engine for config in self.configs], proc)
+        if proc > 1:
+            with mp.Pool(proc, initializer=Matchmaker._init_worker, maxtasksperchild=self.worker_games or None) as pool:
+                for i, j, result in pool.imap_unordered(Tournament._run_game, tasks):
+                    self._add(i, j, result)
+                    yield i, j, result
+                # let the workers exit normally, so they quit the engines of their engine pool
+                pool.close()
+                pool.join()
+            return
+
+        try:
+            for task in tasks:
+                i, j, result = Tournament._run_game(task)
+                self._add(i, j, result)
+                yield i, j, result
+        finally:
+            Matchmaker._close_worker_engines()
+
+    @staticmethod
+    def _run_game(task: tuple[int, int, tuple]) -> tuple[int, int, MatchResult]:
+        i, j, arg = task
+        return i, j, Matchmaker._run_single_match(arg)
+
+    def _add(self, i: int, j: int, result: MatchResult) -> None:
+        self.points[i][j] += result.score_a
+        self.points[j][i] += 1 - result.score_a
+        self.games[i][j] += 1
+        self.games[j][i] += 1
+
+    def ratings(self, prior: float = 2.0, confidence: float = 0.95) -> list[Rating]:
+        """
+        Elo ratings of the engines from the games played so far, see `elo_ratings`.
+        """
+        return elo_ratings(self.points, self.games, prior, confidence)
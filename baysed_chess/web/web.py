@@ -1,10 +1,12 @@
 import asyncio
 import os
+from typing import AsyncIterator
 
 import aiohttp
 import chess
 from aiohttp import web
 
+from baysed_chess.engine.async_bayes_mcts_engine import AsyncBayesMctsEngine
 from baysed_chess.engine_factory import EngineFactory
 from baysed_chess.limit import Limit
 
@@ -38,6 +40,20 @@ class Simulate:
             yield board
             is_white_playing = not is_white_playing
 
+    async def run_async(self, limit: Limit) -> AsyncIterator[chess.Board]:
+        """
+        Same as `run`, but awaits the moves of the engines, see `IEngine.play_async`.
+        """
+        board = chess.Board()
+
+        is_white_playing = True
+        while not board.is_game_over():
+            engine = self.white if is_white_playing else self.black
+            play_result = await engine.play_async(board, limit)
+            board.push(play_result.move)
+            yield board
+            is_white_playing = not is_white_playing
+
 
 class WebInterface:
     def __init__(self, white_engine, black_engine, strategy1, strategy2, stockfish_path, lc0_path, limit: Limit,
@@ -75,15 +91,13 @@ class WebInterface:
                                                 self.lc0_path, self.stockfish_elo)
             black = EngineFactory.create_engine(self.black, self.strategy2, chess.BLACK, self.stockfish_path,
                                                 self.lc0_path, self.stockfish_elo)
-            runner = Simulate(white, black).run(self.limit)
-
-            def sim():
-                return next(runner, None)
-
-            board = await asyncio.to_thread(sim)
-            while board is not None:
+            async for board in Simulate(white, black).run_async(self.limit):
                 await ws.send_str(board.fen())
-                board = await asyncio.to_thread(sim)
+
+            # the engine processes of asynchronous engines belong to this event loop
+            for engine in (white, black):
+                if isinstance(engine, AsyncBayesMctsEngine):
+                    await engine.close_async()
 
         async with asyncio.TaskGroup() as tg:
             tg.create_task(wait_msg())
@@ -15,6 +15,7 @@ import chess
 from chess.engine import PlayResult, Limit
 
 import baysed_chess.limit
+from baysed_chess.time_manager import TimeManager
 from baysed_chess.engine_factory import EngineFactory, EngineEnum, StrategyEnum
 from lib.engine_wrapper import MinimalEngine, MOVE, COMMANDS_TYPE, OPTIONS_TYPE
 from lib.config import Configuration
@@ -121,6 +122,12 @@ class BayesianMctsEngine(MinimalEngine):
         """
         super().__init__(commands, options, stderr, draw_or_resign, name, **popen_args)
         self._engine = None
+        self._can_ponder = False
+        # `homemade_options` of the config, see config.yml.example
+        self.async_rollouts = bool(options.get("async_rollouts", False))
+        self.workers = int(options.get("workers", 4))
+        self.eval_cache_dir = options.get("eval_cache_dir")
+        self.eval_cache_size = int(options.get("eval_cache_size", 1_000_000 if self.eval_cache_dir else 0))
 
     def get_engine(self, color: chess.Color) -> chess.engine:
         # NOTE: the paths here are from the perspective of the file 'lichess-bot.py'
@@ -132,15 +139,55 @@ class BayesianMctsEngine(MinimalEngine):
             lc0_path = "../lc0/lc0"
 
         if self._engine is None:
+            # optionally asynchronous rollouts on `workers` stockfish instances, on an event loop owned by the engine
+            # with an `eval_cache_dir`, the evaluation cache is saved on exit, so it is warm after a restart of the bot
             self._engine = EngineFactory.create_engine(
-                EngineEnum.BayesianMcts,
+                EngineEnum.BayesianMctsAsync if self.async_rollouts else EngineEnum.BayesianMcts,
                 StrategyEnum.Stockfish,
-                color, stockfish_path, lc0_path, 1500, 4)
+                color, stockfish_path, lc0_path, 1500, 4, workers=self.workers,
+                eval_cache_size=self.eval_cache_size, eval_cache_dir=self.eval_cache_dir)
 
         return self._engine
 
+    def quit(self) -> None:
+        """Quit the stockfish instances of the rollouts."""
+        if self._engine is not None:
+            self._engine.close()
+            self._engine = None
+
+    def play_move(self, board: chess.Board, *args: Any, **kwargs: Any) -> None:
+        """
+        Stop pondering, play a move, and ponder on the tree of our move until the opponent's move arrives.
+        The next `search` applies the opponent's move, so the engine keeps the samples of its subtree.
+        """
+        if self._engine is not None:
+            self._engine.stop_pondering()
+        self._can_ponder = False
+        super().play_move(board, *args, **kwargs)
+        if self._can_ponder and self._engine is not None:
+            # the move was sent
+            self._engine.start_pondering()
+
     def search(self, board: chess.Board, time_limit: chess.engine.Limit, ponder: bool, draw_offered: bool,
                root_moves: MOVE) -> chess.engine.PlayResult:
         my_engine = self.get_engine(board.turn)
-        r = my_engine.play(board.copy(), baysed_chess.limit.Limit(2))
+        # allocate the time from the clock, and stop early once the best move dominates
+        time_manager = TimeManager.from_clock(board, time_limit)
+        limit = baysed_chess.limit.Limit(time_manager=time_manager)
+        r = my_engine.play(board.copy(), limit)
+        logger.info(f"Searched {time_manager.budget:.2f}s at most, stopped at {limit.stop_reason}")
+        self._can_ponder = ponder
         return r
+
+    def get_stats(self, for_chat: bool = False) -> list[str]:
+        """Get the stats of the last move, and the hit rate and the gained nodes of pondering."""
+        stats = super().get_stats(for_chat)
+        if for_chat or self._engine is None or not self._engine.ponder_gains:
+            return stats
+
+        ponders = len(self._engine.ponder_gains)
+        hit_rate = self._engine.ponder_hits / ponders
+        gained = sum(self._engine.ponder_gains)
+        stats.append(f"Ponder hits: {self._engine.ponder_hits}/{ponders} ({hit_rate:.0%})")
+        stats.append(f"Ponder nodes: {sum(self._engine.ponder_nodes)} ({gained} kept)")
+        return stats
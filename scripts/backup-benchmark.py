@@ -0,0 +1,45 @@
+import random
+import timeit
+
+import numpy as np
+
+from baysed_chess.mcts.gaussian_utils import max_gaussian, max_gaussians
+
+
+def pairwise_backup(mus: list[float], sigmas: list[float], random_state: random.Random) -> tuple[float, float]:
+    """
+    The previous backup of `BayesianMctsNode`: fold `max_gaussian` over the shuffled children.
+    """
+    order = random_state.sample(range(len(mus)), len(mus))
+    mu, sigma = mus[order[0]], sigmas[order[0]]
+    for i in order[1:]:
+        mu, sigma = max_gaussian(mu, sigma, mus[i], sigmas[i])
+    return mu, sigma
+
+
+def main():
+    rng = np.random.default_rng(0)
+    random_state = random.Random(0)
+    repetitions = 200
+
+    print(f"{'children':>8} {'pairwise [us]':>14} {'vectorized [us]':>16} {'mc mu':>9} {'pairwise mu':>12} "
+          f"{'vectorized mu':>14} {'mc sigma':>9} {'pairwise sigma':>15} {'vectorized sigma':>17}")
+    for n in (20, 40, 80):
+        mus = rng.normal(0, 3, n)
+        sigmas = rng.uniform(0.5, 3, n)
+        mu_list, sigma_list = mus.tolist(), sigmas.tolist()
+
+        t_pairwise = timeit.timeit(lambda: pairwise_backup(mu_list, sigma_list, random_state), number=repetitions)
+        t_vectorized = timeit.timeit(lambda: max_gaussians(mus, sigmas), number=repetitions)
+
+        samples = rng.normal(mus, sigmas, (200_000, n)).max(axis=1)
+        mu_p, sigma_p = pairwise_backup(mu_list, sigma_list, random_state)
+        mu_v, sigma_v = max_gaussians(mus, sigmas)
+
+        print(f"{n:>8} {t_pairwise / repetitions * 1e6:>14.1f} {t_vectorized / repetitions * 1e6:>16.1f} "
+              f"{samples.mean():>9.3f} {mu_p:>12.3f} {mu_v:>14.3f} "
+              f"{samples.std():>9.3f} {sigma_p:>15.3f} {sigma_v:>17.3f}")
+
+
+if __name__ == '__main__':
+    main()
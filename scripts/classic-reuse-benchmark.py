@@ -0,0 +1,43 @@
+import argparse
+
+from baysed_chess.engine_factory import EngineEnum, StrategyEnum
+from baysed_chess.limit import Limit
+from baysed_chess.matchmaker import Matchmaker, Winner
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tree reuse and pondering of the Classic MCTS engine, "
+                                                 "each played against the engine without them")
+    parser.add_argument("--games", default=20, type=int, help="Number of games per configuration, default=20")
+    parser.add_argument("--time", default=0.05, type=float, help="Seconds per move, default=0.05")
+    parser.add_argument("--proc", default=4, type=int, help="Number of games played in parallel, default=4")
+    args = parser.parse_args()
+
+    configurations = (
+        ("reuse", {"tree_reuse": True}, {"tree_reuse": False}),
+        ("reuse + ponder", {"tree_reuse": True, "ponder": True}, {"tree_reuse": False}),
+        ("ponder vs reuse", {"tree_reuse": True, "ponder": True}, {"tree_reuse": True}),
+    )
+    print(f"{'engine A vs B':>16} {'A wins':>7} {'draws':>6} {'B wins':>7} {'A nodes':>8} {'B nodes':>8} "
+          f"{'A retained':>11} {'B retained':>11} {'A pondered':>11}")
+    for name, options_a, options_b in configurations:
+        m = Matchmaker(EngineEnum.ClassicMcts, StrategyEnum.Random, EngineEnum.ClassicMcts, StrategyEnum.Random,
+                       Limit(time=args.time), "", "", 0, options_a, options_b)
+        results = m.run(args.games, args.proc)
+
+        def average(stat: str, engine_a: bool) -> float:
+            # the colors are assigned randomly
+            values = [getattr(r.statistics, f"{stat}_white" if r.engine_a_white == engine_a else f"{stat}_black")
+                      for r in results]
+            return sum(values) / len(values) if values else 0
+
+        a_wins = sum(r.winner == Winner.Engine_A for r in results)
+        b_wins = sum(r.winner == Winner.Engine_B for r in results)
+        draws = sum(r.winner == Winner.Draw for r in results)
+        print(f"{name:>16} {a_wins:>7} {draws:>6} {b_wins:>7} {average('nodes', True):>8.0f} "
+              f"{average('nodes', False):>8.0f} {average('retained_nodes', True):>11.0f} "
+              f"{average('retained_nodes', False):>11.0f} {average('ponder_nodes', True):>11.0f}")
+
+
+if __name__ == '__main__':
+    main()
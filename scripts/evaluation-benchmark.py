@@ -0,0 +1,57 @@
+import argparse
+import random
+import time
+
+import chess
+
+from baysed_chess.board_evaluations.evaluate_michniewsk import score_michniewsk, score_michniewsk_batch
+from baysed_chess.board_evaluations.evaluate_pestos import score_pestos, score_pestos_batch
+
+
+def random_positions(n: int, seed: int) -> list[chess.Board]:
+    """
+    Positions of random games, from the opening to the endgame.
+    """
+    random_state = random.Random(seed)
+    positions = []
+    while len(positions) < n:
+        board = chess.Board()
+        while not board.is_game_over() and len(positions) < n:
+            board.push(random_state.choice(list(board.legal_moves)))
+            positions.append(board.copy())
+    return positions
+
+
+def children(board: chess.Board) -> list[chess.Board]:
+    result = []
+    for move in board.legal_moves:
+        child = board.copy(stack=False)
+        child.push(move)
+        result.append(child)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare scoring the children of a node board by board and batched")
+    parser.add_argument("--positions", default=1000, type=int)
+    parser.add_argument("--seed", default=0, type=int)
+    args = parser.parse_args()
+
+    nodes = [children(b) for b in random_positions(args.positions, args.seed) if not b.is_game_over()]
+    n = sum(len(c) for c in nodes)
+    print(f"{n} children of {len(nodes)} positions")
+    print(f"{'':>22} {'boards/s':>10} {'batch boards/s':>15} {'identical':>10}")
+    for name, score, score_batch in (("score_michniewsk", score_michniewsk, score_michniewsk_batch),
+                                     ("score_pestos", score_pestos, score_pestos_batch)):
+        start = time.perf_counter()
+        expected = [[score(b) for b in c] for c in nodes]
+        t_single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = [score_batch(c).tolist() for c in nodes]
+        t_batch = time.perf_counter() - start
+        print(f"{name:>22} {n / t_single:>10.0f} {n / t_batch:>15.0f} {str(expected == actual):>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import random
+import time
+import tracemalloc
+
+import chess
+
+from baysed_chess.mcts.baysian_mcts import BayesianMcts
+from baysed_chess.mcts.baysian_mcts_node import BayesianMctsNode
+from baysed_chess.strategies.pesto_strategy import PestoStrategy
+from baysed_chess.strategies.random_strategy import RandomStrategy
+
+MIDDLEGAME_FEN = "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N2N2/PP2BPPP/R2QKB1R w KQ - 0 9"
+
+
+def count_nodes(node: BayesianMctsNode) -> tuple[int, int]:
+    """
+    :return: number of nodes below and including `node`, and how many of them hold a board
+    """
+    nodes, boards = 1, int(node.is_materialized)
+    for c in node.children:
+        n, b = count_nodes(c)
+        nodes += n
+        boards += b
+    return nodes, boards
+
+
+def search(fen: str, strategy: str, samples: int, seed: int, seed_priors: bool) -> BayesianMcts:
+    board = chess.Board(fen)
+    rollout_strategy = RandomStrategy(random.Random(seed)) if strategy == "Random" else PestoStrategy()
+    mcts = BayesianMcts(board, rollout_strategy, board.turn, seed, seed_priors=seed_priors)
+    mcts.sample(samples)
+    return mcts
+
+
+def run(fen: str, strategy: str, samples: int, seed: int, seed_priors: bool) -> tuple[int, int, float, int, int]:
+    """
+    Sample a fresh tree `samples` times, once timed and once with traced allocations.
+    :return: number of nodes, number of boards, elapsed seconds, live allocations and bytes of the tree
+    """
+    start = time.perf_counter()
+    search(fen, strategy, samples, seed, seed_priors)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    mcts = search(fen, strategy, samples, seed, seed_priors)
+    stats = tracemalloc.take_snapshot().compare_to(before, "filename")
+    tracemalloc.stop()
+
+    blocks = sum(s.count_diff for s in stats)
+    allocated = sum(s.size_diff for s in stats)
+    nodes, boards = count_nodes(mcts.root)
+    return nodes, boards, elapsed, blocks, allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nodes/s and allocations of the Bayesian MCTS tree expansion")
+    parser.add_argument("--samples", default=2000, type=int, help="Number of samples per run, default=2000")
+    parser.add_argument("--strategy", default="Random", choices=["Random", "PESTO"])
+    parser.add_argument("--seed", default=0, type=int)
+    args = parser.parse_args()
+
+    print(f"{'position':>10} {'priors':>7} {'nodes':>7} {'boards':>7} {'nodes/s':>9} {'samples/s':>10} "
+          f"{'allocations':>12} {'bytes/node':>11}")
+    for name, fen in (("opening", chess.STARTING_FEN), ("middlegame", MIDDLEGAME_FEN)):
+        for seed_priors in (False, True):
+            nodes, boards, elapsed, blocks, allocated = run(fen, args.strategy, args.samples, args.seed, seed_priors)
+            print(f"{name:>10} {str(seed_priors):>7} {nodes:>7} {boards:>7} {nodes / elapsed:>9.0f} "
+                  f"{args.samples / elapsed:>10.1f} {blocks:>12} {allocated / nodes:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
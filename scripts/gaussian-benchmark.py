@@ -0,0 +1,133 @@
+import math
+import random
+import statistics
+import subprocess
+import sys
+import timeit
+from functools import cache
+
+from baysed_chess.mcts.gaussian_utils import AlphaTable, calc_cdf, max_gaussian, min_gaussian
+
+
+def startup_time(code: str, repetitions: int = 5) -> float:
+    """
+    Median wall-clock time of a fresh interpreter that executes `code`.
+    """
+    times = []
+    for _ in range(repetitions):
+        setup = "import time; start = time.perf_counter()\n"
+        report = "\nprint(time.perf_counter() - start)"
+        out = subprocess.run([sys.executable, "-c", setup + code + report], capture_output=True, text=True, check=True)
+        times.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def torch_reference():
+    """
+    The torch based implementation that `gaussian_utils` used before, or None if torch is not installed.
+    """
+    try:
+        import torch
+        import torch.distributions as dist
+    except ImportError:
+        return None
+
+    def torch_calc_cdf(alpha: float) -> tuple[float, float, float]:
+        normal = dist.Normal(0, 1)
+        cdf_alpha = normal.cdf(torch.tensor(alpha)).item()
+        pdf_alpha = torch.exp(normal.log_prob(torch.tensor(alpha))).item()
+        f1 = alpha * cdf_alpha + pdf_alpha
+        f2 = alpha ** 2 * cdf_alpha * (1 - cdf_alpha) + (1 - 2 * cdf_alpha) * alpha * pdf_alpha - pdf_alpha ** 2
+        return cdf_alpha, f1, f2
+
+    def torch_min_gaussian(mu1, sigma1, mu2, sigma2) -> tuple[float, float]:
+        normal = dist.Normal(0, 1)
+        sigma_m = math.sqrt(sigma1 ** 2 + sigma2 ** 2)
+        alpha = (mu1 - mu2) / sigma_m
+        cdf_alpha = normal.cdf(torch.tensor(alpha)).item()
+        pdf_alpha = torch.exp(normal.log_prob(torch.tensor(alpha))).item()
+        pdf_alpha_neg = torch.exp(normal.log_prob(torch.tensor(-alpha))).item()
+        mu = mu1 * (1 - cdf_alpha) + mu2 * cdf_alpha - pdf_alpha_neg * sigma_m
+        sigma = math.sqrt((mu1 ** 2 + sigma1 ** 2) * (1 - cdf_alpha) + (mu2 ** 2 + sigma2 ** 2) * cdf_alpha - (
+                mu1 + mu2) * sigma_m * pdf_alpha - mu ** 2)
+        return mu, sigma
+
+    return torch_calc_cdf, torch_min_gaussian
+
+
+def exact_max_gaussian(mu1, sigma1, mu2, sigma2) -> tuple[float, float]:
+    sigma_m = math.sqrt(sigma1 ** 2 + sigma2 ** 2)
+    cdf_alpha, f1_alpha, f2_alpha = calc_cdf((mu1 - mu2) / sigma_m)
+    mu = mu2 + sigma_m * f1_alpha
+    return mu, math.sqrt(max(sigma2 ** 2 + (sigma1 ** 2 - sigma2 ** 2) * cdf_alpha + sigma_m ** 2 * f2_alpha, 0.0))
+
+
+cached_calc_cdf = cache(calc_cdf)
+
+
+def rounded_max_gaussian(mu1, sigma1, mu2, sigma2) -> tuple[float, float]:
+    """
+    The previous `max_gaussian`: alpha rounded to two decimals and `calc_cdf` memoized.
+    """
+    sigma_m = math.sqrt(sigma1 ** 2 + sigma2 ** 2)
+    cdf_alpha, f1_alpha, f2_alpha = cached_calc_cdf(round((mu1 - mu2) / sigma_m, 2))
+    mu = mu2 + sigma_m * f1_alpha
+    return mu, math.sqrt(max(sigma2 ** 2 + (sigma1 ** 2 - sigma2 ** 2) * cdf_alpha + sigma_m ** 2 * f2_alpha, 0.0))
+
+
+def alpha_table_benchmark():
+    random_state = random.Random(0)
+    pairs = [(random_state.gauss(0, 5), random_state.uniform(0.5, 3), random_state.gauss(0, 5),
+              random_state.uniform(0.5, 3)) for _ in range(20_000)]
+
+    print(f"{'max_gaussian':>26} {'us/call':>8} {'max. error mu':>14} {'max. error sigma':>17}")
+    implementations = [("exact (math.erf)", exact_max_gaussian),
+                       ("rounded alpha + cache", rounded_max_gaussian),
+                       ("interpolated table", max_gaussian)]
+    for name, func in implementations:
+        seconds = timeit.timeit(lambda: [func(*p) for p in pairs], number=5) / (5 * len(pairs))
+        error_mu = max(abs(func(*p)[0] - exact_max_gaussian(*p)[0]) for p in pairs)
+        error_sigma = max(abs(func(*p)[1] - exact_max_gaussian(*p)[1]) for p in pairs)
+        print(f"{name:>26} {seconds * 1e6:>8.3f} {error_mu:>14.2e} {error_sigma:>17.2e}")
+
+    table = AlphaTable(count=True)
+    for p in pairs:
+        table.max_gaussian(*p)
+    print(f"counted table: {table.lookups} lookups, {table.saturated} outside of +-{table.alpha_max}")
+
+
+def main():
+    print("Startup (median of 5 fresh interpreters):")
+    engine_import = startup_time("import baysed_chess.engine_factory")
+    print(f"  import baysed_chess.engine_factory:         {engine_import:.3f} s")
+
+    reference = torch_reference()
+    if reference is not None:
+        torch_import = startup_time("import torch.distributions\nimport baysed_chess.engine_factory")
+        print(f"  ... plus torch, as before the change:       {torch_import:.3f} s")
+
+    print()
+    print("Per call (mean of 20000 calls):")
+    n = 20_000
+    closed_cdf = timeit.timeit(lambda: calc_cdf(0.37), number=n) / n
+    closed_min = timeit.timeit(lambda: min_gaussian(1.0, 2.0, 1.5, 0.5), number=n) / n
+    print(f"  calc_cdf, math.erf:               {closed_cdf * 1e6:8.2f} us")
+    print(f"  min_gaussian, table:              {closed_min * 1e6:8.2f} us")
+
+    if reference is not None:
+        torch_calc_cdf, torch_min_gaussian = reference
+        torch_cdf = timeit.timeit(lambda: torch_calc_cdf(0.37), number=n) / n
+        torch_min = timeit.timeit(lambda: torch_min_gaussian(1.0, 2.0, 1.5, 0.5), number=n) / n
+        print(f"  calc_cdf, torch:                  {torch_cdf * 1e6:8.2f} us")
+        print(f"  min_gaussian, torch:              {torch_min * 1e6:8.2f} us")
+
+        error_cdf = max(abs(a - b) for x in range(-600, 601)
+                        for a, b in zip(calc_cdf(x / 100), torch_calc_cdf(x / 100)))
+        print(f"  max. difference of calc_cdf to torch on [-6, 6]: {error_cdf:.2e}")
+
+    print()
+    alpha_table_benchmark()
+
+
+if __name__ == '__main__':
+    main()
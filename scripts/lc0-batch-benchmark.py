@@ -0,0 +1,61 @@
+import argparse
+import random
+import time
+
+import chess
+
+from baysed_chess.board_evaluations.evaluate_lc0 import score_lc0, score_lc0_batch
+from baysed_chess.engine_pool import close_engine_pool, get_engine_pool
+
+
+def random_positions(n: int, seed: int) -> list[chess.Board]:
+    """
+    Positions of random games, from the opening to the endgame.
+    """
+    random_state = random.Random(seed)
+    positions = []
+    while len(positions) < n:
+        board = chess.Board()
+        while not board.is_game_over() and len(positions) < n:
+            board.push(random_state.choice(list(board.legal_moves)))
+            positions.append(board.copy())
+    return positions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Positions per second of lc0, board by board and batched")
+    parser.add_argument("--lc0_path", default="../lc0/lc0")
+    parser.add_argument("--positions", default=256, type=int)
+    parser.add_argument("--batch_sizes", default=[1, 8, 32, 128], type=int, nargs="+")
+    parser.add_argument("--instances", default=[1, 2, 4], type=int, nargs="+")
+    parser.add_argument("--seed", default=0, type=int)
+    args = parser.parse_args()
+
+    boards = random_positions(args.positions, args.seed)
+    pool = get_engine_pool()
+    lc0s = [pool.lease(args.lc0_path) for _ in range(max(args.instances))]
+    try:
+        # warm up every instance, e.g. loading the network
+        score_lc0_batch(boards[:len(lc0s)], lc0s)
+
+        start = time.perf_counter()
+        expected = [score_lc0(b, lc0s[0]) for b in boards]
+        print(f"score_lc0: {len(boards) / (time.perf_counter() - start):.0f} positions/s")
+
+        print(f"{'instances':>10} {'batch size':>11} {'positions/s':>12} {'identical':>10}")
+        for instances in args.instances:
+            for batch_size in args.batch_sizes:
+                start = time.perf_counter()
+                actual = []
+                for i in range(0, len(boards), batch_size):
+                    actual += score_lc0_batch(boards[i:i + batch_size], lc0s[:instances])
+                elapsed = time.perf_counter() - start
+                print(f"{instances:>10} {batch_size:>11} {len(boards) / elapsed:>12.0f} {str(expected == actual):>10}")
+    finally:
+        for lc0 in lc0s:
+            lc0.release()
+        close_engine_pool()
+
+
+if __name__ == '__main__':
+    main()
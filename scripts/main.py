@@ -1,9 +1,34 @@
+from baysed_chess.engine_pool import close_engine_pool
 from baysed_chess.hypothesis_test import hypothesis_test
 from baysed_chess.limit import Limit
-from baysed_chess.matchmaker import Matchmaker, Winner
+from baysed_chess.matchmaker import Matchmaker, MatchResult, MatchTally
+from baysed_chess.opening_suite import OpeningSuite
+from baysed_chess.results_log import ResultsLog
+from baysed_chess.sprt import SprtResult, elo_estimate, elo_estimate_pentanomial, sprt, sprt_pentanomial
 from utils.read_arguments import read_arguments
 
 
+def print_statistics(r: MatchResult) -> None:
+    stats = r.statistics
+    print("====================================")
+    print(f"Game length: {stats.length} moves")
+    print(f"{stats.white} (White):")
+    print(f"Average node count: {stats.nodes_white}")
+    print(f"Average simulation time: {stats.average_time_white}")
+    print(f"Nodes saved by transpositions: {stats.transposition_hits_white}")
+    print(f"Average nodes retained from previous moves: {stats.retained_nodes_white}")
+    print(f"Average nodes searched while pondering: {stats.ponder_nodes_white}")
+    print()
+    print(f"{stats.black} (Black):")
+    print(f"Average node count: {stats.nodes_black}")
+    print(f"Average simulation time: {stats.average_time_black}")
+    print(f"Nodes saved by transpositions: {stats.transposition_hits_black}")
+    print(f"Average nodes retained from previous moves: {stats.retained_nodes_black}")
+    print(f"Average nodes searched while pondering: {stats.ponder_nodes_black}")
+    print("====================================")
+    print()
+
+
 def main():
     args = read_arguments()
     a = args.get("engine1")
@@ -17,30 +42,74 @@ def main():
     stockfish_path = args.get("stockfish_path")
     lc0_path = args.get("lc0_path")
     stockfish_elo = args.get("stockfish_elo")
+    workers = args.get("workers")
+    batch_size = args.get("batch_size")
+    tt_size1 = args.get("tt_size1")
+    tt_size2 = args.get("tt_size2")
+    eval_cache_size = args.get("eval_cache_size")
+    eval_cache_dir = args.get("eval_cache_dir")
+    seed_priors = args.get("seed_priors")
+    pipeline_depth = args.get("pipeline_depth")
+    lc0_instances = args.get("lc0_instances")
+    ponder1 = args.get("ponder1")
+    ponder2 = args.get("ponder2")
+    results_log = args.get("results_log")
+    openings_path = args.get("openings")
+    worker_games = args.get("worker_games")
+    use_sprt = args.get("sprt")
+    sprt_args = {"elo0": args.get("elo0"), "elo1": args.get("elo1"), "alpha": args.get("alpha"),
+                 "beta": args.get("beta")}
 
     limit = Limit(time=time_limit) if time_limit != -1 else Limit(nodes=nodes_limit)
 
-    m = Matchmaker(a, s1, b, s2, limit, stockfish_path, lc0_path, stockfish_elo)
-    results = m.run(n, proc)
+    options = {"workers": workers, "batch_size": batch_size, "eval_cache_size": eval_cache_size,
+               "eval_cache_dir": eval_cache_dir, "seed_priors": seed_priors, "pipeline_depth": pipeline_depth,
+               "lc0_instances": lc0_instances}
+    options_a = options | {"transposition_table_size": tt_size1, "ponder": ponder1}
+    options_b = options | {"transposition_table_size": tt_size2, "ponder": ponder2}
 
-    for r in results:
-        stats = r.statistics
-        print("====================================")
-        print(f"Game length: {stats.length} moves")
-        print(f"{stats.white} (White):")
-        print(f"Average node count: {stats.nodes_white}")
-        print(f"Average simulation time: {stats.average_time_white}")
-        print()
-        print(f"{stats.black} (Black):")
-        print(f"Average node count: {stats.nodes_black}")
-        print(f"Average simulation time: {stats.average_time_black}")
-        print("====================================")
+    openings = OpeningSuite.load(openings_path) if openings_path is not None else None
+    m = Matchmaker(a, s1, b, s2, limit, stockfish_path, lc0_path, stockfish_elo, options_a, options_b, openings,
+                   worker_games=worker_games)
+
+    def run_sprt(t: MatchTally) -> SprtResult:
+        # with an opening suite, count the finished game pairs (pentanomial model)
+        if openings is not None:
+            return sprt_pentanomial(t.pairs, **sprt_args)
+        return sprt(t.a_wins, t.draws, t.b_wins, **sprt_args)
+
+    log = ResultsLog(results_log) if results_log is not None else None
+    tally = MatchTally()
+    llrs = []
+    sprt_result = None
+    played = set()
+    for r in (log.load() if log is not None else []):
+        played.add(r.game)
+        tally.add(r)
+        if use_sprt:
+            sprt_result = run_sprt(tally)
+            llrs.append(sprt_result["llr"])
+    if tally.games > 0:
+        print(f"Resuming from {results_log}: {tally}")
+
+    n_games = 0 if sprt_result is not None and sprt_result["decision"] is not None else n
+    for r in m.run_iter(n_games, proc, log, played):
+        tally.add(r)
+        print_statistics(r)
+        print(tally)
+        if use_sprt:
+            sprt_result = run_sprt(tally)
+            llrs.append(sprt_result["llr"])
+            print(f"SPRT: llr={sprt_result['llr']:.3f} [{sprt_result['lower']:.3f}, {sprt_result['upper']:.3f}]")
         print()
+        if sprt_result is not None and sprt_result["decision"] is not None:
+            # stops the outstanding games
+            break
 
-    games_played = len(results)
-    a_wins = len(list(filter(lambda x: x.winner == Winner.Engine_A, results)))
-    b_wins = len(list(filter(lambda x: x.winner == Winner.Engine_B, results)))
-    draws = len(list(filter(lambda x: x.winner == Winner.Draw, results)))
+    games_played = tally.games
+    a_wins = tally.a_wins
+    b_wins = tally.b_wins
+    draws = tally.draws
 
     alpha = 0.001
     test_result = hypothesis_test(a_wins, draws, b_wins)
@@ -53,12 +122,22 @@ def main():
     print(f"Hypothesis test: trials={test_result['trials']}, pvalue={test_result['pvalue']:2.10f}, "
           f"statistic={test_result['statistic']:2.4f}, reject_h0={reject_h0}")
 
+    if openings is not None:
+        print(f"{sum(tally.pairs)} game pairs, engine {a} scored 0, 0.5, 1, 1.5, 2 points in {tally.pairs} of them")
+        elo = elo_estimate_pentanomial(tally.pairs)
+    else:
+        elo = elo_estimate(a_wins, draws, b_wins)
+    print(f"Elo difference: {elo['elo']:.1f} (95% confidence interval [{elo['lower']:.1f}, {elo['upper']:.1f}])")
+    if use_sprt:
+        decision = {"H0": f"accepted H0 (elo={sprt_args['elo0']})", "H1": f"accepted H1 (elo={sprt_args['elo1']})",
+                    None: "undecided"}[sprt_result["decision"]]
+        print(f"SPRT: {decision}, llr={sprt_result['llr']:.3f} "
+              f"[{sprt_result['lower']:.3f}, {sprt_result['upper']:.3f}]")
+        print(f"LLR trajectory: {', '.join(f'{llr:.2f}' for llr in llrs)}")
+
 
 if __name__ == '__main__':
     main()
 
-    # Note: prevent endless wait on StockFish process
-    # by allowing for cleanup of objects (which closes stockfish)
-    import gc
-
-    gc.collect()
+    # quit the engine processes of this process, instead of waiting for their cleanup at exit
+    close_engine_pool()
@@ -0,0 +1,100 @@
+import argparse
+import random
+import time
+
+import chess
+
+from baysed_chess.board_evaluations.evaluate_pestos import score_pestos
+from baysed_chess.board_evaluations.incremental_pestos import IncrementalPesto
+from baysed_chess.strategies.pesto_strategy import PestoStrategy
+
+
+def random_positions(n: int, seed: int) -> list[chess.Board]:
+    """
+    Positions of random games, from the opening to the endgame.
+    """
+    random_state = random.Random(seed)
+    positions = []
+    while len(positions) < n:
+        board = chess.Board()
+        while not board.is_game_over() and len(positions) < n:
+            board.push(random_state.choice(list(board.legal_moves)))
+            positions.append(board.copy())
+    return positions
+
+
+def previous_pick_next_move(board: chess.Board) -> chess.Move:
+    """
+    The previous `PestoStrategy.pick_next_move`: copy the board and score it from scratch for every legal move.
+    """
+    def score_move(move: chess.Move):
+        bc = board.copy(stack=False)
+        bc.push(move)
+        return move, score_pestos(bc)
+
+    moves = [score_move(move) for move in board.legal_moves]
+    if board.turn != chess.WHITE:
+        best_move = max(moves, key=lambda m: m[1])
+    else:
+        best_move = min(moves, key=lambda m: m[1])
+    return best_move[0]
+
+
+def rollout(board: chess.Board, pick, depth: int) -> chess.Board:
+    board = board.copy()
+    for _ in range(depth):
+        if board.is_game_over():
+            break
+        board.push(pick(board))
+    return board
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the PeSTO evaluation from scratch and the incremental one")
+    parser.add_argument("--positions", default=2000, type=int)
+    parser.add_argument("--seed", default=0, type=int)
+    args = parser.parse_args()
+
+    positions = [b for b in random_positions(args.positions, args.seed) if not b.is_game_over()]
+    candidates = [(b, m) for b in positions for m in b.legal_moves]
+
+    # scores of all candidate moves: from scratch on a copy, versus the delta of the move
+    start = time.perf_counter()
+    expected = []
+    for b, m in candidates:
+        bc = b.copy(stack=False)
+        bc.push(m)
+        expected.append(score_pestos(bc))
+    t_scratch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = []
+    for b in positions:
+        evaluation = IncrementalPesto(b)
+        actual.extend(evaluation.score_move(b, m) for m in b.legal_moves)
+    t_incremental = time.perf_counter() - start
+
+    print(f"{len(candidates)} candidate moves in {len(positions)} positions, identical scores: {expected == actual}")
+    print(f"{'':>22} {'evals/s':>10}")
+    print(f"{'score_pestos':>22} {len(candidates) / t_scratch:>10.0f}")
+    print(f"{'IncrementalPesto':>22} {len(candidates) / t_incremental:>10.0f}")
+
+    # rollouts of depth 4 with the previous and the current PestoStrategy
+    strategy = PestoStrategy()
+    roots = positions[:200]
+    start = time.perf_counter()
+    previous = [rollout(b, previous_pick_next_move, 4) for b in roots]
+    t_previous = time.perf_counter() - start
+    start = time.perf_counter()
+    current = [rollout(b, strategy.pick_next_move, 4) for b in roots]
+    t_current = time.perf_counter() - start
+    same = [b.fen() for b in previous] == [b.fen() for b in current]
+    print()
+    print(f"{len(roots)} rollouts of depth 4, identical moves: {same}")
+    print(f"{'':>22} {'rollouts/s':>10}")
+    print(f"{'previous strategy':>22} {len(roots) / t_previous:>10.1f}")
+    print(f"{'PestoStrategy':>22} {len(roots) / t_current:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
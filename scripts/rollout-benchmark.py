@@ -0,0 +1,69 @@
+import argparse
+import random
+import time
+
+import chess
+
+from baysed_chess.mcts.baysian_mcts import BayesianMcts
+from baysed_chess.mcts.classic_mcts import ClassicMcts
+from baysed_chess.strategies.random_strategy import RandomStrategy
+
+MIDDLEGAME_FEN = "r1bq1rk1/pp2bppp/2n1pn2/3p4/2PP4/2N2N2/PP2BPPP/R2QKB1R w KQ - 0 9"
+
+
+def played_board(plies: int, seed: int) -> chess.Board:
+    """
+    Board after `plies` random moves. Unlike a FEN, it has a move stack, which every board copy copies.
+    """
+    random_state = random.Random(seed)
+    board = chess.Board()
+    for _ in range(plies):
+        board.push(random_state.choice(list(board.legal_moves)))
+    return board
+
+
+def run(tree: str, board: chess.Board, samples: int, seed: int, scratch_board: bool) -> tuple[float, list]:
+    """
+    Sample a fresh tree `samples` times with random rollouts.
+    :return: elapsed seconds and the statistics of the root children
+    """
+    board = board.copy()
+    strategy = RandomStrategy(random.Random(seed))
+    start = time.perf_counter()
+    if tree == "Bayesian":
+        mcts = BayesianMcts(board, strategy, board.turn, seed, scratch_board=scratch_board)
+        mcts.sample(samples)
+        elapsed = time.perf_counter() - start
+        return elapsed, sorted((c.move.uci(), c.mu, c.sigma, c.visits) for c in mcts.get_children())
+
+    mcts = ClassicMcts(board, board.turn, strategy, seed, scratch_board=scratch_board)
+    mcts.sample(samples)
+    elapsed = time.perf_counter() - start
+    return elapsed, sorted((c.move.uci(), c.score, c.visits) for c in mcts.get_children())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare rollouts on board copies and on one scratch board")
+    parser.add_argument("--samples", default=2000, type=int, help="Number of samples per run, default=2000")
+    parser.add_argument("--seed", default=0, type=int)
+    args = parser.parse_args()
+
+    positions = (("opening", chess.Board()), ("middlegame", chess.Board(MIDDLEGAME_FEN)),
+                 ("ply 80", played_board(80, args.seed)))
+    print(f"{'tree':>9} {'position':>10} {'copy samples/s':>15} {'scratch samples/s':>18} {'speedup':>8} "
+          f"{'identical':>10}")
+    for tree in ("Bayesian", "Classic"):
+        for name, board in positions:
+            # best of 3 runs, alternating the modes
+            t_copy, t_scratch = float("inf"), float("inf")
+            for _ in range(3):
+                elapsed, expected = run(tree, board, args.samples, args.seed, False)
+                t_copy = min(t_copy, elapsed)
+                elapsed, actual = run(tree, board, args.samples, args.seed, True)
+                t_scratch = min(t_scratch, elapsed)
+            print(f"{tree:>9} {name:>10} {args.samples / t_copy:>15.1f} {args.samples / t_scratch:>18.1f} "
+                  f"{t_copy / t_scratch:>8.2f} {str(expected == actual):>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+import argparse
+import os
+import random
+import threading
+import time
+
+import chess
+import chess.engine
+import numpy as np
+
+from baysed_chess.board_evaluations.evaluate_stockfish import score_stockfish
+from baysed_chess.stockfish_client import StockfishClient
+
+
+def random_positions(n: int, seed: int) -> list[chess.Board]:
+    """
+    Positions of random games, from the opening to the endgame.
+    """
+    random_state = random.Random(seed)
+    positions = []
+    while len(positions) < n:
+        board = chess.Board()
+        while not board.is_game_over() and len(positions) < n:
+            board.push(random_state.choice(list(board.legal_moves)))
+            positions.append(board.copy())
+    return positions
+
+
+def report(name: str, latencies: list[float], elapsed: float) -> None:
+    p50, p90, p99 = np.percentile(np.array(latencies) * 1000, [50, 90, 99])
+    print(f"{name:>24} {len(latencies) / elapsed:>12.0f} {p50:>9.2f} {p90:>9.2f} {p99:>9.2f}")
+
+
+def run_blocking(path: str, boards: list[chess.Board], command: str) -> None:
+    """
+    One request after the other, every one waits for its round trip, like `StockfishStrategy`.
+    """
+    stockfish = chess.engine.SimpleEngine.popen_uci(path)
+    stockfish.configure({"Threads": 1})
+    latencies = []
+    start = time.perf_counter()
+    for board in boards:
+        t = time.perf_counter()
+        if command == "analyse":
+            score_stockfish(board, stockfish)
+        else:
+            stockfish.play(board, chess.engine.Limit(depth=4))
+        latencies.append(time.perf_counter() - t)
+    report("blocking", latencies, time.perf_counter() - start)
+    stockfish.quit()
+
+
+def run_pipelined(path: str, boards: list[chess.Board], command: str, processes: int, depth: int) -> None:
+    """
+    Keep `processes * depth` requests queued at the `StockfishClient`, a new one is sent when one is done.
+    """
+    client = StockfishClient(path, processes)
+    latencies = []
+    in_flight = threading.Semaphore(processes * depth)
+    done = threading.Event()
+    remaining = len(boards)
+    lock = threading.Lock()
+
+    def on_done(t: float):
+        def callback(_):
+            nonlocal remaining
+            with lock:
+                latencies.append(time.perf_counter() - t)
+                remaining -= 1
+                if remaining == 0:
+                    done.set()
+            in_flight.release()
+        return callback
+
+    start = time.perf_counter()
+    for board in boards:
+        in_flight.acquire()
+        t = time.perf_counter()
+        future = client.analyse(board) if command == "analyse" else client.play(board)
+        future.add_done_callback(on_done(t))
+    done.wait()
+    report(f"{processes} processes x {depth}", latencies, time.perf_counter() - start)
+    client.close()
+
+
+def main():
+    if os.name == 'nt':
+        default_path = "stockfish/stockfish-windows-x86-64-avx2"
+    else:
+        default_path = "stockfish/stockfish-ubuntu-x86-64-avx2"
+
+    parser = argparse.ArgumentParser(description="Throughput and latency of blocking and pipelined stockfish calls")
+    parser.add_argument("--stockfish_path", default=default_path)
+    parser.add_argument("--positions", default=1000, type=int)
+    parser.add_argument("--command", default="analyse", choices=["analyse", "play"],
+                        help="analyse at depth 0 (evaluation) or play at depth 4 (rollout move)")
+    parser.add_argument("--processes", default=[1, 2, 4], type=int, nargs="+")
+    parser.add_argument("--depths", default=[1, 2, 4], type=int, nargs="+",
+                        help="number of requests queued per process")
+    parser.add_argument("--seed", default=0, type=int)
+    args = parser.parse_args()
+
+    boards = [b for b in random_positions(args.positions, args.seed) if not b.is_game_over()]
+    print(f"{len(boards)} positions, {args.command}")
+    print(f"{'':>24} {'requests/s':>12} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9}")
+    run_blocking(args.stockfish_path, boards, args.command)
+    for processes in args.processes:
+        for depth in args.depths:
+            run_pipelined(args.stockfish_path, boards, args.command, processes, depth)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import os
+
+from baysed_chess.engine_pool import close_engine_pool
+from baysed_chess.limit import Limit
+from baysed_chess.opening_suite import OpeningSuite
+from baysed_chess.tournament.engine_config import EngineConfig
+from baysed_chess.tournament.tournament import Tournament, TournamentFormat
+from utils.read_arguments import ENGINES, STRATEGIES
+
+
+def parse_value(value: str) -> int | float | bool | str:
+    if value in ("true", "false"):
+        return value == "true"
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def parse_engine(spec: str) -> EngineConfig:
+    """
+    Parse an engine configuration like `bayes-pesto=BayesianMCTS/PESTO,nodes=200,rollout_depth=8`.
+    `time`, `nodes` and `rollout_depth` are the limit and rollout depth, other keys are options of the engine factory.
+    """
+    name, _, rest = spec.partition("=")
+    engine_and_strategy, *settings = rest.split(",")
+    engine, _, strategy = engine_and_strategy.partition("/")
+    if engine not in ENGINES or strategy not in STRATEGIES:
+        raise argparse.ArgumentTypeError(f"unknown engine or strategy in {spec}, "
+                                         f"engines: {list(ENGINES)}, strategies: {list(STRATEGIES)}")
+
+    options = {}
+    for setting in settings:
+        key, _, value = setting.partition("=")
+        options[key] = parse_value(value)
+    limit = Limit(time=options.pop("time", None), nodes=options.pop("nodes", None))
+    if limit.policy is None:
+        raise argparse.ArgumentTypeError(f"{spec} needs a time or nodes limit")
+    return EngineConfig(name, ENGINES[engine], STRATEGIES[strategy], limit, options.pop("rollout_depth", 4), options)
+
+
+def print_crosstable(tournament: Tournament, prior: float) -> None:
+    ratings = tournament.ratings(prior)
+    order = sorted(range(len(tournament.configs)), key=lambda i: -ratings[i]["elo"])
+    width = max(len(config.name) for config in tournament.configs)
+
+    print(f"{'':>3} {'engine':<{width}} {'elo':>7} {'95% interval':>17} {'games':>6} {'score':>6}  "
+          + " ".join(f"{k + 1:>9}" for k in range(len(order))))
+    for rank, i in enumerate(order):
+        r = ratings[i]
+        games = tournament.games[i].sum()
+        score = tournament.points[i].sum()
+        cells = []
+        for j in order:
+            if i == j:
+                cells.append(f"{'-':>9}")
+            elif tournament.games[i][j] == 0:
+                cells.append(f"{'':>9}")
+            else:
+                cells.append(f"{f'{tournament.points[i][j]:g}/{tournament.games[i][j]}':>9}")
+        print(f"{rank + 1:>3} {tournament.configs[i].name:<{width}} {r['elo']:>7.1f} "
+              f"[{r['lower']:>7.1f}, {r['upper']:>7.1f}] {games:>6} {score:>6g}  " + " ".join(cells))
+
+
+def main():
+    if os.name == 'nt':
+        stockfish_default = "stockfish/stockfish-windows-x86-64-avx2"
+    else:
+        stockfish_default = "stockfish/stockfish-ubuntu-x86-64-avx2"
+
+    parser = argparse.ArgumentParser(description="Round-robin or gauntlet tournament of engine configurations, "
+                                                 "with Elo ratings and a crosstable")
+    parser.add_argument("--engine", dest="engines", action="append", type=parse_engine, required=True,
+                        help="Engine configuration name=Engine/Strategy,key=value,..., e.g. "
+                             "bayes=BayesianMCTS/PESTO,nodes=200,rollout_depth=8. Keys: time, nodes, rollout_depth "
+                             "and options of the engine factory (e.g. workers). Repeat for every engine")
+    parser.add_argument("--format", default="round_robin", choices=["round_robin", "gauntlet"],
+                        help="round_robin: every engine plays every other one, gauntlet: the first engine plays "
+                             "every other one, default=round_robin")
+    parser.add_argument("-n", default=10, type=int, help="Number of games per pairing, default=10")
+    parser.add_argument("--proc", default=1, type=int, help="Number of games played in parallel, default=1")
+    parser.add_argument("--openings", default=None,
+                        help="EPD or PGN file of start positions, each one is played twice with swapped colors")
+    parser.add_argument("--worker_games", default=0, type=int,
+                        help="Keep the engines of a process between games, and replace the process after this many "
+                             "games, 0 creates the engines of every game, default=0")
+    parser.add_argument("--prior", default=2.0, type=float,
+                        help="Virtual draws added to every pairing for the ratings, default=2")
+    parser.add_argument("--stockfish_path", default=stockfish_default)
+    parser.add_argument("--lc0_path", default="lc0/lc0")
+    parser.add_argument("--stockfish_elo", default=1500, type=int)
+    args = parser.parse_args()
+
+    tournament_format = TournamentFormat.Gauntlet if args.format == "gauntlet" else TournamentFormat.RoundRobin
+    openings = OpeningSuite.load(args.openings) if args.openings is not None else None
+    tournament = Tournament(args.engines, tournament_format, args.n, args.stockfish_path, args.lc0_path,
+                            args.stockfish_elo, openings, args.worker_games)
+
+    names = [config.name for config in tournament.configs]
+    for k, (i, j, result) in enumerate(tournament.run_iter(args.proc)):
+        white, black = (names[i], names[j]) if result.engine_a_white else (names[j], names[i])
+        score = {1.0: "1-0", 0.0: "0-1", 0.5: "1/2-1/2"}[result.score_a if result.engine_a_white else 1 - result.score_a]
+        print(f"game {k + 1}/{tournament.n_games}: {white} - {black} {score} ({result.statistics.length} plies)")
+
+    print()
+    print_crosstable(tournament, args.prior)
+
+
+if __name__ == '__main__':
+    main()
+
+    # quit the engine processes of this process, instead of waiting for their cleanup at exit
+    close_engine_pool()
@@ -0,0 +1,61 @@
+import argparse
+import random
+import time
+import tracemalloc
+
+import chess
+
+from baysed_chess.mcts.baysian_mcts import BayesianMcts
+from baysed_chess.mcts.baysian_mcts_array import BayesianMctsArray
+from baysed_chess.mcts.baysian_mcts_node import BayesianMctsNode
+from baysed_chess.strategies.random_strategy import RandomStrategy
+
+
+def count_nodes(node: BayesianMctsNode) -> int:
+    return 1 + sum(count_nodes(c) for c in node.children)
+
+
+def run(backend: str, fen: str, seconds: float, seed: int) -> tuple[int, int, float, int]:
+    """
+    Sample a fresh tree for `seconds`.
+    :return: number of samples, number of tree nodes, elapsed seconds and bytes allocated by the tree
+    """
+    board = chess.Board(fen)
+    strategy = RandomStrategy(random.Random(seed))
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    if backend == "object":
+        mcts = BayesianMcts(board, strategy, board.turn, seed)
+    else:
+        mcts = BayesianMctsArray(board, strategy, board.turn, seed)
+
+    samples = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        mcts.sample(1)
+        samples += 1
+    elapsed = time.perf_counter() - start
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    nodes = count_nodes(mcts.root) if backend == "object" else mcts.node_count
+    return samples, nodes, elapsed, allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the object tree and the array tree of the Bayesian MCTS")
+    parser.add_argument("--fen", default=chess.STARTING_FEN)
+    parser.add_argument("--time", default=2.0, type=float, help="Seconds of sampling per backend, default=2")
+    parser.add_argument("--seed", default=0, type=int)
+    args = parser.parse_args()
+
+    print(f"{'backend':>8} {'samples':>8} {'nodes':>8} {'samples/s':>10} {'nodes/s':>10} {'bytes/node':>11}")
+    for backend in ("object", "array"):
+        samples, nodes, elapsed, allocated = run(backend, args.fen, args.time, args.seed)
+        print(f"{backend:>8} {samples:>8} {nodes:>8} {samples / elapsed:>10.1f} {nodes / elapsed:>10.1f} "
+              f"{allocated / nodes:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
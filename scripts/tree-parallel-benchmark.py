@@ -0,0 +1,64 @@
+import argparse
+import random
+import time
+
+import chess
+
+from baysed_chess.engine_factory import EngineFactory, StrategyEnum
+from baysed_chess.limit import Limit
+from baysed_chess.mcts.tree_parallel_baysian_mcts import TreeParallelBayesianMcts
+
+
+def run(fen: str, strategy: StrategyEnum, workers: int, batch_size: int, nodes: int, seed: int,
+        stockfish_path: str, lc0_path: str) -> tuple[int, float, dict[chess.Move, tuple[float, float]]]:
+    """
+    Search one position with `Limit(nodes=nodes)`, where every node is one batch.
+    :return: number of rollouts, elapsed seconds and the statistics of the root children
+    """
+    board = chess.Board(fen)
+    strategies = [EngineFactory.create_strategy(strategy, stockfish_path, lc0_path) for _ in range(workers)]
+    if strategy == StrategyEnum.Random:
+        # make the random rollouts reproducible
+        for i, s in enumerate(strategies):
+            s.random_state = random.Random(seed + i)
+
+    mcts = TreeParallelBayesianMcts(board, strategies, board.turn, batch_size, seed)
+    rollouts = 0
+
+    def do():
+        nonlocal rollouts
+        rollouts += mcts.sample_batch()
+
+    start = time.perf_counter()
+    Limit(nodes=nodes).run(do)
+    elapsed = time.perf_counter() - start
+    moves = mcts.get_moves()
+    mcts.close()
+    return rollouts, elapsed, moves
+
+
+def main():
+    strategies = {"Random": StrategyEnum.Random, "Stockfish": StrategyEnum.Stockfish, "Lc0": StrategyEnum.Lc0,
+                  "RandomStockfish": StrategyEnum.RandomStockfish, "PESTO": StrategyEnum.Pestos}
+    parser = argparse.ArgumentParser(description="Throughput of the tree-parallel Bayesian MCTS for several batch sizes")
+    parser.add_argument("--fen", default=chess.STARTING_FEN)
+    parser.add_argument("--strategy", default="Random", choices=strategies.keys())
+    parser.add_argument("--workers", default=4, type=int, help="Number of rollout strategies, default=4")
+    parser.add_argument("--nodes", default=200, type=int, help="Number of batches per run, default=200")
+    parser.add_argument("--seed", default=0, type=int)
+    parser.add_argument("--stockfish_path", default="stockfish/stockfish-ubuntu-x86-64-avx2")
+    parser.add_argument("--lc0_path", default="lc0/lc0")
+    args = parser.parse_args()
+
+    print(f"{'K':>4} {'batches':>8} {'rollouts':>9} {'batches/s':>10} {'rollouts/s':>11} {'reproducible':>13}")
+    for k in (1, 2, 4, 8, 16):
+        run_args = (args.fen, strategies[args.strategy], args.workers, k, args.nodes, args.seed,
+                    args.stockfish_path, args.lc0_path)
+        rollouts, elapsed, moves = run(*run_args)
+        _, _, moves_again = run(*run_args)
+        print(f"{k:>4} {args.nodes:>8} {rollouts:>9} {args.nodes / elapsed:>10.1f} {rollouts / elapsed:>11.1f} "
+              f"{str(moves == moves_again):>13}")
+
+
+if __name__ == '__main__':
+    main()
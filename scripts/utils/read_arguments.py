@@ -15,20 +15,48 @@ ARGS = TypedDict("ARGS", {
     "nodes_limit": int,
     "stockfish_path": str,
     "lc0_path": str,
-    "stockfish_elo": int
+    "stockfish_elo": int,
+    "workers": int,
+    "batch_size": int,
+    "tt_size1": int,
+    "tt_size2": int,
+    "eval_cache_size": int,
+    "eval_cache_dir": str | None,
+    "seed_priors": bool,
+    "pipeline_depth": int,
+    "lc0_instances": int,
+    "ponder1": bool,
+    "ponder2": bool,
+    "results_log": str | None,
+    "sprt": bool,
+    "elo0": float,
+    "elo1": float,
+    "alpha": float,
+    "beta": float,
+    "openings": str | None,
+    "worker_games": int
 })
 
 
+ENGINES = {"ClassicMCTS": EngineEnum.ClassicMcts, "BayesianMCTS": EngineEnum.BayesianMcts,
+           "Random": EngineEnum.Random, "Stockfish": EngineEnum.Stockfish, "Lc0": EngineEnum.Lc0,
+           "BayesianMCTSRootParallel": EngineEnum.BayesianMctsRootParallel,
+           "BayesianMCTSTreeParallel": EngineEnum.BayesianMctsTreeParallel,
+           "BayesianMCTSAsync": EngineEnum.BayesianMctsAsync}
+"""Engines by their name on the command line"""
+STRATEGIES = {"Random": StrategyEnum.Random, "Stockfish": StrategyEnum.Stockfish, "Lc0": StrategyEnum.Lc0,
+              "RandomStockfish": StrategyEnum.RandomStockfish, "PESTO": StrategyEnum.Pestos}
+"""Strategies by their name on the command line"""
+
+
 def read_arguments() -> ARGS:
     parser = argparse.ArgumentParser(
         prog='EvaluateEngine',
         description='Compare two engines by playing multiple games against each other'
     )
 
-    engines = {"ClassicMCTS": EngineEnum.ClassicMcts, "BayesianMCTS": EngineEnum.BayesianMcts,
-               "Random": EngineEnum.Random, "Stockfish": EngineEnum.Stockfish, "Lc0": EngineEnum.Lc0}
-    strategies = {"Random": StrategyEnum.Random, "Stockfish": StrategyEnum.Stockfish, "Lc0": StrategyEnum.Lc0,
-                  "RandomStockfish": StrategyEnum.RandomStockfish, "PESTO": StrategyEnum.Pestos}
+    engines = ENGINES
+    strategies = STRATEGIES
 
     if os.name == 'nt':
         stockfish_default = "stockfish/stockfish-windows-x86-64-avx2"
@@ -55,6 +83,46 @@ def read_arguments() -> ARGS:
     parser.add_argument("--stockfish_elo", default=1500, help="Elo for stockfish engine, default=1500")
     parser.add_argument("--lc0_path", default=lc0_default,
                         help=f"Path for lc0 engine executable, default='{lc0_default}'")
+    parser.add_argument("--workers", default=4,
+                        help="Number of worker processes of the engine BayesianMCTSRootParallel, "
+                             "or rollout strategies of BayesianMCTSTreeParallel and BayesianMCTSAsync, default=4")
+    parser.add_argument("--batch_size", default=8,
+                        help="Number of leaves per batch of the engine BayesianMCTSTreeParallel, default=8")
+    parser.add_argument("--tt_size1", default=0,
+                        help="Size of the transposition table of engine A (BayesianMCTS), 0 disables it, default=0")
+    parser.add_argument("--tt_size2", default=0,
+                        help="Size of the transposition table of engine B (BayesianMCTS), 0 disables it, default=0")
+    parser.add_argument("--eval_cache_size", default=0,
+                        help="Number of cached board evaluations of the rollout strategies, 0 disables it, default=0")
+    parser.add_argument("--eval_cache_dir", default=None,
+                        help="Directory to persist the evaluation caches in, so the next run starts warm, default=None")
+    parser.add_argument("--seed_priors", action="store_true",
+                        help="Seed the priors of new children with a batched static evaluation (BayesianMCTS)")
+    parser.add_argument("--pipeline_depth", default=0,
+                        help="Rollouts in flight per stockfish process of BayesianMCTSAsync with the Stockfish strategy, "
+                             "sharing --workers processes, 0 disables it, default=0")
+    parser.add_argument("--lc0_instances", default=1,
+                        help="Number of lc0 processes of every Lc0 strategy, batched evaluations (e.g. --seed_priors or "
+                             "BayesianMCTSTreeParallel) are spread over them, default=1")
+    parser.add_argument("--ponder1", action="store_true",
+                        help="Let engine A (ClassicMCTS) search the expected reply while engine B thinks")
+    parser.add_argument("--ponder2", action="store_true",
+                        help="Let engine B (ClassicMCTS) search the expected reply while engine A thinks")
+    parser.add_argument("--results_log", default=None,
+                        help="Path (without extension) of a log the finished games are appended to, as .jsonl and .pgn. "
+                             "A match with an existing log resumes from it, default=None")
+    parser.add_argument("--sprt", action="store_true",
+                        help="Stop the match once a sequential probability ratio test is decided, -n is the maximum")
+    parser.add_argument("--elo0", default=0, help="Elo difference of the null hypothesis of the SPRT, default=0")
+    parser.add_argument("--elo1", default=50, help="Elo difference of the alternative hypothesis of the SPRT, default=50")
+    parser.add_argument("--alpha", default=0.05, help="False positive rate of the SPRT, default=0.05")
+    parser.add_argument("--beta", default=0.05, help="False negative rate of the SPRT, default=0.05")
+    parser.add_argument("--worker_games", default=0,
+                        help="Keep the engines of a process between games, and replace the process after this many "
+                             "games, 0 creates the engines of every game, default=0")
+    parser.add_argument("--openings", default=None,
+                        help="EPD or PGN file of start positions, each one is played twice with swapped colors, "
+                             "default=None")
     args = parser.parse_args()
 
     _args = {
@@ -68,7 +136,26 @@ def read_arguments() -> ARGS:
         "nodes_limit": int(args.nodes),
         "stockfish_path": args.stockfish_path,
         "lc0_path": args.lc0_path,
-        "stockfish_elo": int(args.stockfish_elo)
+        "stockfish_elo": int(args.stockfish_elo),
+        "workers": int(args.workers),
+        "batch_size": int(args.batch_size),
+        "tt_size1": int(args.tt_size1),
+        "tt_size2": int(args.tt_size2),
+        "eval_cache_size": int(args.eval_cache_size),
+        "eval_cache_dir": args.eval_cache_dir,
+        "seed_priors": args.seed_priors,
+        "pipeline_depth": int(args.pipeline_depth),
+        "lc0_instances": int(args.lc0_instances),
+        "ponder1": args.ponder1,
+        "ponder2": args.ponder2,
+        "results_log": args.results_log,
+        "sprt": args.sprt,
+        "elo0": float(args.elo0),
+        "elo1": float(args.elo1),
+        "alpha": float(args.alpha),
+        "beta": float(args.beta),
+        "openings": args.openings,
+        "worker_games": int(args.worker_games)
     }
     print(_args)
     return _args
@@ -0,0 +1,50 @@
+import argparse
+import multiprocessing as mp
+import os
+import time
+
+from baysed_chess.engine_pool import close_engine_pool
+from baysed_chess.limit import Limit
+from baysed_chess.matchmaker import Matchmaker
+from utils.read_arguments import ENGINES, STRATEGIES
+
+
+def main():
+    if os.name == 'nt':
+        stockfish_default = "stockfish/stockfish-windows-x86-64-avx2"
+    else:
+        stockfish_default = "stockfish/stockfish-ubuntu-x86-64-avx2"
+
+    parser = argparse.ArgumentParser(description="Games per hour with the engines created for every game, "
+                                                 "and with engines kept by the processes between games")
+    parser.add_argument("--engine", default="BayesianMCTS", choices=ENGINES.keys())
+    parser.add_argument("--strategy", default="PESTO", choices=STRATEGIES.keys())
+    parser.add_argument("--nodes", default=50, type=int, help="Node limit per move, default=50")
+    parser.add_argument("--games", default=32, type=int, help="Number of games per setting, default=32")
+    parser.add_argument("--proc", default=mp.cpu_count(), type=int,
+                        help="Number of games played in parallel, default=number of cores")
+    parser.add_argument("--worker_games", default=[0, 8, 1000], type=int, nargs="+",
+                        help="Games per process before it is replaced, 0 creates the engines of every game")
+    parser.add_argument("--stockfish_path", default=stockfish_default)
+    parser.add_argument("--lc0_path", default="lc0/lc0")
+    args = parser.parse_args()
+
+    engine = ENGINES[args.engine]
+    strategy = STRATEGIES[args.strategy]
+    print(f"{args.engine} ({args.strategy}) against itself, {args.nodes} nodes per move, {args.games} games, "
+          f"{args.proc} processes")
+    print(f"{'worker games':>12} {'games/hour':>11} {'moves/s':>8}")
+    for worker_games in args.worker_games:
+        m = Matchmaker(engine, strategy, engine, strategy, Limit(nodes=args.nodes), args.stockfish_path,
+                       args.lc0_path, 1500, worker_games=worker_games)
+        start = time.perf_counter()
+        moves = sum(r.statistics.length for r in m.run_iter(args.games, args.proc))
+        elapsed = time.perf_counter() - start
+        print(f"{worker_games:>12} {args.games / elapsed * 3600:>11.0f} {moves / elapsed:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
+
+    # quit the engine processes of this process, instead of waiting for their cleanup at exit
+    close_engine_pool()